@@ -0,0 +1,206 @@
+"""
+Headless command line interface for Digital Circuit Sketchbook.
+
+    python dcs.py export <directory> [--jobs N] [--force]
+    python dcs.py equiv <first> <second> [--vectors N] [--seed S]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from py_objects.components.component import Component
+
+# Content hashes of the exported components and their definitions, kept in the root of the exported directory
+EXPORT_CACHE = ".dcs_export_cache.json"
+
+
+def file_hash(filename: str) -> str:
+    """Returns the SHA-256 hash of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def definition_files(filename: str) -> list[str]:
+    """Returns the files defining the sub-components of a .dcs.json component"""
+    with open(filename, 'r') as file:
+        instances = json.load(file).get("sub_components", [])
+
+    directory = os.path.dirname(filename)
+    return [os.path.join(directory, instance["filename"]) for instance in instances if instance["filename"]]
+
+
+def design_hash(filename: str, hashes: dict[str, str]) -> str:
+    """
+    Returns the hash of a component file together with the definition files of its sub-components,
+    recursively, so that it changes whenever any of them does. The hashes are memoized in `hashes`.
+    """
+    path = os.path.normpath(filename)
+    if path in hashes:
+        return hashes[path]
+
+    # Guards against definitions that include themselves
+    hashes[path] = ""
+    if not os.path.exists(path):
+        hashes[path] = "missing"
+        return hashes[path]
+
+    try:
+        digest = hashlib.sha256(file_hash(path).encode())
+        if path.endswith(".dcs.json"):
+            for definition in definition_files(path):
+                digest.update(design_hash(definition, hashes).encode())
+    except Exception:
+        # Whatever includes this file fails as well
+        del hashes[path]
+        raise
+
+    hashes[path] = digest.hexdigest()
+    return hashes[path]
+
+
+def find_components(directory: str) -> list[str]:
+    """Returns every .dcs.json file under a directory, sorted by path"""
+    found = []
+    for root, _, files in os.walk(directory):
+        found.extend(os.path.join(root, name) for name in files if name.endswith(".dcs.json"))
+
+    return sorted(found)
+
+
+def export_component(filename: str) -> tuple[str, str, int]:
+    """
+    Loads a component and writes its VHDL file next to it. Runs in a worker process.
+
+    Returns:
+        tuple[str, str, int]: The component file, the written VHDL file and the size of the component file.
+    """
+    component = Component.load(filename)
+    vhdl_filename = os.path.join(os.path.dirname(filename), f"{component.name}.vhd")
+    component.vhdl_writer.save(vhdl_filename)
+
+    return filename, vhdl_filename, os.path.getsize(filename)
+
+
+def export(args: argparse.Namespace) -> int:
+    """Regenerates the VHDL files of every component in a directory tree"""
+    start = time.perf_counter()
+    cache_filename = os.path.join(args.directory, EXPORT_CACHE)
+
+    # Load the hashes from the previous export. A damaged cache is simply rebuilt
+    cache: dict[str, dict[str, str]] = dict()
+    if os.path.exists(cache_filename) and not args.force:
+        try:
+            with open(cache_filename, 'r') as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = dict()
+        if not isinstance(cache, dict):
+            cache = dict()
+
+    exported, failed, total_bytes = 0, 0, 0
+
+    def fail(filename: str, error: Exception) -> None:
+        """Reports a component that could not be exported"""
+        nonlocal failed
+        failed += 1
+        print(f"FAILED {filename}: {type(error).__name__}: {error}", file=sys.stderr)
+
+    # Components that cannot even be read fail here, and are not exported
+    components = find_components(args.directory)
+    memo: dict[str, str] = dict()
+    hashes: dict[str, str] = dict()
+    for filename in components:
+        try:
+            hashes[filename] = design_hash(filename, memo)
+        except Exception as error:
+            fail(filename, error)
+
+    # Entries are keyed by path relative to the directory, and those of deleted components are dropped
+    keys = {filename: os.path.relpath(filename, args.directory) for filename in hashes}
+    cache = {key: cache[key] for key in keys.values()
+             if isinstance(cache.get(key), dict) and {"hash", "vhdl"} <= cache[key].keys()}
+
+    def unchanged(filename: str) -> bool:
+        """Whether the component and its sub-components have not changed since its VHDL file was written"""
+        entry = cache.get(keys[filename])
+        return (entry is not None and entry["hash"] == hashes[filename]
+                and os.path.exists(os.path.join(args.directory, entry["vhdl"])))
+
+    pending = [filename for filename in hashes if not unchanged(filename)]
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(export_component, filename): filename for filename in pending}
+
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                _, vhdl_filename, size = future.result()
+            except Exception as error:
+                fail(filename, error)
+                continue
+
+            exported += 1
+            total_bytes += size
+            cache[keys[filename]] = {"hash": hashes[filename], "vhdl": os.path.relpath(vhdl_filename, args.directory)}
+
+    with open(cache_filename, 'w') as file:
+        json.dump(cache, file, indent=4)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Exported {exported} of {len(components)} components "
+        f"({len(hashes) - len(pending)} unchanged, {failed} failed) in {elapsed:.2f} s: "
+        f"{exported / elapsed:.1f} components/s, {total_bytes / elapsed / 1e6:.2f} MB/s"
+    )
+
+    return 1 if failed else 0
+
+
+def equiv(args: argparse.Namespace) -> int:
+    """Checks whether two components are functionally equivalent. Exits with 1 if they differ."""
+    try:
+        first, second = Component.load(args.first), Component.load(args.second)
+        result = first.check_equivalence(second, args.vectors, args.seed)
+    except Exception as error:
+        print(f"FAILED: {type(error).__name__}: {error}", file=sys.stderr)
+        return 2
+
+    print(result)
+    if not result.equivalent:
+        for name, value in result.counterexample.items():
+            print(f"    {name} = {value}")
+
+    return 0 if result.equivalent else 1
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="dcs", description="Digital Circuit Sketchbook command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="regenerate the VHDL files of every .dcs.json component in a directory tree")
+    export_parser.add_argument("directory", help="the directory to search for components")
+    export_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    export_parser.add_argument("-f", "--force", action="store_true", help="export every component, even if unchanged")
+    export_parser.set_defaults(handler=export)
+
+    equiv_parser = commands.add_parser("equiv", help="check that two components have the same outputs for every input")
+    equiv_parser.add_argument("first", help="the first component (.dcs.json, .dcs.bin or .vhd)")
+    equiv_parser.add_argument("second", help="the second component")
+    equiv_parser.add_argument("-n", "--vectors", type=int, default=4096, help="random vectors to simulate before the proof (default: 4096)")
+    equiv_parser.add_argument("-s", "--seed", type=int, default=None, help="seed of the random vectors")
+    equiv_parser.set_defaults(handler=equiv)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
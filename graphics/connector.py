@@ -1,22 +1,62 @@
-from PyQt6.QtWidgets import QGraphicsLineItem
-from PyQt6.QtCore import QLineF, QPointF
-from PyQt6.QtGui import QPen, QColor
+from collections import deque
+import time
+
+from PyQt6 import sip
+from PyQt6.QtWidgets import QGraphicsPathItem
+from PyQt6.QtCore import QPointF, QTimer, QCoreApplication
+from PyQt6.QtGui import QPen, QColor, QPainterPath
 from graphics.graphical_object import GraphicsItem
 
-class Connector(QGraphicsLineItem):
+class Connector(QGraphicsPathItem):
+    """
+    A wire between two pins on the canvas.
+
+    Redraws and first routes are queued and done on later passes of the event loop. A connector
+    taken off its scene is dropped from the queues, and one deleted along with its scene (when
+    the scene is cleared or closed) is skipped when the queue reaches it.
+    """
+
+    # Connectors whose gates have moved since the last flush, redrawn together once per frame
+    __pending: list["Connector"] = []
+    __scheduled: bool = False
+
+    # Connectors not routed yet, drawn straight until they are routed, a slice of time per pass of the event loop
+    __unrouted: deque["Connector"] = deque()
+    __routing: bool = False
+    ROUTE_SLICE = 0.02      # Seconds
+
+    SCENE_HAS_CHANGED = QGraphicsPathItem.GraphicsItemChange.ItemSceneHasChanged
+
+    # Shared by every connector
+    BLACK_PEN = QPen(QColor('black'), 2)
+    BLUE_PEN = QPen(QColor('blue'), 2)
+
     def __init__(self, src: GraphicsItem, src_port: str, dest: GraphicsItem, dest_port: str):
         super().__init__()
         self.src = src
         self.dest = dest
+        self.dirty = False
+
+        # Without a router, the connector is a straight line between the pins
+        self.router = src.router
+        self.unrouted = False
 
         # Get scene positions of the source output pin and destination input pin
         self.source_offset = src.port_pos[src_port]
         self.dest_offset = dest.port_pos[dest_port]
         
-        self.black_pen = QPen(QColor('black'), 2)
-        self.blue_pen = QPen(QColor('blue'), 2)
+        self.black_pen = Connector.BLACK_PEN
+        self.blue_pen = Connector.BLUE_PEN
 
         self.setPen(self.black_pen)
+
+        # Routing a whole design takes a while, so it is done in the background when there is an event loop
+        if self.router is not None and QCoreApplication.instance() is not None:
+            self.unrouted = True
+            Connector.__unrouted.append(self)
+            if not Connector.__routing:
+                Connector.__routing = True
+                QTimer.singleShot(0, Connector.route_pending)
         
         # Update whenever the gate moves
         self.update_position()
@@ -25,11 +65,85 @@ class Connector(QGraphicsLineItem):
         source_pos = self.src.mapToScene(self.source_offset)
         dest_pos = self.dest.mapToScene(self.dest_offset)
 
-        self.setLine(QLineF(source_pos, dest_pos))
+        path = QPainterPath(source_pos)
+        if self.router is None or self.unrouted:
+            path.lineTo(dest_pos)
+        else:
+            # Only rerouted if one of the ends moved
+            points = self.router.route(self, (source_pos.x(), source_pos.y()), (dest_pos.x(), dest_pos.y()))
+            for x, y in points[1:]:
+                path.lineTo(x, y)
+
+        self.setPath(path)
+
+    def mark_dirty(self) -> None:
+        """
+        Queues the connector to be redrawn on the next pass of the event loop. Moving a selection
+        moves every gate in it one by one, so a connector between two of them is only redrawn once,
+        after the whole selection has moved.
+        """
+        if self.dirty:
+            return
+
+        # Without an event loop there is no next frame
+        if QCoreApplication.instance() is None:
+            self.update_position()
+            return
+
+        self.dirty = True
+        Connector.__pending.append(self)
+        if not Connector.__scheduled:
+            Connector.__scheduled = True
+            QTimer.singleShot(0, Connector.flush)
+
+    @staticmethod
+    def flush() -> None:
+        """Redraws every queued connector"""
+        pending = Connector.__pending
+        Connector.__pending = []
+        Connector.__scheduled = False
+
+        for connector in pending:
+            if connector.dirty and not sip.isdeleted(connector):
+                connector.dirty = False
+                connector.update_position()
+
+    @staticmethod
+    def route_pending() -> None:
+        """Routes the connectors waiting for their first route for up to ROUTE_SLICE, and comes back for the rest"""
+        deadline = time.perf_counter() + Connector.ROUTE_SLICE
+        queue = Connector.__unrouted
+        while queue and time.perf_counter() < deadline:
+            connector = queue.popleft()
+            if connector.unrouted and not sip.isdeleted(connector):
+                connector.unrouted = False
+                connector.update_position()
+
+        if queue:
+            QTimer.singleShot(0, Connector.route_pending)
+        else:
+            Connector.__routing = False
+
+    @staticmethod
+    def route_all() -> None:
+        """Routes every connector waiting for its first route right away, such as before printing the scene"""
+        queue = Connector.__unrouted
+        while queue:
+            connector = queue.popleft()
+            if connector.unrouted and not sip.isdeleted(connector):
+                connector.unrouted = False
+                connector.update_position()
+
+    def itemChange(self, change, value):
+        # Taken off the scene: the queues skip the connector from now on
+        if change == Connector.SCENE_HAS_CHANGED and value is None:
+            self.dirty = False
+            self.unrouted = False
+
+        return super().itemChange(change, value)
 
     def eventFilter(self, watched, event):
         # Update the line when either gate is moved
         if event.type().name == "GraphicsSceneMouseMove":
             self.update_position()
         return False
-
@@ -1,120 +1,186 @@
-from PyQt6.QtWidgets import QGraphicsLineItem, QGraphicsPathItem, QGraphicsEllipseItem
 from graphics.graphical_object import GraphicsItem
-from PyQt6.QtGui import QPainterPath, QColor, QPen, QBrush
-from PyQt6.QtCore import QRectF, QPointF
+from PyQt6.QtGui import QPainterPath, QColor, QBrush
+from PyQt6.QtCore import QRectF, QPointF, QLineF
+
+
+class GateDrawing:
+    """The outline, pins, bubble and XOR arc of a type of gate at one size, shared by every gate drawn like it"""
+
+    def __init__(self, body: QPainterPath, wires: list[QLineF], arc: QPainterPath, bubble: QRectF,
+                 port_pos: dict[str, QPointF], pen_width: float) -> None:
+        self.body: QPainterPath = body
+        self.wires: list[QLineF] = wires
+        self.arc: QPainterPath = arc            # XOR and XNOR gates only
+        self.bubble: QRectF = bubble            # Inverting gates only
+        self.port_pos: dict[str, QPointF] = port_pos
+
+        # Everything drawn, including half of the pen around it
+        bounds = body.boundingRect()
+        for wire in wires:
+            bounds = bounds.united(QRectF(wire.p1(), wire.p2()).normalized())
+        if arc is not None:
+            bounds = bounds.united(arc.boundingRect())
+        if bubble is not None:
+            bounds = bounds.united(bubble)
+        margin = pen_width / 2
+        self.bounds: QRectF = bounds.adjusted(-margin, -margin, margin, margin)
+
 
 class GateGraphics(GraphicsItem):
+    """
+    A gate on the canvas. The pins, the bubble and the XOR arc are painted by the gate itself,
+    from a drawing shared by every gate of the same type and size, so each gate is a single item.
+    """
+
+    # Drawings per (type, size), made by the first gate of each
+    __drawings: dict[tuple[str, float], GateDrawing] = dict()
+    __brush: QBrush = None
 
     # Decide between paths according to type
-    def __draw_path(self, type: str):
-        if type == "AND" or type == "NAND": 
-            self.setPath(self.and_gate())
-        elif type == "OR" or type == "NOR": 
-            self.setPath(self.or_gate())
-        elif type == "XOR" or type == "XNOR":
-            self.setPath(self.or_gate())
-            self.draw_xor_arc()
+    @staticmethod
+    def __draw_path(type: str, size: float) -> QPainterPath:
+        if type == "AND" or type == "NAND":
+            return GateGraphics.and_gate(size)
+        elif type == "OR" or type == "NOR" or type == "XOR" or type == "XNOR":
+            return GateGraphics.or_gate(size)
         elif type == "NOT":
-            self.setPath(self.do_nothing_gate())
+            return GateGraphics.do_nothing_gate(size)
+        return QPainterPath()
+
+    @staticmethod
+    def drawing(type: str, size: float, pen_width: float = 2) -> GateDrawing:
+        """Returns the shared drawing of a type of gate, making it the first time"""
+        key = (type, size)
+        if key not in GateGraphics.__drawings:
+            wires, port_pos = GateGraphics.draw_pins(type, size)
+            arc = GateGraphics.draw_xor_arc(size) if type == "XOR" or type == "XNOR" else None
+            GateGraphics.__drawings[key] = GateDrawing(GateGraphics.__draw_path(type, size), wires, arc,
+                                                       GateGraphics.draw_bubble(type, size), port_pos, pen_width)
+
+        return GateGraphics.__drawings[key]
 
     def __init__(self, type: str, size: float):
         super().__init__()
 
-        self.__size = size
-        self.__brush = QBrush(QColor('silver'))
+        if GateGraphics.__brush is None:
+            GateGraphics.__brush = QBrush(QColor('silver'))
+
+        self.__drawing = GateGraphics.drawing(type, size, self._pen.widthF())
+        self.port_pos.update(self.__drawing.port_pos)
 
-        self.__draw_path(type)
-        self.setBrush(self.__brush)
+        # Paths are implicitly shared, so this does not copy the outline
+        self.setPath(self.__drawing.body)
+        self.setBrush(GateGraphics.__brush)
         self.setPen(self._pen)
-        self.draw_pins(type)
-        self.draw_bubble(type)
 
+    def boundingRect(self) -> QRectF:
+        return super().boundingRect().united(self.__drawing.bounds)
+
+    def paint(self, painter, option, widget=None) -> None:
+        if self.zoomed_out(painter, option):
+            return
+
+        drawing = self.__drawing
+
+        # Pins first, under the outline they end at
+        painter.setPen(self._pen)
+        painter.drawLines(drawing.wires)
+
+        # Outline, selection and junction dots
+        super().paint(painter, option, widget)
+
+        painter.setPen(self._pen)
+        if drawing.arc is not None:
+            painter.setBrush(QBrush())
+            painter.drawPath(drawing.arc)
+        if drawing.bubble is not None:
+            painter.setBrush(QBrush(QColor('white')))
+            painter.drawEllipse(drawing.bubble)
 
     # Draws the AND gate on to the canvas
-    def and_gate(self):
+    @staticmethod
+    def and_gate(size: float) -> QPainterPath:
         path = QPainterPath()
 
         # Rounded portion
-        arc_rect = QRectF(0, 0, self.__size, self.__size)
+        arc_rect = QRectF(0, 0, size, size)
 
-        path.moveTo(0, self.__size)
+        path.moveTo(0, size)
         path.lineTo(0, 0)
-        path.lineTo(self.__size/2, 0)
+        path.lineTo(size/2, 0)
         path.arcTo(arc_rect, 90, -180)
-        path.lineTo(0, self.__size)
+        path.lineTo(0, size)
 
         return path
-    
-    def or_gate(self):
+
+    @staticmethod
+    def or_gate(size: float) -> QPainterPath:
         path = QPainterPath()
 
         # Start at bottom left
-        path.moveTo(0, self.__size)
-        path.quadTo(self.__size * 0.7, self.__size * 0.95, self.__size, self.__size * 0.5)
-        path.quadTo(self.__size * 0.7, self.__size * 0.05, 0, 0)
-        path.quadTo(self.__size * 0.3, self.__size * 0.5, 0, self.__size)
+        path.moveTo(0, size)
+        path.quadTo(size * 0.7, size * 0.95, size, size * 0.5)
+        path.quadTo(size * 0.7, size * 0.05, 0, 0)
+        path.quadTo(size * 0.3, size * 0.5, 0, size)
 
         path.closeSubpath()
 
         return path
-    
-    def do_nothing_gate(self):
+
+    @staticmethod
+    def do_nothing_gate(size: float) -> QPainterPath:
         path = QPainterPath()
 
-        path.moveTo(0, 0 + self.__size)
-        path.lineTo(self.__size, self.__size * 0.5)
+        path.moveTo(0, 0 + size)
+        path.lineTo(size, size * 0.5)
         path.lineTo(0, 0)
-        path.lineTo(0, self.__size)
+        path.lineTo(0, size)
 
         return path
-    
-    def draw_xor_arc(self):
+
+    @staticmethod
+    def draw_xor_arc(size: float) -> QPainterPath:
         path = QPainterPath()
-        path.moveTo(-self.__size * 0.1, self.__size)
-        path.quadTo(self.__size * 0.2, self.__size * 0.5, -self.__size * 0.1, 0)
-
-        xor_arc = QGraphicsPathItem(path, parent=self)
-        xor_arc.setPen(self._pen)
-    
-    def draw_pins(self, type):
-        
+        path.moveTo(-size * 0.1, size)
+        path.quadTo(size * 0.2, size * 0.5, -size * 0.1, 0)
+
+        return path
+
+    @staticmethod
+    def draw_pins(type: str, size: float) -> tuple[list[QLineF], dict[str, QPointF]]:
+        """Returns the pin wires, and the position of the end of each pin"""
+
         # To extend the wires to reach the back of the OR gates
         extension = 0
 
         if type == "OR" or type == "NOR": extension = 0.095
         elif type == "XOR" or type == "XNOR": extension = -0.005
-        
+
         # Adding the output wires
-        leg = QGraphicsLineItem(self.__size, self.__size/2, self.__size + 30, self.__size/2, self)
-        self.port_pos["out"] = QPointF(self.__size + 30, self.__size/2)
+        wires = [QLineF(size, size/2, size + 30, size/2)]
+        port_pos = {"out": QPointF(size + 30, size/2)}
 
         # Adding the input wires
         if type == "NOT":
-            arm = QGraphicsLineItem(-30, self.__size * 0.5, 0, self.__size * 0.5, self)
-            self.port_pos["in1"] = QPointF(-30, self.__size * 0.5)
-
-            for wire in [arm, leg]:
-                wire.setPen(self._pen)
+            wires.append(QLineF(-30, size * 0.5, 0, size * 0.5))
+            port_pos["in1"] = QPointF(-30, size * 0.5)
 
         else:
-            arm1 = QGraphicsLineItem(-30, self.__size * 0.2, extension * self.__size, self.__size * 0.2, self)
-            self.port_pos["in1"] = QPointF(-30, self.__size * 0.2)
-            arm2 = QGraphicsLineItem(-30, self.__size * 0.8, extension * self.__size, self.__size * 0.8, self)
-            self.port_pos["in2"] = QPointF(-30, self.__size * 0.8)
-
-            # Set the pen color of the wires
-            for wire in [arm1, arm2, leg]:
-                wire.setPen(self._pen)
-        
-    def draw_bubble(self, type: str):
+            wires.append(QLineF(-30, size * 0.2, extension * size, size * 0.2))
+            port_pos["in1"] = QPointF(-30, size * 0.2)
+            wires.append(QLineF(-30, size * 0.8, extension * size, size * 0.8))
+            port_pos["in2"] = QPointF(-30, size * 0.8)
+
+        return wires, port_pos
+
+    @staticmethod
+    def draw_bubble(type: str, size: float) -> QRectF:
         # Parameters
-        diameter = 0.15 * self.__size
-        bubble_x = self.__size
-        bubble_y = self.__size / 2
+        diameter = 0.15 * size
+        bubble_x = size
+        bubble_y = size / 2
 
         if type.upper() in ["NAND", "NOR", "XNOR", "NOT"]:
-            # Create a bubble
-            bubble = QGraphicsEllipseItem(bubble_x, bubble_y - diameter / 2, diameter, diameter, parent=self)
-            bubble.setBrush(QBrush(QColor('white')))
-            bubble.setPen(self._pen)
+            return QRectF(bubble_x, bubble_y - diameter / 2, diameter, diameter)
 
+        return None
@@ -1,72 +1,129 @@
 from __future__ import annotations
 
-from PyQt6.QtWidgets import QGraphicsPathItem, QGraphicsRectItem, QGraphicsEllipseItem
-from PyQt6.QtCore import QPointF
+from PyQt6.QtWidgets import QGraphicsPathItem, QGraphicsRectItem
+from PyQt6.QtCore import Qt, QPointF, QRectF
 from PyQt6.QtGui import QColor, QPen, QBrush
 
+from graphics.grid import GRID_SIZE, snap
+
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from graphics.connector import Connector
+    from graphics.router import Router
 
 class GraphicsItem(QGraphicsPathItem):
+
+    # Below this zoom level, items are drawn as plain boxes, without pins, labels or junction dots
+    LOD_THRESHOLD = 0.4
+
+    # Looked up once, as itemChange is called for every flag, pen and position set on every item
+    POSITION_CHANGE = QGraphicsPathItem.GraphicsItemChange.ItemPositionChange
+    POSITION_HAS_CHANGED = QGraphicsPathItem.GraphicsItemChange.ItemPositionHasChanged
+    FLAGS = (QGraphicsPathItem.GraphicsItemFlag.ItemIsMovable
+             | QGraphicsPathItem.GraphicsItemFlag.ItemIsSelectable
+             | QGraphicsPathItem.GraphicsItemFlag.ItemSendsGeometryChanges
+             | QGraphicsPathItem.GraphicsItemFlag.ItemSendsScenePositionChanges)
+
     def __init__(self):
         # Constants
-        self.GRID_SIZE = 5
+        self.GRID_SIZE = GRID_SIZE
         self.DOT_RADIUS = 3.5
 
         super().__init__()
         self.port_pos: dict[str, QPointF] = dict()
         self.connectors: dict[str, list[Connector]] = dict()
-        self.junction_dots: dict[str, QGraphicsEllipseItem] = dict()
+        self.junction_dots: set[str] = set()        # Ports with more than one connector, drawn with a dot
+        self.__dots_rect = QRectF()
+        self.router: Router = None      # Routes the connectors, around this item among others
 
         self._pen = QPen(QPen(QColor('black'), 2))
 
-        self.setFlag(QGraphicsPathItem.GraphicsItemFlag.ItemIsMovable)
-        self.setFlag(QGraphicsPathItem.GraphicsItemFlag.ItemIsSelectable)
-        self.setFlag(QGraphicsPathItem.GraphicsItemFlag.ItemSendsGeometryChanges)
-        self.setFlag(QGraphicsPathItem.GraphicsItemFlag.ItemSendsScenePositionChanges)
+        self.setFlags(GraphicsItem.FLAGS)
+
+    def __place_obstacle(self) -> None:
+        """Marks the outline of the item, where it is now, as an obstacle for the router"""
+        rect = self.mapRectToScene(self.path().boundingRect())
+        self.router.set_obstacle(self, rect.left(), rect.top(), rect.right(), rect.bottom())
 
     def itemChange(self, change, value):
 
-        if change == QGraphicsPathItem.GraphicsItemChange.ItemPositionHasChanged:
+        if change == GraphicsItem.POSITION_HAS_CHANGED:
+            if self.router is not None:
+                self.__place_obstacle()
+
+            # Connectors are redrawn once per frame, however many of their gates moved
             for connector_list in self.connectors.values():
                 for connector in connector_list:
-                    connector.update_position()
+                    connector.mark_dirty()
 
-        if change == QGraphicsPathItem.GraphicsItemChange.ItemPositionChange:
+        if change == GraphicsItem.POSITION_CHANGE:
             # Snap to grid size
-            x = round(value.x() / self.GRID_SIZE) * self.GRID_SIZE
-            y = round(value.y() / self.GRID_SIZE) * self.GRID_SIZE
-
-            return QPointF(x, y)
+            return QPointF(snap(value.x()), snap(value.y()))
         
         return super().itemChange(change, value)
     
+    def set_router(self, router: Router) -> None:
+        """Routes the connectors attached from now on with the router, which avoids this item"""
+        self.router = router
+        self.__place_obstacle()
+
     def add_connector(self, connector: Connector, port_name: str) -> None:
         if port_name not in self.connectors:
             self.connectors[port_name] = []
-            self.junction_dots[port_name] = None
             
         self.connectors[port_name].append(connector)
         self.add_junction_dot(port_name)
 
+    def add_connectors(self, connectors: list[Connector], port_name: str) -> None:
+        """Attaches several connectors to a pin at once, deciding on its junction dot once"""
+        self.connectors.setdefault(port_name, []).extend(connectors)
+        self.add_junction_dot(port_name)
+
+    def remove_connector(self, connector: Connector) -> None:
+        """Detaches a connector from whichever pin it is attached to. Junction dots are kept."""
+        for connector_list in self.connectors.values():
+            if connector in connector_list:
+                connector_list.remove(connector)
+
     def add_junction_dot(self, port_name: str) -> None:
 
         # If the junction dot doesn't exist, AND there is more than one connection
-        if self.junction_dots[port_name] is None and len(self.connectors[port_name]) > 1:
-            dot = QGraphicsEllipseItem(
-                    self.port_pos[port_name].x() - self.DOT_RADIUS, 
-                    self.port_pos[port_name].y() - self.DOT_RADIUS,
-                    self.DOT_RADIUS * 2,
-                    self.DOT_RADIUS * 2,
-                    parent=self
-                )
-            
-            dot.setBrush(QBrush(QColor('black')))
-            dot.setPen(self._pen)
-
-            self.junction_dots[port_name] = QGraphicsEllipseItem(parent=self)
+        if port_name not in self.junction_dots and len(self.connectors[port_name]) > 1:
+            self.prepareGeometryChange()
+            self.junction_dots.add(port_name)
+
+            # The dots are painted by the item itself, rather than being items of their own
+            center = self.port_pos[port_name]
+            margin = self.DOT_RADIUS + self._pen.widthF() / 2
+            self.__dots_rect = self.__dots_rect.united(
+                QRectF(center.x() - margin, center.y() - margin, margin * 2, margin * 2))
+
+    def boundingRect(self) -> QRectF:
+        rect = super().boundingRect()
+        return rect.united(self.__dots_rect) if self.junction_dots else rect
+
+    def zoomed_out(self, painter, option) -> bool:
+        """Draws the item as a box, and returns True, if the view is zoomed out past LOD_THRESHOLD"""
+        if option.levelOfDetailFromTransform(painter.worldTransform()) >= GraphicsItem.LOD_THRESHOLD:
+            return False
+
+        painter.setPen(QPen(Qt.PenStyle.NoPen))
+        painter.setBrush(self.brush())
+        painter.drawRect(self.path().boundingRect())
+        return True
+
+    def paint(self, painter, option, widget=None) -> None:
+        if self.zoomed_out(painter, option):
+            return
+
+        super().paint(painter, option, widget)
+
+        if self.junction_dots:
+            painter.setPen(self._pen)
+            painter.setBrush(QBrush(QColor('black')))
+            for port_name in self.junction_dots:
+                painter.drawEllipse(self.port_pos[port_name], self.DOT_RADIUS, self.DOT_RADIUS)
             
     
 class RectangularItem(QGraphicsRectItem):
@@ -0,0 +1,15 @@
+# The drawing grid that items snap to and wires are routed on. Kept free of Qt, so that the
+# router and the auto-placement can use it without a display.
+
+# Spacing of the grid, in scene units
+GRID_SIZE = 5
+
+
+def snap(value: float) -> float:
+    """Rounds a scene coordinate to the nearest grid line"""
+    return round(value / GRID_SIZE) * GRID_SIZE
+
+
+def cell(value: float) -> int:
+    """Returns the number of the grid line nearest to a scene coordinate"""
+    return round(value / GRID_SIZE)
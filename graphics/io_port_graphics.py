@@ -1,7 +1,7 @@
-from PyQt6.QtWidgets import QGraphicsLineItem, QGraphicsPathItem, QGraphicsTextItem
+from PyQt6.QtWidgets import QGraphicsPathItem
 from graphics.graphical_object import GraphicsItem
-from PyQt6.QtGui import QPainterPath, QColor, QPen, QBrush
-from PyQt6.QtCore import  QPointF
+from PyQt6.QtGui import QPainterPath, QColor, QPen, QBrush, QFont, QFontMetricsF
+from PyQt6.QtCore import Qt, QPointF, QLineF, QRectF
 
 class IOPortGraphics(GraphicsItem):
 
@@ -10,7 +10,7 @@ class IOPortGraphics(GraphicsItem):
 
         self.width = size
         self.height = size / 2
-        self.label = QGraphicsTextItem(label, parent=self)
+        self.label = label
 
         self.is_input = is_input
         self.__color = QColor('blue') if is_input else QColor('red')
@@ -49,16 +49,33 @@ class IOPortGraphics(GraphicsItem):
 
         # Adding the output wire
         if self.is_input:
-            pin = QGraphicsLineItem(self.width, self.height/2, self.width + 30, self.height/2, self)
+            self.__pin = QLineF(self.width, self.height/2, self.width + 30, self.height/2)
             self.port_pos["out"] = QPointF(self.width + 30, self.height/2)
         
         else:
-            pin = QGraphicsLineItem(0, self.height/2, -30, self.height/2, self)
+            self.__pin = QLineF(0, self.height/2, -30, self.height/2)
             self.port_pos["out"] = QPointF(-30, self.height/2)
-        
-        pin.setPen(self.__pen)
 
     def add_label(self) -> None:
-        self.label.setPos(0, -self.height - 3)
-        self.label.setDefaultTextColor(QColor('black'))
+        # Above the port, where a text item at (0, -height - 3) with its 4px document margin would put it
+        self.__font = QFont()
+        size = QFontMetricsF(self.__font).size(0, self.label)
+        self.__label_rect = QRectF(4, -self.height + 1, size.width(), size.height())
+
+    def boundingRect(self) -> QRectF:
+        margin = self.__pen.widthF() / 2
+        pin = QRectF(self.__pin.p1(), self.__pin.p2()).normalized().adjusted(-margin, -margin, margin, margin)
+        return super().boundingRect().united(pin).united(self.__label_rect)
+
+    def paint(self, painter, option, widget=None) -> None:
+        if self.zoomed_out(painter, option):
+            return
+
+        super().paint(painter, option, widget)
+
+        painter.setPen(self.__pen)
+        painter.drawLine(self.__pin)
 
+        painter.setPen(QColor('black'))
+        painter.setFont(self.__font)
+        painter.drawText(self.__label_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self.label)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from collections import Counter
+import heapq
+import math
+
+from graphics.grid import GRID_SIZE, cell
+
+from typing import Hashable
+
+
+class Router:
+    """
+    Routes wires as horizontal and vertical segments along the grid lines, around obstacles.
+
+    Each wire is found with an A* search over the grid points, whose state is a point and the
+    direction the wire arrived in, so that every bend costs BEND_COST on top of the length. The
+    heuristic adds the bends that are still needed to the Manhattan distance, which keeps the
+    search on the straight way to the target in open space. The search is confined to the box
+    around the two ends widened by SEARCH_MARGIN, and gives up after MAX_EXPANSIONS points, in
+    which case the wire takes a plain three-segment route.
+
+    Routes are cached by key, along with the ends they were found for, so a wire is only routed
+    again once one of its ends moves. Obstacles moved later do not reroute the wires they now
+    cross.
+    """
+
+    BEND_COST = 4               # In grid steps
+    SEARCH_MARGIN = 20          # Grid steps around the box of the two ends
+    MAX_EXPANSIONS = 5000
+    GREED = 1.5                 # Weight of the heuristic: routes at most this much longer, found much faster
+
+    # Directions: right, down, left, up
+    DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+    NONE = 4
+
+    # ========== Private Functions ==========
+    @staticmethod
+    def __bends(direction: int, dx: int, dy: int) -> int:
+        """Returns the fewest bends that a wire going in the direction needs to cover the offset"""
+        needed = []
+        if dx:
+            needed.append(0 if dx > 0 else 2)
+        if dy:
+            needed.append(1 if dy > 0 else 3)
+
+        if not needed:
+            return 0
+        if direction == Router.NONE:
+            return len(needed) - 1
+        if len(needed) == 1:
+            if direction == needed[0]:
+                return 0
+            return 2 if direction == (needed[0] + 2) % 4 else 1
+        return 1 if direction in needed else 2
+
+    @staticmethod
+    def __cells(box: tuple[int, int, int, int]) -> list[tuple[int, int]]:
+        """Returns the grid points in the box"""
+        rows = range(box[1], box[3] + 1)
+        return [(x, y) for x in range(box[0], box[2] + 1) for y in rows]
+
+    def __search(self, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """Returns the grid points where the route from start to end turns, None if none was found"""
+        (sx, sy), (ex, ey) = start, end
+        margin = Router.SEARCH_MARGIN
+        left, right = min(sx, ex) - margin, max(sx, ex) + margin
+        top, bottom = min(sy, ey) - margin, max(sy, ey) + margin
+        blocked = self.__blocked
+        bends = self.__bend_table
+        bend_cost, greed, none = Router.BEND_COST, Router.GREED, Router.NONE
+
+        def heuristic(x: int, y: int, direction: int) -> float:
+            dx, dy = ex - x, ey - y
+            signs = ((dx > 0) - (dx < 0) + 1) * 3 + (dy > 0) - (dy < 0) + 1
+            return greed * (abs(dx) + abs(dy) + bend_cost * bends[signs * 5 + direction])
+
+        first = (sx, sy, none)
+        cost = {first: 0}
+        parents = {first: None}
+        heap = [(heuristic(sx, sy, none), 0, 0, first)]
+        counter = 0
+        expansions = 0
+
+        while heap:
+            _, negative_cost, _, state = heapq.heappop(heap)
+            if -negative_cost > cost[state]:
+                continue
+
+            x, y, direction = state
+            if x == ex and y == ey:
+                # Keep the points where the direction changes
+                corners = [end]
+                previous = direction
+                state = parents[state]
+                while state is not None:
+                    if state[2] != previous:
+                        corners.append((state[0], state[1]))
+                        previous = state[2]
+                    state = parents[state]
+                corners.reverse()
+                return corners
+
+            expansions += 1
+            if expansions > Router.MAX_EXPANSIONS:
+                return None
+
+            reverse = (direction + 2) % 4 if direction != none else none
+            for turn, (dx, dy) in enumerate(Router.DIRECTIONS):
+                if turn == reverse:
+                    continue
+
+                nx, ny = x + dx, y + dy
+                if not (left <= nx <= right and top <= ny <= bottom):
+                    continue
+                if (nx, ny) in blocked and (nx != ex or ny != ey):
+                    continue
+
+                successor = (nx, ny, turn)
+                new_cost = 1 - negative_cost + (bend_cost if direction != turn and direction != none else 0)
+                if new_cost < cost.get(successor, math.inf):
+                    cost[successor] = new_cost
+                    parents[successor] = state
+                    counter += 1
+
+                    # Ties go to the deepest state, which is closest to the target
+                    heapq.heappush(heap, (new_cost + heuristic(nx, ny, turn), -new_cost, counter, successor))
+
+        return None
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        # Fewest bends by the signs of the offset to the target and the current direction
+        self.__bend_table: list[int] = [Router.__bends(direction, dx, dy)
+                                        for dx in (-1, 0, 1) for dy in (-1, 0, 1) for direction in range(5)]
+        self.__blocked: Counter[tuple[int, int]] = Counter()     # Number of obstacles covering each grid point
+        self.__obstacles: dict[Hashable, tuple[int, int, int, int]] = dict()
+        self.__routes: dict[Hashable, tuple[tuple[float, float], tuple[float, float], list[tuple[float, float]]]] = dict()
+
+        # Statistics
+        self.routed: int = 0
+        self.reused: int = 0
+
+    def set_obstacle(self, key: Hashable, left: float, top: float, right: float, bottom: float) -> None:
+        """Adds the rectangle (in scene units) as an obstacle, replacing the one with the same key"""
+        self.remove_obstacle(key)
+
+        box = (math.ceil(left / GRID_SIZE), math.ceil(top / GRID_SIZE),
+               math.floor(right / GRID_SIZE), math.floor(bottom / GRID_SIZE))
+        self.__obstacles[key] = box
+        self.__blocked.update(Router.__cells(box))
+
+    def remove_obstacle(self, key: Hashable) -> None:
+        box = self.__obstacles.pop(key, None)
+        if box is None:
+            return
+
+        blocked = self.__blocked
+        for point in Router.__cells(box):
+            if blocked[point] == 1:
+                del blocked[point]
+            else:
+                blocked[point] -= 1
+
+    def route(self, key: Hashable, start: tuple[float, float], end: tuple[float, float]) -> list[tuple[float, float]]:
+        """
+        Returns the route of a wire, from the cache if its ends have not moved.
+
+        Args:
+            key (Hashable): Identifies the wire in the cache.
+            start (tuple[float, float]): Scene position of the source pin.
+            end (tuple[float, float]): Scene position of the destination pin.
+
+        Returns:
+            list[tuple[float, float]]: The points of the route, from start to end.
+        """
+        cached = self.__routes.get(key)
+        if cached is not None and cached[0] == start and cached[1] == end:
+            self.reused += 1
+            return cached[2]
+
+        self.routed += 1
+        corners = self.__search((cell(start[0]), cell(start[1])), (cell(end[0]), cell(end[1])))
+        if corners is None:
+            middle = (start[0] + end[0]) / 2
+            points = [start] + [(middle, start[1]), (middle, end[1])] * (start[1] != end[1]) + [end]
+        else:
+            points = [start] + [(x * GRID_SIZE, y * GRID_SIZE) for x, y in corners[1:-1]] + [end]
+
+        self.__routes[key] = (start, end, points)
+        return points
+
+    def forget(self, key: Hashable) -> None:
+        """Drops a wire from the cache"""
+        self.__routes.pop(key, None)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class SpatialIndex:
+    """
+    Indexes items by a point (such as the position of a gate), in a uniform grid of square cells.
+
+    A rectangle query only looks at the cells it overlaps, so its cost is the number of those
+    cells and of the items in them, whatever the size of the whole design. The index does not
+    depend on Qt, so it can be built from the stored positions of the model.
+    """
+
+    # ========== Private Functions ==========
+    def __cell(self, x: float, y: float) -> tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    # ========== Public Functions ==========
+    def __init__(self, cell_size: float = 500) -> None:
+        self.cell_size: float = cell_size
+        self.__cells: dict[tuple[int, int], list[tuple[float, float, Any]]] = dict()
+        self.__count: int = 0
+
+        # Extent of the indexed points, as (left, top, right, bottom)
+        self.bounds: tuple[float, float, float, float] = None
+
+    def __len__(self):
+        return self.__count
+
+    def insert(self, item: Any, x: float, y: float) -> None:
+        self.__cells.setdefault(self.__cell(x, y), []).append((x, y, item))
+        self.__count += 1
+
+        if self.bounds is None:
+            self.bounds = (x, y, x, y)
+        else:
+            left, top, right, bottom = self.bounds
+            self.bounds = (min(left, x), min(top, y), max(right, x), max(bottom, y))
+
+    def query(self, left: float, top: float, right: float, bottom: float) -> list[Any]:
+        """Returns the items whose point lies in the rectangle"""
+        first_column, first_row = self.__cell(left, top)
+        last_column, last_row = self.__cell(right, bottom)
+
+        # A rectangle wider than the design only needs the cells that exist
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(self.__cells):
+            cells = [cell for (column, row), cell in self.__cells.items()
+                     if first_column <= column <= last_column and first_row <= row <= last_row]
+        else:
+            cells = [self.__cells[(column, row)]
+                     for column in range(first_column, last_column + 1)
+                     for row in range(first_row, last_row + 1) if (column, row) in self.__cells]
+
+        return [item for cell in cells for x, y, item in cell if left <= x <= right and top <= y <= bottom]
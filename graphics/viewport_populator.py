@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from graphics.spatial_index import SpatialIndex
+from graphics.router import Router
+from py_objects.gates.gate import Gate
+from py_objects.signals.io_port import IOPort
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QGraphicsView
+    from py_objects.components.component import Component
+    from py_objects.signals.signal import Signal
+
+
+class ViewportPopulator:
+    """
+    Draws the gates and I/O ports of a component only once the view scrolls near them.
+
+    The stored positions of the gates and ports are put in a spatial index. Whenever the view
+    scrolls, zooms or is resized, the objects around the visible region are looked up, and the
+    ones not drawn yet are drawn with all of their connectors, and so with the objects at the
+    other end of those. Items are kept once drawn, as Qt only paints the visible ones anyway.
+    The scene rectangle is set to the whole design up front, so the scroll bars cover it all.
+
+    Objects moved in the model after the populator is created are found at their old position.
+    Connectors are routed around the objects drawn so far.
+    """
+
+    # Farthest that the drawing of an object reaches from its position (pins, labels)
+    MARGIN = 100
+
+    # ========== Private Functions ==========
+    def __draw(self, obj: Gate | IOPort) -> None:
+        if id(obj) in self.__drawn:
+            return
+
+        self.__drawn.add(id(obj))
+        if isinstance(obj, IOPort):
+            obj.draw_port(self.scene)
+        else:
+            obj.draw(self.scene)
+
+        if self.router is not None:
+            obj.vector_item.set_router(self.router)
+
+    def __scrolled(self, *_) -> None:
+        self.update()
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component, view: QGraphicsView, prefetch: float = 0.5, route_wires: bool = True) -> None:
+        """
+        Args:
+            component (Component): The component to draw.
+            view (QGraphicsView): The view showing it, whose scene the items are added to.
+            prefetch (float, optional): How far around the viewport to draw, as a fraction of its size.
+            route_wires (bool, optional): Route the connectors along the grid, rather than drawing
+                them as straight lines.
+        """
+        self.component: Component = component
+        self.view: QGraphicsView = view
+        self.scene = view.scene()
+        self.prefetch: float = prefetch
+        self.index: SpatialIndex = SpatialIndex()
+        self.router: Router = Router() if route_wires else None
+
+        self.__drawn: set[int] = set()          # Objects with a graphics item in the scene, by id()
+        self.__visited: set[int] = set()        # Objects whose connectors are drawn too
+        self.__edges: set[tuple[int, int]] = set()      # Drawn connectors, as (id(signal), destination number)
+
+        # Connections of every object, as (signal, destination number, destination, destination port)
+        self.__adjacent: dict[int, list[tuple[Signal, int, Gate | IOPort, str]]] = dict()
+
+        for obj in component.gates.list_items() + component.io_ports.list_items():
+            self.index.insert(obj, *obj.pos())
+
+        # Sub-components have no graphics yet, so their connections are left out
+        for signal in component.connections.list_items() + component.io_ports.list_items():
+            if not isinstance(signal.src, (Gate, IOPort)):
+                continue
+
+            for number, (dest, dest_port) in enumerate(signal.dests):
+                if isinstance(dest, (Gate, IOPort)):
+                    edge = (signal, number, dest, dest_port)
+                    self.__adjacent.setdefault(id(signal.src), []).append(edge)
+                    self.__adjacent.setdefault(id(dest), []).append(edge)
+
+        if self.index.bounds is not None:
+            left, top, right, bottom = self.index.bounds
+            margin = ViewportPopulator.MARGIN
+            self.scene.setSceneRect(left - margin, top - margin, right - left + 2 * margin, bottom - top + 2 * margin)
+
+        for scroll_bar in (view.horizontalScrollBar(), view.verticalScrollBar()):
+            scroll_bar.valueChanged.connect(self.__scrolled)
+            scroll_bar.rangeChanged.connect(self.__scrolled)
+
+        self.update()
+
+    def close(self) -> None:
+        """Stops following the view. The items drawn so far stay in the scene."""
+        for scroll_bar in (self.view.horizontalScrollBar(), self.view.verticalScrollBar()):
+            scroll_bar.valueChanged.disconnect(self.__scrolled)
+            scroll_bar.rangeChanged.disconnect(self.__scrolled)
+
+    def update(self) -> int:
+        """
+        Draws the objects around the visible region that are not drawn yet.
+
+        Returns:
+            int: The number of objects whose connectors were drawn by this call.
+        """
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        extra = self.prefetch * max(visible.width(), visible.height()) + ViewportPopulator.MARGIN
+
+        # All the objects first, so that the connectors are routed around them
+        objects = [obj for obj in self.index.query(visible.left() - extra, visible.top() - extra,
+                                                   visible.right() + extra, visible.bottom() + extra)
+                   if id(obj) not in self.__visited]
+        for obj in objects:
+            self.__visited.add(id(obj))
+            self.__draw(obj)
+
+        for obj in objects:
+            for signal, number, dest, dest_port in self.__adjacent.get(id(obj), ()):
+                if (id(signal), number) not in self.__edges:
+                    self.__edges.add((id(signal), number))
+                    self.__draw(signal.src)
+                    self.__draw(dest)
+                    signal.draw_connection(self.scene, dest, dest_port)
+
+        return len(objects)
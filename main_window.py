@@ -22,7 +22,6 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Component Creator")
 
         # TEST: Creating a D-Latch ===================================================
-        # TODO: Simulate the D-Latch below
 
         # dLatch.save("test_component.json")
         dLatch = Component.load("samples/DLatch.dcs.json")
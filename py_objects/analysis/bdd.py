@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+from py_objects.netlist.netlist import Netlist
+from exceptions.illegal_operation_exception import IllegalOperationException
+from exceptions.bitsizemismatch_exception import BitSizeMismatchException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+
+class BDD:
+    """
+    Manager for reduced ordered binary decision diagrams.
+
+    Nodes are integers indexing parallel arrays (variable, low child, high child, reference
+    count), with 0 and 1 as the terminals. Every variable has its own unique table, keyed by
+    the children, so a function has exactly one node. Results of ITE are kept in a computed
+    table of fixed size, where a new entry simply replaces the one in its slot.
+
+    The variable order can be improved by sifting: each variable is moved through every level
+    by swapping adjacent levels in place, and left where the diagram was smallest. Node numbers
+    do not change during a swap, so a node handed out before reordering still denotes the same
+    function afterwards, as long as it was protected with `ref`. Unreferenced nodes are freed
+    when reordering starts.
+    """
+
+    ZERO, ONE = 0, 1
+
+    # ========== Private Functions ==========
+    def __level(self, node: int) -> int:
+        """Returns the level of a node, the terminals being below every variable"""
+        return self.__levels[self.var[node]] if node > 1 else len(self.__order)
+
+    def __make(self, var: int, low: int, high: int) -> int:
+        """Returns the node (var ? high : low), creating it if it does not exist"""
+        if low == high:
+            return low
+
+        table = self.__unique[var]
+        node = table.get((low, high))
+        if node is None:
+            node = len(self.var)
+            self.var.append(var)
+            self.low.append(low)
+            self.high.append(high)
+            self.__refs.append(0)
+            self.__refs[low] += 1
+            self.__refs[high] += 1
+            table[(low, high)] = node
+
+        return node
+
+    def __cofactors(self, node: int, level: int) -> tuple[int, int]:
+        """Returns the cofactors of a node with respect to the variable at a level"""
+        if node > 1 and self.__levels[self.var[node]] == level:
+            return self.low[node], self.high[node]
+        return node, node
+
+    def __free(self, node: int) -> None:
+        """Drops a reference from a node, freeing it and its unreferenced descendants"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            self.__refs[node] -= 1
+            if node > 1 and self.__refs[node] == 0:
+                del self.__unique[self.var[node]][(self.low[node], self.high[node])]
+                stack.append(self.low[node])
+                stack.append(self.high[node])
+
+    def __collect(self) -> None:
+        """Frees every node that is not reachable from a referenced node, and recounts the references"""
+        live = [False] * len(self.var)
+        live[0] = live[1] = True
+        stack = list(self.__external)
+        while stack:
+            node = stack.pop()
+            if not live[node]:
+                live[node] = True
+                stack.append(self.low[node])
+                stack.append(self.high[node])
+
+        refs = [0] * len(self.var)
+        for node, count in self.__external.items():
+            refs[node] = count
+
+        for table in self.__unique:
+            for key in [key for key, node in table.items() if not live[node]]:
+                del table[key]
+            for low, high in table:
+                refs[low] += 1
+                refs[high] += 1
+
+        self.__refs = refs
+        self.__computed = [None] * len(self.__computed)
+
+    def __swap(self, level: int) -> None:
+        """Swaps the variables at a level and the level below, in place"""
+        x, y = self.__order[level], self.__order[level + 1]
+        x_table, y_table = self.__unique[x], self.__unique[y]
+
+        # Only the nodes of x with a child labelled y have to change
+        moved = [node for node in x_table.values() if self.var[self.low[node]] == y or self.var[self.high[node]] == y]
+
+        for node in moved:
+            del x_table[(self.low[node], self.high[node])]
+
+        # x goes one level down
+        self.__order[level], self.__order[level + 1] = y, x
+        self.__levels[x], self.__levels[y] = level + 1, level
+
+        for node in moved:
+            f0, f1 = self.low[node], self.high[node]
+            f00, f01 = self.__cofactors(f0, level)
+            f10, f11 = self.__cofactors(f1, level)
+
+            low = self.__make(x, f00, f10)
+            high = self.__make(x, f01, f11)
+            self.__refs[low] += 1
+            self.__refs[high] += 1
+
+            self.var[node], self.low[node], self.high[node] = y, low, high
+            y_table[(low, high)] = node
+
+            self.__free(f0)
+            self.__free(f1)
+
+    def __size(self) -> int:
+        return sum(len(table) for table in self.__unique)
+
+    def __sift(self, var: int, max_growth: float) -> None:
+        """Moves a variable to the level where the diagram is smallest"""
+        levels = len(self.__order)
+        best_size, best_level = self.__size(), self.__levels[var]
+        limit = best_size * max_growth
+
+        # Down to the bottom, then up to the top
+        for direction, end in ((1, levels - 1), (-1, 0)):
+            while self.__levels[var] != end:
+                level = self.__levels[var]
+                self.__swap(level if direction == 1 else level - 1)
+
+                size = self.__size()
+                if size < best_size:
+                    best_size, best_level = size, self.__levels[var]
+                if size > limit:
+                    break
+
+        while self.__levels[var] < best_level:
+            self.__swap(self.__levels[var])
+        while self.__levels[var] > best_level:
+            self.__swap(self.__levels[var] - 1)
+
+    # ========== Public Functions ==========
+    def __init__(self, names: list[str] = (), cache_size: int = 1 << 16) -> None:
+        """
+        Args:
+            names (list[str]): The variables, from the top level down.
+            cache_size (int): The number of slots of the computed table.
+        """
+        self.var: list[int] = [-1, -1]
+        self.low: list[int] = [0, 1]
+        self.high: list[int] = [0, 1]
+        self.__refs: list[int] = [1, 1]
+        self.__external: dict[int, int] = dict()    # Nodes protected by `ref`
+
+        self.names: list[str] = []
+        self.__order: list[int] = []     # Variable at every level
+        self.__levels: list[int] = []    # Level of every variable
+        self.__unique: list[dict[tuple[int, int], int]] = []
+        self.__computed: list[tuple | None] = [None] * cache_size
+
+        for name in names:
+            self.add_variable(name)
+
+    def __len__(self):
+        """Returns the number of internal nodes in the unique tables"""
+        return self.__size()
+
+    def add_variable(self, name: str) -> int:
+        """Adds a variable below the existing ones and returns the node testing it"""
+        var = len(self.names)
+        self.names.append(name)
+        self.__levels.append(len(self.__order))
+        self.__order.append(var)
+        self.__unique.append(dict())
+        return self.__make(var, BDD.ZERO, BDD.ONE)
+
+    def variable(self, name: str) -> int:
+        """Returns the node testing a variable"""
+        return self.__make(self.names.index(name), BDD.ZERO, BDD.ONE)
+
+    def order(self) -> list[str]:
+        """Returns the variable names from the top level down"""
+        return [self.names[var] for var in self.__order]
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """Returns the node of (f ? g : h)"""
+        # Terminal cases
+        if f == BDD.ONE or g == h:
+            return g
+        if f == BDD.ZERO:
+            return h
+        if g == BDD.ONE and h == BDD.ZERO:
+            return f
+
+        key = (f, g, h)
+        slot = hash(key) % len(self.__computed)
+        entry = self.__computed[slot]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        level = min(self.__level(f), self.__level(g), self.__level(h))
+        f0, f1 = self.__cofactors(f, level)
+        g0, g1 = self.__cofactors(g, level)
+        h0, h1 = self.__cofactors(h, level)
+
+        result = self.__make(self.__order[level], self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self.__computed[slot] = (key, result)
+        return result
+
+    def not_(self, f: int) -> int:
+        return self.ite(f, BDD.ZERO, BDD.ONE)
+
+    def and_(self, f: int, g: int) -> int:
+        return self.ite(f, g, BDD.ZERO)
+
+    def or_(self, f: int, g: int) -> int:
+        return self.ite(f, BDD.ONE, g)
+
+    def xor(self, f: int, g: int) -> int:
+        return self.ite(f, self.not_(g), g)
+
+    def apply(self, op: str, f: int, g: int = None) -> int:
+        """Applies a gate operation ('and', 'or', 'xor', 'nand', 'nor', 'xnor' or 'not')"""
+        if op == "not":
+            return self.not_(f)
+
+        inverted = op in ("nand", "nor", "xnor")
+        base = {"and": self.and_, "nand": self.and_, "or": self.or_, "nor": self.or_,
+                "xor": self.xor, "xnor": self.xor}[op]
+        result = base(f, g)
+        return self.not_(result) if inverted else result
+
+    def ref(self, node: int) -> int:
+        """Protects a node from being freed by reordering, and returns it"""
+        self.__external[node] = self.__external.get(node, 0) + 1
+        self.__refs[node] += 1
+        return node
+
+    def deref(self, node: int) -> None:
+        """Releases a node protected by `ref`"""
+        count = self.__external[node] - 1
+        if count:
+            self.__external[node] = count
+        else:
+            del self.__external[node]
+        self.__refs[node] -= 1
+
+    def reorder(self, max_growth: float = 1.2) -> int:
+        """
+        Sifts every variable, the ones with the most nodes first. Only nodes protected by `ref`
+        survive.
+
+        Args:
+            max_growth (float): How much the diagram may grow while a variable is moved in one direction.
+
+        Returns:
+            int: The number of nodes after reordering.
+        """
+        self.__collect()
+        for var in sorted(range(len(self.names)), key=lambda var: -len(self.__unique[var])):
+            self.__sift(var, max_growth)
+
+        self.__computed = [None] * len(self.__computed)
+        return self.__size()
+
+    def sat_count(self, f: int) -> int:
+        """Returns the number of assignments of all the variables that satisfy f"""
+        levels = len(self.__order)
+        counts = {BDD.ZERO: 0, BDD.ONE: 1}
+
+        def count(node: int) -> int:
+            """Satisfying assignments of the variables from the level of the node down"""
+            if node not in counts:
+                level = self.__level(node)
+                low, high = self.low[node], self.high[node]
+                counts[node] = (count(low) << (self.__level(low) - level - 1)) + \
+                               (count(high) << (self.__level(high) - level - 1))
+            return counts[node]
+
+        return count(f) << (self.__level(f) if f > 1 else levels)
+
+    def is_tautology(self, f: int) -> bool:
+        return f == BDD.ONE
+
+    def is_satisfiable(self, f: int) -> bool:
+        return f != BDD.ZERO
+
+    def support(self, f: int) -> set[str]:
+        """Returns the names of the variables that f depends on"""
+        found, seen, stack = set(), set(), [f]
+        while stack:
+            node = stack.pop()
+            if node > 1 and node not in seen:
+                seen.add(node)
+                found.add(self.names[self.var[node]])
+                stack.extend((self.low[node], self.high[node]))
+
+        return found
+
+    def satisfy_one(self, f: int) -> dict[str, int] | None:
+        """Returns an assignment of the support of f that satisfies it, or None"""
+        if f == BDD.ZERO:
+            return None
+
+        assignment = dict()
+        while f > 1:
+            name = self.names[self.var[f]]
+            if self.low[f] != BDD.ZERO:
+                assignment[name], f = 0, self.low[f]
+            else:
+                assignment[name], f = 1, self.high[f]
+
+        return assignment
+
+    def evaluate(self, f: int, assignment: dict[str, int]) -> int:
+        """Returns the value of f for an assignment of its variables"""
+        while f > 1:
+            f = self.high[f] if assignment[self.names[self.var[f]]] else self.low[f]
+        return f
+
+
+def build_output_bdds(component: Component, reorder: bool = True, reorder_threshold: int = 10000) -> tuple[BDD, dict[str, int]]:
+    """
+    Builds the BDD of every output port of a combinational component, with one variable per
+    input port.
+
+    Args:
+        component (Component): A flat, combinational component with single-bit ports.
+        reorder (bool): Whether to sift the variables while building and once at the end.
+        reorder_threshold (int): The number of nodes at which the variables are sifted during
+            the build. The threshold doubles after every reordering.
+
+    Returns:
+        tuple[BDD, dict[str, int]]: The manager, and the (referenced) node of every output port.
+    """
+    netlist = component.netlist
+    ports = component.io_ports.list_items()
+    for port in ports:
+        if port.bit_size != 1:
+            raise BitSizeMismatchException(
+                f"Port '{port.name}' is {port.bit_size} bits wide. Only single-bit ports can be analysed."
+            )
+
+    ordered, looped = netlist.levelize()
+    if looped:
+        raise IllegalOperationException(
+            f"The component contains a feedback loop through {', '.join(str(netlist.gates[gate]) for gate in looped)}, "
+            "so it has no combinational function."
+        )
+
+    manager = BDD()
+    nodes: list[int | None] = [None] * len(netlist.nets)
+    for port in ports:
+        if port.is_input:
+            nodes[port.index] = manager.ref(manager.add_variable(port.name))
+
+    # Remaining readers of every net, so intermediate results can be released
+    offsets, _, _ = netlist.fanout()
+    pending = [offsets[net + 1] - offsets[net] for net in range(len(netlist.nets))]
+    outputs = {port.index for port in ports if not port.is_input}
+
+    def read(net: int) -> int:
+        if net < 0 or nodes[net] is None:
+            name = netlist.nets[net].name if net >= 0 else "?"
+            raise IllegalOperationException(f"Signal '{name}' is not driven by any gate or input port.")
+
+        node = nodes[net]
+        pending[net] -= 1
+        if pending[net] == 0 and net not in outputs:
+            manager.deref(node)
+            held[net] = False
+        return node
+
+    held = [node is not None for node in nodes]
+    for gate in ordered:
+        op = Netlist.GATE_TYPES[netlist.gate_types[gate]]
+        a = read(netlist.gate_in1[gate])
+        b = read(netlist.gate_in2[gate]) if op != "not" else None
+        result = manager.apply(op, a, b)
+
+        for net in netlist.outputs(gate):
+            nodes[net] = manager.ref(result)
+            held[net] = True
+
+        if reorder and len(manager) > reorder_threshold:
+            manager.reorder()
+            reorder_threshold *= 2
+
+    results = dict()
+    for port in ports:
+        if not port.is_input:
+            if nodes[port.index] is None:
+                raise IllegalOperationException(f"Signal '{port.name}' is not driven by any gate or input port.")
+            results[port.name] = nodes[port.index]
+
+    # Only the outputs stay referenced
+    for net, node in enumerate(nodes):
+        if held[net] and net not in outputs:
+            manager.deref(node)
+
+    if reorder:
+        manager.reorder()
+
+    return manager, results
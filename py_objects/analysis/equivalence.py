@@ -0,0 +1,426 @@
+from __future__ import annotations
+import random
+import time
+
+from py_objects.netlist.netlist import Netlist
+from py_objects.analysis.sat import SATSolver
+from py_objects.simulation.compiled_simulator import CompiledSimulator
+from exceptions.illegal_operation_exception import IllegalOperationException
+from exceptions.bitsizemismatch_exception import BitSizeMismatchException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+
+class EquivalenceResult:
+    """The outcome of checking two components for equivalence"""
+
+    def __init__(self, equivalent: bool, method: str) -> None:
+        self.equivalent: bool = equivalent
+        self.method: str = method                       # "simulation", "structure" or "SAT"
+        self.counterexample: dict[str, int] = dict()    # Input values for which the outputs differ
+        self.outputs: list[str] = []                    # The outputs that differ for the counterexample
+        self.vectors: int = 0           # Random vectors simulated
+        self.merged: int = 0            # Nodes proven equal to an earlier node while sweeping
+        self.sat_calls: int = 0
+        self.conflicts: int = 0
+        self.seconds: float = 0.0
+
+    def __str__(self):
+        if self.equivalent:
+            return (f"Equivalent, proven by {self.method} in {self.seconds:.2f} s "
+                    f"({self.vectors} random vectors, {self.merged} nodes merged, {self.sat_calls} SAT calls, "
+                    f"{self.conflicts} conflicts)")
+
+        vector = " ".join(f"{name}={value}" for name, value in self.counterexample.items())
+        return (f"Not equivalent, found by {self.method} in {self.seconds:.2f} s: "
+                f"{', '.join(self.outputs)} differ for {vector}")
+
+    def __repr__(self):
+        return str(self)
+
+
+class EquivalenceChecker:
+    """
+    Combinational equivalence checker for two components with the same I/O ports.
+
+    Both components are first simulated bit-parallel on the same random vectors, which finds
+    most differences at once. If none is found, their gates are rebuilt into one miter graph
+    over shared inputs, made only of AND and XOR nodes with complemented edges, so that
+    identical logic in the two versions hashes to the same node and inverters cost nothing.
+    While the graph is built, every node is simulated on the same vectors, and a node whose
+    values match an earlier node (or its complement, or a constant) is checked with the SAT
+    solver on the Tseitin encoding of their cones. If they are proven equal, the later node is
+    replaced by the earlier one, so the logic downstream of them merges structurally as well
+    (SAT sweeping). This keeps every proof local, which is what lets the check scale to tens
+    of thousands of gates. The pairs of outputs that did not end up on the same node are then
+    proven, or refuted with a counterexample, by the solver.
+    """
+
+    # Node kinds. Node 0 is the constant 0, and literal 2n + 1 is the complement of node n
+    CONSTANT, INPUT, AND, XOR = range(4)
+
+    # Vectors simulated per pass
+    WIDTH = 1024
+
+    # Counterexamples found while sweeping that are collected before re-simulating every node
+    REFINE_BATCH = 64
+
+    # ========== Private Functions ==========
+    def __node(self, kind: int, a: int, b: int, value: int) -> int:
+        """Adds a node and returns its positive literal"""
+        self.__kind.append(kind)
+        self.__fanin.append((a, b))
+        self.__values.append(value)
+        self.__variables.append(0)
+        return 2 * (len(self.__kind) - 1)
+
+    def __value(self, literal: int) -> int:
+        """Returns the simulation values of a literal"""
+        value = self.__values[literal >> 1]
+        return value ^ self.__mask if literal & 1 else value
+
+    def __and(self, a: int, b: int) -> int:
+        """Returns the literal of (a and b), folding constants and hashing the node"""
+        if a > b:
+            a, b = b, a
+        if a == 0 or a == b ^ 1:
+            return 0
+        if a == 1 or a == b:
+            return b
+
+        return self.__hashed(EquivalenceChecker.AND, a, b)
+
+    def __xor(self, a: int, b: int) -> int:
+        """Returns the literal of (a xor b), with the complements moved to the output"""
+        complement = (a ^ b) & 1
+        a, b = a & ~1, b & ~1
+        if a > b:
+            a, b = b, a
+        if a == b:
+            return complement
+        if a == 0:
+            return b ^ complement
+
+        return self.__hashed(EquivalenceChecker.XOR, a, b) ^ complement
+
+    def __hashed(self, kind: int, a: int, b: int) -> int:
+        """Returns the node for an AND or XOR of two literals, creating and sweeping it if it is new"""
+        key = (kind, a, b)
+        literal = self.__strash.get(key)
+        if literal is not None:
+            return literal
+
+        if kind == EquivalenceChecker.AND:
+            value = self.__value(a) & self.__value(b)
+        else:
+            value = self.__value(a) ^ self.__value(b)
+
+        literal = self.__sweep(self.__node(kind, a, b, value))
+        self.__strash[key] = literal
+        return literal
+
+    def __signature(self, literal: int) -> tuple[int, int]:
+        """
+        Returns the simulation values of a node, complemented if needed so that the first vector
+        is 0, and the literal of the node that has those values.
+        """
+        value = self.__values[literal >> 1]
+        return (value ^ self.__mask, literal | 1) if value & 1 else (value, literal & ~1)
+
+    def __sweep(self, literal: int) -> int:
+        """Replaces a new node with an earlier node it is proven equal to, if any"""
+        signature, normalized = self.__signature(literal)
+        candidate = self.__classes.get(signature)
+        if candidate is not None:
+            candidate ^= normalized ^ literal
+            if self.__prove(literal, candidate, self.conflict_limit):
+                self.__result.merged += 1
+                return candidate
+
+        # Counterexamples may have changed the simulation values in the meantime
+        self.__classes.setdefault(*self.__signature(literal))
+        return literal
+
+    def __variable(self, literal: int) -> int:
+        """Returns the DIMACS literal of a node, adding the Tseitin clauses of its cone to the solver"""
+        node = literal >> 1
+        if not self.__variables[node]:
+            stack = [node]
+            while stack:
+                node = stack[-1]
+                if self.__variables[node]:
+                    stack.pop()
+                    continue
+
+                kind, (a, b) = self.__kind[node], self.__fanin[node]
+                pending = [child >> 1 for child in (a, b) if kind > EquivalenceChecker.INPUT and not self.__variables[child >> 1]]
+                if pending:
+                    stack.extend(pending)
+                    continue
+
+                stack.pop()
+                self.__variables[node] = out = self.__solver.new_variable()
+                if kind == EquivalenceChecker.CONSTANT:
+                    self.__solver.add_clause([-out])
+                elif kind == EquivalenceChecker.AND:
+                    x, y = self.__dimacs(a), self.__dimacs(b)
+                    self.__solver.add_clause([-out, x])
+                    self.__solver.add_clause([-out, y])
+                    self.__solver.add_clause([out, -x, -y])
+                elif kind == EquivalenceChecker.XOR:
+                    x, y = self.__dimacs(a), self.__dimacs(b)
+                    self.__solver.add_clause([-out, x, y])
+                    self.__solver.add_clause([-out, -x, -y])
+                    self.__solver.add_clause([out, -x, y])
+                    self.__solver.add_clause([out, x, -y])
+
+        return self.__dimacs(literal)
+
+    def __dimacs(self, literal: int) -> int:
+        """Returns the DIMACS literal of a node that is already in the solver"""
+        variable = self.__variables[literal >> 1]
+        return -variable if literal & 1 else variable
+
+    def __prove(self, a: int, b: int, conflict_limit: int = None) -> bool | None:
+        """
+        Checks whether two literals are equal for every input.
+
+        Returns:
+            bool | None: True if they are, False if they differ for the counterexample that was
+                recorded, or None if the solver gave up.
+        """
+        x, y = self.__variable(a), self.__variable(b)
+        for assumptions in ([x, -y], [-x, y]):
+            self.__result.sat_calls += 1
+            satisfiable = self.__solver.solve(assumptions, conflict_limit)
+            if satisfiable is None:
+                return None
+            if satisfiable:
+                self.__witness = self.__counterexample()
+                return False
+
+        # Later proofs can rely on the equality
+        self.__solver.add_clause([-x, y])
+        self.__solver.add_clause([x, -y])
+        return True
+
+    def __counterexample(self) -> dict[str, int]:
+        """Returns the input values of the last model, re-simulating the nodes once enough are collected"""
+        vector = dict()
+        for name, literal in self.__inputs.items():
+            variable = self.__variables[literal >> 1]
+            vector[name] = int(self.__solver.value(variable)) if variable else 0
+        self.__pending.append(vector)
+
+        if len(self.__pending) >= EquivalenceChecker.REFINE_BATCH:
+            self.__refine()
+
+        return vector
+
+    def __refine(self) -> None:
+        """Appends the pending counterexamples to the simulation values of every node"""
+        if not self.__pending:
+            return
+
+        width = len(self.__pending)
+        words = {name: sum(vector[name] << i for i, vector in enumerate(self.__pending)) for name in self.__inputs}
+        self.__pending = []
+
+        shift = self.__mask.bit_length()
+        self.__mask = (1 << (shift + width)) - 1
+        extra = [0] * len(self.__kind)
+        for name, literal in self.__inputs.items():
+            extra[literal >> 1] = words[name]
+
+        ones = (1 << width) - 1
+        for node, kind in enumerate(self.__kind):
+            if kind > EquivalenceChecker.INPUT:
+                a, b = self.__fanin[node]
+                x = extra[a >> 1] ^ (ones if a & 1 else 0)
+                y = extra[b >> 1] ^ (ones if b & 1 else 0)
+                extra[node] = x & y if kind == EquivalenceChecker.AND else x ^ y
+            self.__values[node] |= extra[node] << shift
+
+        # The signatures are split by the new values, and the earliest node of each is kept
+        self.__classes = dict()
+        for node in range(len(self.__kind)):
+            self.__classes.setdefault(*self.__signature(2 * node))
+
+    def __build(self, component: Component) -> dict[str, int]:
+        """Adds the gates of a component to the miter graph and returns the literal of every output port"""
+        netlist = component.netlist
+        ordered, looped = netlist.levelize()
+        if looped:
+            raise IllegalOperationException(
+                f"'{component.name}' contains a feedback loop through {', '.join(str(netlist.gates[gate]) for gate in looped)}, "
+                "so it has no combinational function."
+            )
+
+        literals: list[int | None] = [None] * len(netlist.nets)
+        for port in component.io_ports.list_items():
+            if port.is_input:
+                literals[port.index] = self.__inputs[port.name]
+
+        def read(net: int) -> int:
+            if net < 0 or literals[net] is None:
+                name = netlist.nets[net].name if net >= 0 else "?"
+                raise IllegalOperationException(f"Signal '{name}' of '{component.name}' is not driven by any gate or input port.")
+            return literals[net]
+
+        for gate in ordered:
+            op = Netlist.GATE_TYPES[netlist.gate_types[gate]]
+            a = read(netlist.gate_in1[gate])
+            if op == "not":
+                result = a ^ 1
+            else:
+                b = read(netlist.gate_in2[gate])
+                if op in ("and", "nand"):
+                    result = self.__and(a, b)
+                elif op in ("or", "nor"):
+                    result = self.__and(a ^ 1, b ^ 1) ^ 1
+                else:
+                    result = self.__xor(a, b)
+                if op in ("nand", "nor", "xnor"):
+                    result ^= 1
+
+            for net in netlist.outputs(gate):
+                literals[net] = result
+
+        return {port.name: read(port.index) for port in component.io_ports.list_items() if not port.is_input}
+
+    def __simulate(self, seed: int | None) -> list[int]:
+        """
+        Simulates both components on the same random vectors.
+
+        Returns:
+            list[int]: The packed words of the input ports, in the order of `inputs`.
+        """
+        generator = random.Random(seed)
+        simulators = [CompiledSimulator(self.a), CompiledSimulator(self.b)]
+        words = [0] * len(self.inputs)
+        done = 0
+
+        while done < self.vectors:
+            width = min(EquivalenceChecker.WIDTH, self.vectors - done)
+            batch = [generator.getrandbits(width) for _ in self.inputs]
+            results = []
+            for simulator in simulators:
+                packed = dict(zip(self.inputs, batch))
+                outputs = simulator.run_packed([packed[name] for name in simulator.input_names], width)
+                results.append(dict(zip(simulator.output_names, outputs)))
+
+            difference = 0
+            for name in self.outputs:
+                difference |= results[0][name] ^ results[1][name]
+            if difference:
+                bit = (difference & -difference).bit_length() - 1
+                self.__result.vectors = done + bit + 1
+                self.__report({name: (word >> bit) & 1 for name, word in zip(self.inputs, batch)})
+                return []
+
+            for i, word in enumerate(batch):
+                words[i] |= word << done
+            done += width
+
+        self.__result.vectors = done
+        return words
+
+    def __report(self, vector: dict[str, int]) -> None:
+        """Records a counterexample and the outputs that differ for it"""
+        self.__result.equivalent = False
+        self.__result.counterexample = vector
+        first, second = self.a.simulate([vector])[0], self.b.simulate([vector])[0]
+        self.__result.outputs = [name for name in self.outputs if first[name] != second[name]]
+
+    # ========== Public Functions ==========
+    def __init__(self, a: Component, b: Component, vectors: int = 4096, conflict_limit: int = 1000) -> None:
+        """
+        Args:
+            a, b (Component): The two versions of the design. Hierarchical components are flattened.
+            vectors (int): The number of random vectors simulated before trying to prove equivalence.
+            conflict_limit (int): The conflicts spent on each candidate pair while sweeping. Pairs that
+                are not decided are left to the final proof, which has no limit.
+        """
+        self.a: Component = a.flatten() if len(a.sub_components) else a
+        self.b: Component = b.flatten() if len(b.sub_components) else b
+        self.vectors: int = max(vectors, 1)
+        self.conflict_limit: int = conflict_limit
+
+        ports = []
+        for component in (self.a, self.b):
+            for port in component.io_ports.list_items():
+                if port.bit_size != 1:
+                    raise BitSizeMismatchException(
+                        f"Port '{port.name}' of '{component.name}' is {port.bit_size} bits wide. Only single-bit ports can be compared."
+                    )
+            ports.append({port.name: port.is_input for port in component.io_ports.list_items()})
+
+        if ports[0] != ports[1]:
+            differences = sorted(name for name in ports[0].keys() | ports[1].keys()
+                                 if ports[0].get(name) != ports[1].get(name))
+            raise IllegalOperationException(
+                f"'{self.a.name}' and '{self.b.name}' do not have the same I/O ports: {', '.join(differences)} differ."
+            )
+
+        self.inputs: list[str] = [name for name, is_input in ports[0].items() if is_input]
+        self.outputs: list[str] = [name for name, is_input in ports[0].items() if not is_input]
+
+        # Miter graph
+        self.__kind: list[int] = []
+        self.__fanin: list[tuple[int, int]] = []
+        self.__values: list[int] = []       # Packed simulation values of every node
+        self.__variables: list[int] = []    # Solver variable of every node, 0 until its cone is encoded
+        self.__strash: dict[tuple[int, int, int], int] = dict()
+        self.__classes: dict[int, int] = dict()     # Earliest literal with each (normalized) simulation signature
+        self.__inputs: dict[str, int] = dict()
+        self.__mask: int = 0
+        self.__pending: list[dict[str, int]] = []      # Counterexamples not simulated yet
+        self.__witness: dict[str, int] = dict()         # The last counterexample
+        self.__solver: SATSolver = None
+        self.__result: EquivalenceResult = None
+
+    def check(self, seed: int = None) -> EquivalenceResult:
+        """
+        Checks whether both components have the same outputs for every combination of inputs.
+
+        Args:
+            seed (int, optional): The seed of the random vectors, for reproducible runs.
+
+        Returns:
+            EquivalenceResult: Whether they are equivalent, and if not, a counterexample.
+        """
+        start = time.perf_counter()
+        self.__result = result = EquivalenceResult(True, "simulation")
+
+        words = self.__simulate(seed)
+        if not result.equivalent:
+            result.seconds = time.perf_counter() - start
+            return result
+
+        # Build the miter graph, sweeping it against the simulation values
+        self.__solver = SATSolver()
+        self.__mask = (1 << result.vectors) - 1
+        self.__node(EquivalenceChecker.CONSTANT, -1, -1, 0)
+        self.__classes[0] = 0
+        for name, word in zip(self.inputs, words):
+            self.__inputs[name] = self.__node(EquivalenceChecker.INPUT, -1, -1, word)
+            self.__classes.setdefault(*self.__signature(self.__inputs[name]))
+
+        first, second = self.__build(self.a), self.__build(self.b)
+        result.method = "SAT" if result.merged else "structure"
+
+        for name in self.outputs:
+            if first[name] == second[name]:
+                continue
+
+            result.method = "SAT"
+            if not self.__prove(first[name], second[name]):
+                self.__report(self.__witness)
+                break
+
+        result.conflicts = self.__solver.conflicts
+        result.seconds = time.perf_counter() - start
+        return result
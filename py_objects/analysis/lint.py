@@ -0,0 +1,172 @@
+from __future__ import annotations
+from array import array
+import time
+
+from py_objects.netlist.netlist import Netlist
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+
+class LintIssue:
+    """One problem found in a netlist"""
+
+    ERROR, WARNING = "error", "warning"
+
+    def __init__(self, kind: str, severity: str, subject: str, message: str) -> None:
+        self.kind: str = kind
+        self.severity: str = severity
+        self.subject: str = subject     # The name of the wire, port, gate or sub-component pin
+        self.message: str = message
+
+    def __str__(self):
+        return f"{self.severity.upper()}: {self.message}"
+
+    def __repr__(self):
+        return str(self)
+
+
+class LintReport:
+    """The issues found in a component by `lint`, grouped by kind"""
+
+    # Kinds of issues
+    UNDRIVEN = "undriven net"
+    MULTIPLY_DRIVEN = "multiply driven net"
+    FLOATING_INPUT = "floating input"
+    UNUSED_OUTPUT = "unused output"
+    WIDTH_MISMATCH = "width mismatch"
+    UNCONNECTED_PORT = "unconnected port"
+    KINDS = (UNDRIVEN, MULTIPLY_DRIVEN, FLOATING_INPUT, UNUSED_OUTPUT, WIDTH_MISMATCH, UNCONNECTED_PORT)
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.issues: list[LintIssue] = []
+        self.seconds: float = 0.0
+
+    def __len__(self):
+        return len(self.issues)
+
+    def __str__(self):
+        if not self.issues:
+            return f"{self.name}: no issues ({self.seconds * 1000:.1f} ms)"
+
+        counts = ", ".join(f"{len(self.by_kind(kind))} {kind}" for kind in LintReport.KINDS if self.by_kind(kind))
+        return "\n".join([f"{self.name}: {len(self.errors)} errors, {len(self.warnings)} warnings ({counts})"] +
+                         [f"    {issue}" for issue in self.issues])
+
+    def __repr__(self):
+        return str(self)
+
+    def add(self, kind: str, severity: str, subject: str, message: str) -> None:
+        self.issues.append(LintIssue(kind, severity, subject, message))
+
+    def by_kind(self, kind: str) -> list[LintIssue]:
+        return [issue for issue in self.issues if issue.kind == kind]
+
+    @property
+    def errors(self) -> list[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == LintIssue.ERROR]
+
+    @property
+    def warnings(self) -> list[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == LintIssue.WARNING]
+
+
+def lint(component: Component) -> LintReport:
+    """
+    Checks the connectivity of a component in one pass over its netlist arrays.
+
+    The drivers and readers of every net are counted from the netlist (its driver array and its
+    CSR fanout, and the output connections of the output ports, which are the only nets that
+    can have several drivers), with the mapped pins of the sub-component instances added on
+    top, so no signal or gate object is visited except to name an issue.
+
+    Returns:
+        LintReport: Undriven and multiply driven nets, floating gate and instance inputs, unused
+            outputs, width mismatches and unconnected ports.
+    """
+    start = time.perf_counter()
+    report = LintReport(component.name)
+    netlist = component.netlist
+    ERROR, WARNING = LintIssue.ERROR, LintIssue.WARNING
+
+    # Driver and reader counts of every net
+    offsets, readers_of, _ = netlist.fanout()
+    drivers = array('q', (1 if driver >= 0 else 0 for driver in netlist.net_drivers))
+    readers = array('q', (offsets[net + 1] - offsets[net] for net in range(len(netlist.nets))))
+
+    for port in component.io_ports.list_items():
+        if port.is_input:
+            drivers[port.index] += 1
+        else:
+            drivers[port.index] = len(netlist.drivers(port.index))
+
+    for instance in component.sub_components.list_items():
+        for pin in instance.io_ports.list_items():
+            signal = pin.mapped_wire if pin.mapped_wire is not None else pin.mapped_port
+            subject = f"{instance.label}.{pin.name}"
+            if signal is None:
+                if pin.is_input:
+                    report.add(LintReport.FLOATING_INPUT, ERROR, subject,
+                               f"Input '{pin.name}' of sub-component '{instance.label}' is not mapped")
+                else:
+                    report.add(LintReport.UNUSED_OUTPUT, WARNING, subject,
+                               f"Output '{pin.name}' of sub-component '{instance.label}' is not mapped")
+                continue
+
+            if signal.bit_size != pin.bit_size:
+                report.add(LintReport.WIDTH_MISMATCH, ERROR, subject,
+                           f"Port '{pin.name}' of sub-component '{instance.label}' is {pin.bit_size} bits wide, "
+                           f"but '{signal.name}' is {signal.bit_size}")
+            if signal.netlist is netlist:
+                if pin.is_input:
+                    readers[signal.index] += 1
+                else:
+                    drivers[signal.index] += 1
+
+    # Nets
+    widths, kinds, nets = netlist.net_widths, netlist.net_kinds, netlist.nets
+    for net in range(len(nets)):
+        kind, driven, read = kinds[net], drivers[net], readers[net]
+
+        if driven > 1:
+            report.add(LintReport.MULTIPLY_DRIVEN, ERROR, nets[net].name, f"'{nets[net].name}' has {driven} drivers")
+
+        if kind == Netlist.WIRE:
+            if not driven:
+                if read:
+                    report.add(LintReport.UNDRIVEN, ERROR, nets[net].name, f"Wire '{nets[net].name}' is read but never driven")
+                else:
+                    report.add(LintReport.UNDRIVEN, WARNING, nets[net].name, f"Wire '{nets[net].name}' is not connected")
+            elif not read:
+                report.add(LintReport.UNUSED_OUTPUT, WARNING, nets[net].name, f"Wire '{nets[net].name}' is never read")
+        elif kind == Netlist.OUTPUT and not driven:
+            report.add(LintReport.UNCONNECTED_PORT, ERROR, nets[net].name, f"Output port '{nets[net].name}' is not driven")
+        elif kind == Netlist.INPUT and not read:
+            report.add(LintReport.UNCONNECTED_PORT, WARNING, nets[net].name, f"Input port '{nets[net].name}' is never read")
+
+        # Gates are single-bit
+        if widths[net] != 1 and (netlist.net_drivers[net] >= 0 or offsets[net + 1] > offsets[net]):
+            report.add(LintReport.WIDTH_MISMATCH, ERROR, nets[net].name,
+                       f"'{nets[net].name}' is {widths[net]} bits wide, but is connected to a gate")
+
+    # Gate pins
+    types, in1, in2, out = netlist.gate_types, netlist.gate_in1, netlist.gate_in2, netlist.gate_out
+    NOT = Netlist.GATE_TYPES.index("not")
+    for gate in range(len(netlist.gates)):
+        type_ = types[gate]
+        if type_ == Netlist.REMOVED:
+            continue
+
+        if in1[gate] < 0 or (in2[gate] < 0 and type_ != NOT):
+            pins = [pin for pin, net in (("in1", in1[gate]), ("in2", in2[gate])) if net < 0 and (pin == "in1" or type_ != NOT)]
+            report.add(LintReport.FLOATING_INPUT, ERROR, str(netlist.gates[gate]),
+                       f"Gate {netlist.gates[gate]} has {' and '.join(pins)} unconnected")
+        if out[gate] < 0:
+            report.add(LintReport.UNUSED_OUTPUT, WARNING, str(netlist.gates[gate]),
+                       f"The output of gate {netlist.gates[gate]} is not connected")
+
+    report.seconds = time.perf_counter() - start
+    return report
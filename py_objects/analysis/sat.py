@@ -0,0 +1,414 @@
+from __future__ import annotations
+import heapq
+
+
+class SATSolver:
+    """
+    Conflict-driven clause learning (CDCL) solver for formulas in conjunctive normal form.
+
+    Variables are numbered from 1 and literals are written as in DIMACS files: `v` or `-v`.
+    Internally a literal is `2 * (v - 1)`, plus one if it is negated, so its negation is the
+    literal XOR 1 and every per-literal table is a flat list.
+
+    Binary clauses, which make up most of a Tseitin encoding, are kept in implication lists.
+    Longer clauses are watched by their first two literals, and are only visited when one of
+    those becomes false. Conflicts are analysed down to the first unique implication point,
+    the learned clause is minimized against the reasons of its literals, and the variables
+    involved are bumped (VSIDS). The search restarts on the Luby sequence, keeps the last
+    phase of every variable, and halves the learned clauses with the highest LBD (the number
+    of decision levels they span) when there are too many of them.
+
+    The solver is incremental: clauses can be added between calls to `solve`, and each call
+    may fix some literals with assumptions, keeping the clauses learned by earlier calls.
+    """
+
+    # Conflicts per unit of the Luby restart sequence
+    RESTART_UNIT = 100
+
+    # Activity decay of the variables, and the bound at which the activities are rescaled
+    DECAY = 0.95
+    RESCALE = 1e100
+
+    # ========== Private Functions ==========
+    @staticmethod
+    def __literal(literal: int) -> int:
+        """Returns the internal form of a DIMACS literal"""
+        return 2 * literal - 2 if literal > 0 else -2 * literal - 1
+
+    @staticmethod
+    def __luby(index: int) -> int:
+        """Returns the index-th element (from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+        size, power = 1, 0
+        while size < index + 1:
+            power += 1
+            size = 2 * size + 1
+
+        while size - 1 != index:
+            size = (size - 1) >> 1
+            power -= 1
+            index %= size
+
+        return 1 << power
+
+    def __assign(self, literal: int, reason: list[int] | None) -> None:
+        """Makes a literal true at the current decision level"""
+        self.__values[literal] = 1
+        self.__values[literal ^ 1] = -1
+        variable = literal >> 1
+        self.__levels[variable] = len(self.__limits)
+        self.__reasons[variable] = reason
+        self.__trail.append(literal)
+
+    def __propagate(self) -> list[int] | None:
+        """Propagates the assignments on the trail. Returns the conflicting clause, or None."""
+        values, binary, watches, trail = self.__values, self.__binary, self.__watches, self.__trail
+        levels, reasons = self.__levels, self.__reasons
+        level = len(self.__limits)
+
+        while self.__head < len(trail):
+            false = trail[self.__head] ^ 1
+            self.__head += 1
+            self.propagations += 1
+
+            # Binary clauses imply their other literal directly
+            for other, clause in binary[false]:
+                value = values[other]
+                if value == 1:
+                    continue
+                if value == -1:
+                    return clause
+                values[other], values[other ^ 1] = 1, -1
+                levels[other >> 1], reasons[other >> 1] = level, clause
+                trail.append(other)
+
+            watchers = watches[false]
+            i = j = 0
+            count = len(watchers)
+            while i < count:
+                clause = watchers[i]
+                i += 1
+                if not clause:
+                    continue    # Deleted
+
+                # Keep the false literal second
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                first = clause[0]
+                if values[first] == 1:
+                    watchers[j] = clause
+                    j += 1
+                    continue
+
+                # Look for another literal to watch
+                for k in range(2, len(clause)):
+                    if values[clause[k]] != -1:
+                        clause[1], clause[k] = clause[k], false
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    watchers[j] = clause
+                    j += 1
+                    if values[first] == -1:
+                        watchers[j:] = watchers[i:]
+                        return clause
+
+                    values[first], values[first ^ 1] = 1, -1
+                    levels[first >> 1], reasons[first >> 1] = level, clause
+                    trail.append(first)
+
+            del watchers[j:]
+
+        return None
+
+    def __bump(self, variable: int) -> None:
+        """Raises the activity of a variable, rescaling every activity if it grows too large"""
+        activity = self.__activity
+        activity[variable] += self.__increment
+        if activity[variable] > SATSolver.RESCALE:
+            for v in range(len(activity)):
+                activity[v] /= SATSolver.RESCALE
+            self.__increment /= SATSolver.RESCALE
+            self.__rebuild_heap()
+        elif self.__values[2 * variable] == 0:
+            heapq.heappush(self.__heap, (-activity[variable], variable))
+
+    def __rebuild_heap(self) -> None:
+        """Rebuilds the decision heap from the unassigned variables, dropping stale entries"""
+        self.__heap = [(-self.__activity[v], v) for v in range(len(self.__levels)) if self.__values[2 * v] == 0]
+        heapq.heapify(self.__heap)
+
+    def __analyze(self, conflict: list[int]) -> tuple[list[int], int]:
+        """
+        Derives a learned clause from a conflict, cut at the first unique implication point.
+
+        Returns:
+            tuple[list[int], int]: The clause, with the asserting literal first and the literal of
+                the highest remaining level second, and the level to backtrack to.
+        """
+        seen, levels, reasons, trail = self.__seen, self.__levels, self.__reasons, self.__trail
+        level = len(self.__limits)
+        learnt = [0]
+        marked = []
+        pending = 0
+        index = len(trail) - 1
+        clause, start = conflict, 0
+
+        while True:
+            for k in range(start, len(clause)):
+                literal = clause[k]
+                variable = literal >> 1
+                if not seen[variable] and levels[variable] > 0:
+                    seen[variable] = True
+                    marked.append(variable)
+                    self.__bump(variable)
+                    if levels[variable] >= level:
+                        pending += 1
+                    else:
+                        learnt.append(literal)
+
+            # Resolve with the reason of the latest marked literal of this level
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            seen[literal >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+            clause, start = reasons[literal >> 1], 1    # The implied literal is first
+
+        learnt[0] = literal ^ 1
+
+        # Drop literals implied by the others (local minimization)
+        kept = [learnt[0]]
+        for literal in learnt[1:]:
+            reason = reasons[literal >> 1]
+            if reason is None or any(not seen[other >> 1] and levels[other >> 1] > 0 for other in reason[1:]):
+                kept.append(literal)
+        learnt = kept
+
+        for variable in marked:
+            seen[variable] = False
+
+        # Backtrack to the second highest level in the clause
+        backtrack = 0
+        if len(learnt) > 1:
+            highest = max(range(1, len(learnt)), key=lambda k: levels[learnt[k] >> 1])
+            learnt[1], learnt[highest] = learnt[highest], learnt[1]
+            backtrack = levels[learnt[1] >> 1]
+
+        return learnt, backtrack
+
+    def __backtrack(self, level: int) -> None:
+        """Undoes every assignment above a decision level"""
+        if len(self.__limits) <= level:
+            return
+
+        values, reasons, phases, activity, heap = self.__values, self.__reasons, self.__phases, self.__activity, self.__heap
+        start = self.__limits[level]
+        for literal in self.__trail[start:]:
+            variable = literal >> 1
+            values[literal] = values[literal ^ 1] = 0
+            reasons[variable] = None
+            phases[variable] = literal & 1
+            heapq.heappush(heap, (-activity[variable], variable))
+
+        del self.__trail[start:]
+        del self.__limits[level:]
+        self.__head = len(self.__trail)
+
+    def __learn(self, learnt: list[int]) -> None:
+        """Adds a learned clause after backtracking, and asserts its first literal"""
+        if len(learnt) == 1:
+            self.__assign(learnt[0], None)
+        elif len(learnt) == 2:
+            self.__add_binary(learnt[0], learnt[1])
+            self.__assign(learnt[0], self.__binary[learnt[1]][-1][1])
+        else:
+            self.__watches[learnt[0]].append(learnt)
+            self.__watches[learnt[1]].append(learnt)
+            levels = {self.__levels[literal >> 1] for literal in learnt}
+            self.__learnts.append((len(levels), learnt))
+            self.__assign(learnt[0], learnt)
+
+    def __add_binary(self, a: int, b: int) -> None:
+        """Adds the clause (a or b), whose reason lists keep the implied literal first"""
+        self.__binary[a].append((b, [b, a]))
+        self.__binary[b].append((a, [a, b]))
+
+    def __reduce(self) -> None:
+        """Deletes the half of the learned clauses with the highest LBD, except reasons of assignments"""
+        self.__learnts.sort(key=lambda entry: (entry[0], len(entry[1])))
+        half = len(self.__learnts) // 2
+        kept = self.__learnts[:half]
+
+        for lbd, clause in self.__learnts[half:]:
+            first = clause[0]
+            if lbd <= 2 or (self.__values[first] == 1 and self.__reasons[first >> 1] is clause):
+                kept.append((lbd, clause))
+            else:
+                clause.clear()      # Dropped from the watch lists when they are next visited
+
+        self.__learnts = kept
+        self.__max_learnts = int(self.__max_learnts * 1.1)
+
+    def __decide(self) -> int | None:
+        """Returns the unassigned variable with the highest activity, in its saved phase"""
+        heap, values = self.__heap, self.__values
+        while heap:
+            _, variable = heapq.heappop(heap)
+            if values[2 * variable] == 0:
+                return 2 * variable + self.__phases[variable]
+
+        return None
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        self.__values: list[int] = []       # Per literal: 1 true, -1 false, 0 unassigned
+        self.__binary: list[list[tuple[int, list[int]]]] = []   # Per literal: implications when it is false
+        self.__watches: list[list[list[int]]] = []              # Per literal: clauses watching it
+
+        # Per variable
+        self.__levels: list[int] = []
+        self.__reasons: list[list[int] | None] = []
+        self.__activity: list[float] = []
+        self.__phases: list[int] = []       # 1 to try the variable as false first
+        self.__seen: list[bool] = []
+
+        self.__trail: list[int] = []
+        self.__limits: list[int] = []       # Start of every decision level on the trail
+        self.__head: int = 0                # Next assignment to propagate
+        self.__heap: list[tuple[float, int]] = []
+        self.__increment: float = 1.0
+
+        self.__learnts: list[tuple[int, list[int]]] = []
+        self.__max_learnts: int = 4000
+        self.__ok: bool = True              # False once the clauses alone are unsatisfiable
+
+        self.model: list[bool] = []         # Value of every variable (model[v - 1]) after a satisfiable call
+        self.conflicts: int = 0
+        self.decisions: int = 0
+        self.propagations: int = 0
+
+    @property
+    def variables(self) -> int:
+        return len(self.__levels)
+
+    def new_variable(self) -> int:
+        """Adds a variable and returns its number"""
+        variable = len(self.__levels)
+        self.__values.extend((0, 0))
+        self.__binary.extend(([], []))
+        self.__watches.extend(([], []))
+        self.__levels.append(0)
+        self.__reasons.append(None)
+        self.__activity.append(self.__increment)
+        self.__phases.append(1)
+        self.__seen.append(False)
+        heapq.heappush(self.__heap, (-self.__increment, variable))
+
+        return variable + 1
+
+    def add_clause(self, literals: list[int]) -> bool:
+        """
+        Adds a clause of DIMACS literals, whose variables must exist.
+
+        Returns:
+            bool: False if the clauses have become unsatisfiable.
+        """
+        if not self.__ok:
+            return False
+        self.__backtrack(0)
+
+        clause = []
+        for literal in {SATSolver.__literal(literal) for literal in literals}:
+            value = self.__values[literal]
+            if value == 1 or literal ^ 1 in clause:
+                return True     # Satisfied at the top level, or a tautology
+            if value == 0:
+                clause.append(literal)
+
+        if not clause:
+            self.__ok = False
+        elif len(clause) == 1:
+            self.__assign(clause[0], None)
+            self.__ok = self.__propagate() is None
+        elif len(clause) == 2:
+            self.__add_binary(clause[0], clause[1])
+        else:
+            self.__watches[clause[0]].append(clause)
+            self.__watches[clause[1]].append(clause)
+
+        return self.__ok
+
+    def solve(self, assumptions: list[int] = (), conflict_limit: int = None) -> bool | None:
+        """
+        Searches for an assignment satisfying every clause and assumption.
+
+        Args:
+            assumptions (list[int]): DIMACS literals that must hold in this call only.
+            conflict_limit (int, optional): The number of conflicts after which to give up.
+
+        Returns:
+            bool | None: True if satisfiable, with the assignment in `model`, False if not, or None
+                if the conflict limit was reached first.
+        """
+        self.model = []
+        if not self.__ok:
+            return False
+
+        assumptions = [SATSolver.__literal(literal) for literal in assumptions]
+        budget = None if conflict_limit is None else self.conflicts + conflict_limit
+        restarts = 0
+        restart_at = self.conflicts + SATSolver.RESTART_UNIT * SATSolver.__luby(restarts)
+
+        while True:
+            conflict = self.__propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.__limits:
+                    self.__ok = False
+                    return False
+
+                learnt, level = self.__analyze(conflict)
+                self.__backtrack(level)
+                self.__learn(learnt)
+                self.__increment /= SATSolver.DECAY
+
+                if budget is not None and self.conflicts >= budget:
+                    self.__backtrack(0)
+                    return None
+                if self.conflicts >= restart_at:
+                    self.__backtrack(0)
+                    restarts += 1
+                    restart_at = self.conflicts + SATSolver.RESTART_UNIT * SATSolver.__luby(restarts)
+                continue
+
+            if len(self.__learnts) >= self.__max_learnts:
+                self.__reduce()
+            if len(self.__heap) > 4 * len(self.__levels) + 1024:
+                self.__rebuild_heap()
+
+            # The assumptions are decided first, one per level
+            if len(self.__limits) < len(assumptions):
+                decision = assumptions[len(self.__limits)]
+                if self.__values[decision] == 1:
+                    self.__limits.append(len(self.__trail))     # Already holds: an empty level
+                    continue
+                if self.__values[decision] == -1:
+                    self.__backtrack(0)
+                    return False
+            else:
+                decision = self.__decide()
+                if decision is None:
+                    self.model = [self.__values[2 * v] == 1 for v in range(len(self.__levels))]
+                    self.__backtrack(0)
+                    return True
+
+            self.decisions += 1
+            self.__limits.append(len(self.__trail))
+            self.__assign(decision, None)
+
+    def value(self, variable: int) -> bool:
+        """Returns the value of a variable in the last model"""
+        return self.model[variable - 1]
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from py_objects.netlist.netlist import Netlist
+
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+    from py_objects.gates.gate import Gate
+
+
+class Loop:
+    """A feedback loop through some gates, classified as a storage element or an accidental loop"""
+
+    LATCH = "latch"                 # Cross-coupled NAND or NOR gates, as in an SR latch
+    COMBINATIONAL = "combinational"
+
+    def __init__(self, gates: list[Gate], kind: str) -> None:
+        self.gates: list[Gate] = gates
+        self.kind: str = kind
+
+    def __str__(self):
+        return f"{self.kind} loop through {' -> '.join(str(gate) for gate in self.gates)}"
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def intentional(self) -> bool:
+        return self.kind == Loop.LATCH
+
+
+def classify(netlist: Netlist, gates: list[int]) -> str:
+    """
+    Classifies the gates of a strongly connected component (or of one cycle). Two NAND gates,
+    or two NOR gates, each reading the other on exactly one input form a latch. Any other loop
+    is combinational, and does not settle to a function of the inputs.
+    """
+    if len(gates) != 2:
+        return Loop.COMBINATIONAL
+
+    first, second = gates
+    op = Netlist.GATE_TYPES[netlist.gate_types[first]]
+    if op not in ("nand", "nor") or netlist.gate_types[second] != netlist.gate_types[first]:
+        return Loop.COMBINATIONAL
+
+    for gate, other in ((first, second), (second, first)):
+        inputs = [netlist.net_drivers[net] if net >= 0 else -1 for net in (netlist.gate_in1[gate], netlist.gate_in2[gate])]
+        if inputs.count(other) != 1 or gate in inputs:
+            return Loop.COMBINATIONAL
+
+    return Loop.LATCH
+
+
+def strongly_connected_components(netlist: Netlist) -> list[list[int]]:
+    """
+    Finds the gates that are on a feedback loop, with Tarjan's algorithm (iteratively, so long
+    chains do not hit the recursion limit).
+
+    Returns:
+        list[list[int]]: The gate indices of every strongly connected component with a loop, that
+            is, with more than one gate or with a gate reading its own output.
+    """
+    successors = netlist.gate_fanout()
+    index = [-1] * len(netlist.gates)
+    lowlink = [0] * len(netlist.gates)
+    on_stack = [False] * len(netlist.gates)
+    stack: list[int] = []
+    components = []
+    counter = 0
+
+    for root in netlist.live_gates():
+        if index[root] >= 0:
+            continue
+
+        work = [(root, 0)]
+        while work:
+            gate, child = work.pop()
+            if child == 0:
+                index[gate] = lowlink[gate] = counter
+                counter += 1
+                stack.append(gate)
+                on_stack[gate] = True
+
+            # Visit the next successor, or finish the gate
+            for k in range(child, len(successors[gate])):
+                successor = successors[gate][k]
+                if index[successor] < 0:
+                    work.append((gate, k + 1))
+                    work.append((successor, 0))
+                    break
+                if on_stack[successor]:
+                    lowlink[gate] = min(lowlink[gate], index[successor])
+            else:
+                if lowlink[gate] == index[gate]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == gate:
+                            break
+                    if len(component) > 1 or gate in successors[gate]:
+                        components.append(component[::-1])
+
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[gate])
+
+    return components
+
+
+def find_loops(component: Component) -> list[Loop]:
+    """Returns every feedback loop of a component, one per strongly connected component"""
+    netlist = component.netlist
+    return [Loop([netlist.gates[gate] for gate in gates], classify(netlist, gates))
+            for gates in strongly_connected_components(netlist)]
+
+
+class CycleDetector:
+    """
+    Reports feedback loops as the connections that close them are made.
+
+    The gates are kept in a topological order, which is repaired after every new edge with the
+    algorithm of Pearce and Kelly: an edge that goes forward in the order costs nothing, and an
+    edge that goes backward only searches the gates ordered between its ends, forwards from its
+    head and backwards from its tail, and moves those gates around. If the forward search
+    reaches the tail, the edge closes a loop: the edge is kept out of the order, and the loop
+    is recorded in `loops` and passed to the callbacks in `on_loop`.
+    """
+
+    # ========== Private Functions ==========
+    def __add_gate(self, gate: int) -> None:
+        while len(self.__order) <= gate:
+            self.__order.append(self.__next)
+            self.__next += 1
+            self.__successors.append(set())
+            self.__predecessors.append(set())
+
+    def __add_edge(self, tail: int, head: int) -> None:
+        """Adds the edge of a gate driving another gate, restoring the order or reporting a loop"""
+        edges = self.__successors[tail]
+        if head in edges or head in self.__loop_edges.get(tail, ()):
+            return
+
+        if tail == head:
+            self.__report(tail, head, [tail])
+            return
+
+        order = self.__order
+        if order[tail] > order[head]:
+            # Gates after the head and up to the tail that the head reaches
+            bound = order[tail]
+            forward, parents = [], {head: -1}
+            stack = [head]
+            while stack:
+                gate = stack.pop()
+                forward.append(gate)
+                for successor in self.__successors[gate]:
+                    if successor == tail:
+                        parents[tail] = gate
+                        cycle = [tail]
+                        while cycle[-1] != head:
+                            cycle.append(parents[cycle[-1]])
+                        self.__report(tail, head, [cycle[0]] + cycle[:0:-1])
+                        return
+                    if successor not in parents and order[successor] < bound:
+                        parents[successor] = gate
+                        stack.append(successor)
+
+            # Gates from the head and before the tail that reach the tail
+            bound = order[head]
+            backward, seen = [], {tail}
+            stack = [tail]
+            while stack:
+                gate = stack.pop()
+                backward.append(gate)
+                for predecessor in self.__predecessors[gate]:
+                    if predecessor not in seen and order[predecessor] > bound:
+                        seen.add(predecessor)
+                        stack.append(predecessor)
+
+            # Reuse their positions: the backward set first, then the forward set, each in its old order
+            backward.sort(key=order.__getitem__)
+            forward.sort(key=order.__getitem__)
+            positions = sorted(order[gate] for gate in backward + forward)
+            for gate, position in zip(backward + forward, positions):
+                order[gate] = position
+
+        edges.add(head)
+        self.__predecessors[head].add(tail)
+
+    def __remove_gate(self, gate: int) -> None:
+        """Drops the edges of a removed gate. The order of the other gates stays valid."""
+        for successor in self.__successors[gate]:
+            self.__predecessors[successor].discard(gate)
+        for predecessor in self.__predecessors[gate]:
+            self.__successors[predecessor].discard(gate)
+        self.__successors[gate] = set()
+        self.__predecessors[gate] = set()
+
+        self.loops = [loop for loop in self.loops if all(member.netlist is not None for member in loop.gates)]
+
+        # Edges whose loop went with the gate are added again: they fit in the order now, or close another loop
+        alive = {id(loop) for loop in self.loops}
+        closing = {edge: loop for edge, loop in self.__closing.items() if id(loop) in alive}
+        orphans = [(tail, head) for tail, heads in self.__loop_edges.items() for head in heads
+                   if gate not in (tail, head) and (tail, head) not in closing]
+
+        self.__loop_edges = dict()
+        for tail, head in closing:
+            self.__loop_edges.setdefault(tail, set()).add(head)
+        self.__closing = closing
+        for tail, head in orphans:
+            self.__add_edge(tail, head)
+
+    def __report(self, tail: int, head: int, cycle: list[int]) -> None:
+        """Records the edge closing a loop, which runs through the gates of the cycle in signal order"""
+        self.__loop_edges.setdefault(tail, set()).add(head)
+        netlist = self.netlist
+        loop = Loop([netlist.gates[gate] for gate in cycle], classify(netlist, cycle))
+        self.__closing[(tail, head)] = loop
+        self.loops.append(loop)
+        for callback in self.on_loop:
+            callback(loop)
+
+    def __changed(self, event: int, gate: int, net: int) -> None:
+        """Netlist listener: turns connections into edges between gates"""
+        netlist = self.netlist
+        if event == Netlist.GATE_ADDED:
+            self.__add_gate(gate)
+        elif event == Netlist.GATE_REMOVED:
+            self.__remove_gate(gate)
+        elif event == Netlist.INPUT_CONNECTED:
+            self.__readers.setdefault(net, []).append(gate)
+            driver = netlist.net_drivers[net]
+            if driver >= 0:
+                self.__add_edge(driver, gate)
+        elif event == Netlist.OUTPUT_CONNECTED:
+            for reader in self.__readers.get(net, ()):
+                if netlist.gate_types[reader] != Netlist.REMOVED:
+                    self.__add_edge(gate, reader)
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component) -> None:
+        """Starts from the current netlist of the component, whose existing loops are reported right away"""
+        self.netlist: Netlist = component.netlist
+        self.loops: list[Loop] = []
+        self.on_loop: list[Callable[[Loop], None]] = []
+
+        self.__order: list[int] = []        # Position of every gate in the topological order
+        self.__next: int = 0
+        self.__successors: list[set[int]] = []
+        self.__predecessors: list[set[int]] = []
+        self.__loop_edges: dict[int, set[int]] = dict()     # Edges closing a loop, kept out of the order
+        self.__closing: dict[tuple[int, int], Loop] = dict()    # The loop closed by each of those edges
+        self.__readers: dict[int, list[int]] = dict()
+
+        netlist = self.netlist
+        for gate in range(len(netlist.gates)):
+            self.__add_gate(gate)
+        for gate in netlist.live_gates():
+            for net in (netlist.gate_in1[gate], netlist.gate_in2[gate]):
+                if net >= 0:
+                    self.__readers.setdefault(net, []).append(gate)
+                    if netlist.net_drivers[net] >= 0:
+                        self.__add_edge(netlist.net_drivers[net], gate)
+
+        netlist.listeners.append(self.__changed)
+
+    def close(self) -> None:
+        """Stops following the changes of the netlist"""
+        if self.__changed in self.netlist.listeners:
+            self.netlist.listeners.remove(self.__changed)
+
+    def order(self) -> list[int]:
+        """Returns the gate indices in the maintained topological order, ignoring the edges that close loops"""
+        return sorted(self.netlist.live_gates(), key=self.__order.__getitem__)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+from collections import deque
+
+from py_objects.netlist.netlist import Netlist
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+
+class TimingAnalysis:
+    """
+    Logic depth and critical path analysis of a component, kept up to date as it is edited.
+
+    The arrival time of a gate is its delay plus the latest arrival time of the gates driving
+    its inputs, input ports (and unconnected inputs) arriving at 0. The depth of an output port
+    is the arrival time of its driver. Gates on, or fed by, a feedback loop have no arrival time.
+
+    The analysis listens to the netlist of the component. A change only marks the gates whose
+    inputs it touched, and the next query re-evaluates those gates and, while their arrival
+    time changes, the gates they drive, so an edit costs the size of the region it affects.
+    A change that keeps on propagating (a new feedback loop) falls back to a full levelization.
+    Required times and slacks need the final arrival times of every gate, so they are computed
+    in one backward pass when asked for, and kept until the next change.
+    """
+
+    # ========== Private Functions ==========
+    def __delay(self, gate: int) -> float:
+        return self.__delays.get(Netlist.GATE_TYPES[self.netlist.gate_types[gate]], 1)
+
+    def __input_arrival(self, net: int) -> float | None:
+        """Returns the arrival time of a net, 0 for input ports and undriven nets"""
+        driver = self.netlist.net_drivers[net] if net >= 0 else -1
+        return self.__arrival[driver] if driver >= 0 else 0
+
+    def __evaluate(self, gate: int) -> float | None:
+        """Returns the arrival time of a gate from the arrival times of its inputs"""
+        latest = 0
+        for net in (self.netlist.gate_in1[gate], self.netlist.gate_in2[gate]):
+            arrival = self.__input_arrival(net)
+            if arrival is None:
+                return None
+            latest = max(latest, arrival)
+
+        return latest + self.__delay(gate)
+
+    def __rebuild(self) -> None:
+        """Computes every arrival time from scratch, in level order"""
+        netlist = self.netlist
+        self.__arrival = [None] * len(netlist.gates)
+        self.__readers = dict()
+        self.__outputs = [[] for _ in netlist.gates]
+        self.__dirty = set()
+
+        for gate in netlist.live_gates():
+            for net in (netlist.gate_in1[gate], netlist.gate_in2[gate]):
+                if net >= 0:
+                    self.__readers.setdefault(net, []).append(gate)
+        for net, driver in enumerate(netlist.net_drivers):
+            if driver >= 0:
+                self.__outputs[driver].append(net)
+
+        ordered, _ = netlist.levelize()
+        for gate in ordered:
+            self.__arrival[gate] = self.__evaluate(gate)
+
+        self.revision += 1
+
+    def __changed(self, event: int, gate: int, net: int) -> None:
+        """Netlist listener: records the gates whose arrival time may have changed"""
+        if event == Netlist.GATE_ADDED:
+            self.__arrival.append(None)
+            self.__outputs.append([])
+            self.__dirty.add(gate)
+        elif event == Netlist.GATE_REMOVED:
+            self.__arrival[gate] = None
+            for driven in self.__outputs[gate]:
+                self.__dirty.update(self.__readers.get(driven, ()))
+            self.__outputs[gate] = []
+        elif event == Netlist.INPUT_CONNECTED:
+            self.__readers.setdefault(net, []).append(gate)
+            self.__dirty.add(gate)
+        elif event == Netlist.OUTPUT_CONNECTED:
+            self.__outputs[gate].append(net)
+            self.__dirty.update(self.__readers.get(net, ()))
+
+    def __update(self) -> None:
+        """Re-evaluates the marked gates, and the gates they drive while arrival times change"""
+        if not self.__dirty:
+            return
+
+        netlist = self.netlist
+        queue = deque(self.__dirty)
+        self.__dirty = set()
+        budget = 4 * len(netlist.gates) + len(queue)
+
+        while queue:
+            gate = queue.popleft()
+            if netlist.gate_types[gate] == Netlist.REMOVED:
+                continue
+
+            budget -= 1
+            if budget < 0:
+                self.__rebuild()    # Still propagating: the change closed a feedback loop
+                return
+
+            arrival = self.__evaluate(gate)
+            if arrival != self.__arrival[gate]:
+                self.__arrival[gate] = arrival
+                for net in self.__outputs[gate]:
+                    queue.extend(self.__readers.get(net, ()))
+
+        self.revision += 1
+
+    def __required_times(self) -> list[float | None]:
+        """Computes the required time of every gate, backwards from the output ports"""
+        if self.__required is not None and self.__required[0] == self.revision:
+            return self.__required[1]
+
+        netlist = self.netlist
+        target = self.required_time if self.required_time is not None else self.critical_delay()
+        required: list[float | None] = [None] * len(netlist.gates)
+
+        ordered, _ = netlist.levelize()
+        for gate in reversed(ordered):
+            if self.__arrival[gate] is None:
+                continue
+
+            # Gates driving output ports must be done by the target. Gates reaching none are unconstrained
+            latest = None
+            for net in self.__outputs[gate]:
+                if netlist.net_kinds[net] == Netlist.OUTPUT:
+                    latest = target if latest is None else min(latest, target)
+                for reader in self.__readers.get(net, ()):
+                    if required[reader] is not None and netlist.gate_types[reader] != Netlist.REMOVED:
+                        time = required[reader] - self.__delay(reader)
+                        latest = time if latest is None else min(latest, time)
+            required[gate] = latest
+
+        self.__required = (self.revision, required)
+        return required
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component, delays: dict[str, float] = None, required_time: float = None) -> None:
+        """
+        Args:
+            component (Component): The component to analyse, which is followed as it changes.
+            delays (dict[str, float], optional): Delay per gate type (e.g. {"xor": 2}). Gates not
+                listed have a unit delay.
+            required_time (float, optional): The time by which every output must be valid. By
+                default the critical delay, so the critical path has a slack of 0.
+        """
+        self.component: Component = component
+        self.netlist: Netlist = component.netlist
+        self.required_time: float = required_time
+        self.__delays: dict[str, float] = delays or dict()
+
+        self.__arrival: list[float | None] = []     # Per gate index
+        self.__readers: dict[int, list[int]] = dict()    # Gates reading each net
+        self.__outputs: list[list[int]] = []        # Nets driven by each gate
+        self.__dirty: set[int] = set()
+        self.__required: tuple[int, list[float | None]] = None
+        self.revision: int = 0      # Incremented whenever arrival times are recomputed
+
+        self.__rebuild()
+        self.netlist.listeners.append(self.__changed)
+
+    def close(self) -> None:
+        """Stops following the changes of the component"""
+        if self.__changed in self.netlist.listeners:
+            self.netlist.listeners.remove(self.__changed)
+
+    def arrival(self, gate_id: int) -> float | None:
+        """Returns the arrival time of a gate, None if it is on or fed by a feedback loop"""
+        gate = self.component.gates.search(gate_id)
+        if gate is None:
+            raise ValueError(f"No gate with ID {gate_id}")
+
+        self.__update()
+        return self.__arrival[gate.index]
+
+    def depths(self) -> dict[str, float | None]:
+        """Returns the depth of every output port, None if it is undriven or fed by a feedback loop"""
+        self.__update()
+        depths = dict()
+        for port in self.component.io_ports.list_items():
+            if not port.is_input:
+                driver = self.netlist.net_drivers[port.index]
+                depths[port.name] = self.__arrival[driver] if driver >= 0 else None
+
+        return depths
+
+    def critical_delay(self) -> float:
+        """Returns the largest depth of any output port"""
+        return max((depth for depth in self.depths().values() if depth is not None), default=0)
+
+    def critical_path(self, output: str = None) -> list[str]:
+        """
+        Returns the latest path to an output port, from the input port or gate it starts at.
+
+        Args:
+            output (str, optional): The output port. By default the deepest one.
+
+        Returns:
+            list[str]: The names of the ports, gates and wires along the path, in signal order.
+        """
+        depths = self.depths()
+        if output is None:
+            driven = {name: depth for name, depth in depths.items() if depth is not None}
+            if not driven:
+                return []
+            output = max(driven, key=driven.get)
+
+        netlist = self.netlist
+        net = self.component.io_ports.search(output).index
+        path = [output]
+        while netlist.net_drivers[net] >= 0:
+            gate = netlist.net_drivers[net]
+            if self.__arrival[gate] is None:
+                break
+            if netlist.nets[net].name != path[-1]:
+                path.append(netlist.nets[net].name)
+            path.append(str(netlist.gates[gate]))
+
+            # Follow the input that arrives last
+            inputs = [pin for pin in (netlist.gate_in1[gate], netlist.gate_in2[gate]) if pin >= 0]
+            if not inputs:
+                return path[::-1]
+            net = max(inputs, key=self.__input_arrival)
+
+        path.append(netlist.nets[net].name)
+        return path[::-1]
+
+    def slack(self) -> dict[int, float]:
+        """
+        Returns the slack of every gate (its required time minus its arrival time), keyed by gate ID.
+        Gates on or fed by a feedback loop, and gates that reach no output port, are left out.
+        """
+        self.__update()
+        required = self.__required_times()
+        return {self.netlist.gate_ids[gate]: required[gate] - self.__arrival[gate]
+                for gate in self.netlist.live_gates() if self.__arrival[gate] is not None and required[gate] is not None}
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import time
+
+from py_objects.components.component import Component
+from py_objects.components.sub_component import SubComponent
+from exceptions.object_existence_exception import ObjectExistsException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.gates.gate import Gate
+
+
+class BulkLoader:
+    """
+    Builds a component from its exported dictionary (the contents of a .dcs.json file) in one pass.
+
+    Instead of going through `Component.connect_wire` and `Component.connect_port`, which look up
+    every key in the DAOs again, the gates and sub-component instances are collected into a
+    lookup table once and every connection is resolved against it. Checks that span the whole
+    design, such as name clashes between wires and I/O ports, are run once at the end. The time
+    spent in each phase is recorded in `timings`.
+    """
+
+    # ========== Private Functions ==========
+    def __object(self, key: int | str, signal_name: str) -> Gate | SubComponent:
+        """Resolves a gate ID or a sub-component label from the lookup table"""
+        obj = self.__object_table.get(key)
+        if obj is None:
+            raise ValueError(f"Signal '{signal_name}' refers to {key!r}, which is neither a gate nor a sub-component.")
+
+        return obj
+
+    def __phase(self, name: str, start: float) -> float:
+        """Records the time spent in a phase and returns the start of the next one"""
+        now = time.perf_counter()
+        self.timings[name] = now - start
+        return now
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = dict()
+        self.__object_table: dict[int | str, Gate | SubComponent] = dict()
+
+    def load(self, data: dict) -> Component:
+        """
+        Creates the component described by the dictionary.
+
+        Args:
+            data (dict): The exported component, as written by `Component.export_dict`.
+
+        Returns:
+            Component: The new component. Its `load_timings` holds the time spent per phase, in seconds.
+        """
+        start = time.perf_counter()
+        component = Component(data['name'], data['architecture'])
+
+        # Phase 1: Gates, and the ID lookup table
+        for gate in data['gates']:
+            self.__object_table[gate['id']] = component.gates.create(gate['type'], gate['scene_x'], gate['scene_y'], gate['id'])
+        start = self.__phase("gates", start)
+
+        # Phase 1b: Sub-component instances, which are keyed by label
+        for instance in data.get('sub_components', []):
+            sub_component = SubComponent(instance['label'], instance['name'], [
+                {"name": port['name'], "bit_size": port['bit_size'], "is_input": port['is_input'], "direction": port['direction']}
+                for port in instance['io_ports']
+            ])
+            sub_component.json_filename = instance['filename']
+            sub_component.setPos(instance['scene_x'], instance['scene_y'])
+            self.__object_table[instance['label']] = component.sub_components.create(sub_component)
+        if 'sub_components' in data:
+            start = self.__phase("sub_components", start)
+
+        # Phase 2: Wires, resolved against the lookup table
+        for connection in data['connections']:
+            if not connection['dests']:
+                continue
+
+            wire = component.connections.create(connection['name'], connection['bit_size'])
+
+            # Wires whose driver was deleted keep their destinations
+            if connection['src_key'] is None:
+                for dest_key, dest_port in connection['dests']:
+                    wire._connect_dest(self.__object(dest_key, connection['name']), dest_port)
+                continue
+
+            src = self.__object(connection['src_key'], connection['name'])
+            for dest_key, dest_port in connection['dests']:
+                wire.connect(src, connection['src_port'], self.__object(dest_key, connection['name']), dest_port)
+        start = self.__phase("connections", start)
+
+        # Phase 3: I/O ports
+        for io_port in data['io_ports']:
+            port = component.io_ports.create(io_port['name'], io_port['bit_size'], io_port['is_input'],
+                                             io_port['scene_x'], io_port['scene_y'])
+
+            for dest_key, dest_port in io_port['dests']:
+                port.connect(self.__object(dest_key, io_port['name']), dest_port)
+        start = self.__phase("io_ports", start)
+
+        # Phase 4: Validation over the whole design
+        clashes = set(component.connections.wires) & set(component.io_ports.ports)
+        if clashes:
+            raise ObjectExistsException(
+                f"The names {', '.join(sorted(clashes))} are used by both a connection and an I/O port."
+            )
+        self.__phase("validation", start)
+
+        component.load_timings = self.timings
+        return component
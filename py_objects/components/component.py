@@ -1,31 +1,59 @@
 from __future__ import annotations
 from py_objects.dao.gate_dao import GateDAO
 from py_objects.dao.connection_dao import ConnectionDAO, IOPortDAO
-from PyQt6.QtWidgets import QGraphicsScene
+from py_objects.dao.sub_component_dao import SubComponentDAO
+from py_objects.netlist.netlist import Netlist
+from py_objects.components.vhdl_writer import VHDLWriter
 import os
+import time
 
 from exceptions.object_existence_exception import ObjectExistsException
+from exceptions.bitsizemismatch_exception import BitSizeMismatchException
+from exceptions.illegal_operation_exception import IllegalOperationException
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QGraphicsScene, QGraphicsView
     from py_objects.signals.wire import Wire
     from py_objects.gates.gate import Gate
+    from py_objects.components.sub_component import SubComponent
 
 class Component:
     def __init__(self, name: str, architecture: str):
         self.name: str = name
         self.architecture: str = architecture
-        self.gates: GateDAO = GateDAO()
-        self.connections: ConnectionDAO = ConnectionDAO()
-        self.io_ports: IOPortDAO = IOPortDAO()
-        self.sub_components = []    # TODO: Create a sub-component class
+        self.netlist: Netlist = Netlist()    # Array-backed connectivity shared by the DAOs
+        self.gates: GateDAO = GateDAO(self.netlist)
+        self.connections: ConnectionDAO = ConnectionDAO(self.netlist)
+        self.io_ports: IOPortDAO = IOPortDAO(netlist=self.netlist)
+        self.sub_components: SubComponentDAO = SubComponentDAO()
         # self.behavioral_code: str = ""
 
         # Filename and directory
         self.filename = ""
         self.directory = ""
 
+        # Seconds spent in each phase of the last load
+        self.load_timings: dict[str, float] = dict()
+
+        # Seconds spent in each phase of the last draw_all_internals
+        self.draw_timings: dict[str, float] = dict()
+
+        # Keeps the rendered VHDL sections until the DAOs change
+        self.vhdl_writer: VHDLWriter = VHDLWriter(self)
+
+        # Optimized copy, along with the DAO revisions it was made from
+        self.__optimized: tuple[tuple, Component] = None
+        self.optimization_report = None
+
+        # Connectivity issues found when the component was last saved
+        self.lint_report = None
+
+        # Timing analysis and loop detector that follow the edits, created on first use
+        self.__timing = None
+        self.__loop_detector = None
+
     def __str__(self):
         return f"{self.name}: {self.architecture}"
     
@@ -41,24 +69,267 @@ class Component:
         if self.gates.search(key) is not None:
             return self.gates.search(key)
         
-        # TODO: Make another DAO for sub-component and create another condition for that
+        # Sub-components are keyed by label
+        return self.sub_components.search(key)
+
+    def add_sub_component(self, definition: Component | str, label: str,
+                          scene_x: float = 20, scene_y: float = 20) -> SubComponent:
+        """
+        Instantiates another component inside this one.
+
+        Args:
+            definition (Component | str): The component to instantiate, or the path to its .dcs.json or .vhd file.
+            label (str): The label of the instance, which is used as its key.
+        """
+        # Import here to avoid circular import
+        from py_objects.components.sub_component import SubComponent, load_definition
+
+        if isinstance(definition, str):
+            filename, definition = definition, load_definition(definition)
+            sub_component = SubComponent.instantiate(definition, label, scene_x, scene_y)
+            sub_component.directory = os.path.dirname(filename)
+            sub_component.json_filename = os.path.basename(filename)
+        else:
+            sub_component = SubComponent.instantiate(definition, label, scene_x, scene_y)
+
+        return self.sub_components.create(sub_component)
+
+    def flatten(self) -> Component:
+        """
+        Expands every sub-component instance, recursively, into a single component of gates.
+        Internal signals of an instance are prefixed with its label, e.g. 'U1_carry'.
+        """
+        # Import here to avoid circular import
+        from py_objects.components.flattener import Flattener
+
+        return Flattener().flatten(self)
         
-        return None
+    def optimize(self) -> Component:
+        """
+        Returns an optimized copy of the component (flattened first if it has sub-components),
+        with duplicate gates merged, constants folded, double inversions removed and gates that
+        never reach an output port swept. The copy is kept until the DAOs change, and what was
+        done is described in `optimization_report`.
+        """
+        # Import here to avoid circular import
+        from py_objects.netlist.optimizer import Optimizer
+
+        revisions = (self.gates.revision, self.connections.revision, self.io_ports.revision,
+                     self.netlist.revision, self.sub_components.revision)
+        if self.__optimized is None or self.__optimized[0] != revisions:
+            optimizer = Optimizer(self.flatten() if len(self.sub_components) else self)
+            self.__optimized = (revisions, optimizer.optimize())
+            self.optimization_report = optimizer.report
+
+        return self.__optimized[1]
         
-    def generate_vhdl_code(self):
-        placeholders = {
-            "entity_name": self.name,
-            "architecture_name": self.architecture,
-            "port_declarations": self.io_ports.decode_to_vhdl(),
-            "signal_declarations": self.connections.decode_to_vhdl(),
-            "gate_operations": self.gates.decode_to_vhdl()
-        }
+    def generate_vhdl_code(self, optimize: bool = False) -> str:
+        """
+        Generates the VHDL code, re-rendering only the sections whose DAOs have changed.
+
+        Args:
+            optimize (bool): Whether to generate the code of the optimized component instead.
+        """
+        if optimize:
+            return self.optimize().generate_vhdl_code()
+
+        return self.vhdl_writer.generate()
+
+    def simulate(self, vectors: list[dict[str, int]], optimize: bool = False) -> list[dict[str, int]]:
+        """
+        Simulates the component with bit-parallel evaluation over all the stimulus vectors.
+
+        Args:
+            vectors (list[dict[str, int]]): Input port values (0 or 1) keyed by port name.
+            optimize (bool): Whether to simulate the optimized component, which has the same outputs.
+
+        Returns:
+            list[dict[str, int]]: Output port values keyed by port name, one per input vector.
+        """
+        # Import here to avoid circular import
+        from py_objects.simulation.compiled_simulator import CompiledSimulator
+
+        if optimize:
+            component = self.optimize()
+        else:
+            component = self.flatten() if len(self.sub_components) else self
+        return CompiledSimulator(component).simulate(vectors)
+
+    def simulate_events(self, vectors: list[dict[str, int]], delays: dict[str, int] = None, max_iterations: int = 1000,
+                        optimize: bool = False):
+        """
+        Simulates the component event by event, which also handles feedback loops such as latches.
+        The stimulus vectors are applied one after the other, so the state carries over between them.
+
+        Args:
+            vectors (list[dict[str, int]]): Input port values (0 or 1) keyed by port name.
+            delays (dict[str, int], optional): Propagation delay per gate type. Unit delay by default.
+            max_iterations (int): Time steps and delta cycles per stimulus before reporting an oscillation.
+            optimize (bool): Whether to simulate the optimized component. Gates on feedback loops are kept,
+                but merged gates change the timing of the other paths.
+
+        Returns:
+            list[StimulusResult]: The outputs, settle time and event count of each stimulus.
+        """
+        # Import here to avoid circular import
+        from py_objects.simulation.event_simulator import EventDrivenSimulator
+
+        if optimize:
+            component = self.optimize()
+        else:
+            component = self.flatten() if len(self.sub_components) else self
+        return EventDrivenSimulator(component, delays, max_iterations).run(vectors)
+
+    def truth_table(self, max_inputs: int = 16) -> list[dict[str, int]]:
+        """
+        Evaluates the component for every combination of its input ports, in a single bit-parallel pass.
+
+        Args:
+            max_inputs (int): The largest number of input ports to enumerate, as the table has 2^n rows.
+
+        Returns:
+            list[dict[str, int]]: One row per combination, with the values of the input and output ports.
+                The first input port is the most significant bit of the row number.
+        """
+        # Import here to avoid circular import
+        from py_objects.simulation.compiled_simulator import CompiledSimulator
+
+        simulator = CompiledSimulator(self.flatten() if len(self.sub_components) else self)
+        inputs = simulator.input_names
+        if len(inputs) > max_inputs:
+            raise ValueError(f"'{self.name}' has {len(inputs)} inputs, which is more than {max_inputs}. Use `bdd` instead.")
+
+        # Column of input i (from the last) alternates every 2^i rows
+        width = 1 << len(inputs)
+        words = []
+        for i in range(len(inputs)):
+            period = 1 << (len(inputs) - 1 - i)
+            block = ((1 << period) - 1) << period
+            words.append(sum(block << start for start in range(0, width, 2 * period)))
+
+        rows = simulator.unpack(simulator.run_packed(words, width), width)
+        for number, row in enumerate(rows):
+            for i, name in enumerate(inputs):
+                row[name] = (number >> (len(inputs) - 1 - i)) & 1
+
+        return [{**{name: row[name] for name in inputs}, **{name: row[name] for name in simulator.output_names}}
+                for row in rows]
+
+    def bdd(self, reorder: bool = True):
+        """
+        Builds a reduced ordered BDD of every output port, with one variable per input port.
+
+        Args:
+            reorder (bool): Whether to sift the variable order to keep the diagrams small.
+
+        Returns:
+            tuple[BDD, dict[str, int]]: The BDD manager, and the node of every output port. The manager
+                answers minterm counts (`sat_count`), tautology checks and support sets.
+        """
+        # Import here to avoid circular import
+        from py_objects.analysis.bdd import build_output_bdds
+
+        return build_output_bdds(self.flatten() if len(self.sub_components) else self, reorder)
 
-        # Open the VHDL template
-        with open("vhdl/template.vhd", 'r') as file:
-            vhdl_template = file.read()
+    def timing(self, delays: dict[str, float] = None):
+        """
+        Returns the depth and critical path analysis of the component. The analysis is kept and
+        updated incrementally as gates and connections are added, so it can be queried after
+        every edit.
 
-        return vhdl_template.format(**placeholders)
+        A component with sub-components is flattened first, so that paths through the instances
+        are followed gate by gate, and the path reports the gates of the flattened copy. That
+        analysis is made again, rather than updated, after every edit.
+
+        Args:
+            delays (dict[str, float], optional): Delay per gate type (e.g. {"xor": 2}). Unit delay by default.
+
+        Returns:
+            TimingAnalysis: The analysis, which answers output depths, the critical path and gate slacks.
+        """
+        # Import here to avoid circular import
+        from py_objects.analysis.timing import TimingAnalysis
+
+        delays = delays or dict()
+        revisions = None
+        if len(self.sub_components):
+            revisions = (self.gates.revision, self.connections.revision, self.io_ports.revision,
+                         self.netlist.revision, self.sub_components.revision)
+
+        if self.__timing is None or self.__timing[0] != delays or self.__timing[1] != revisions:
+            if self.__timing is not None:
+                self.__timing[2].close()
+            component = self.flatten() if revisions is not None else self
+            self.__timing = (dict(delays), revisions, TimingAnalysis(component, delays))
+
+        return self.__timing[2]
+
+    def lint(self):
+        """
+        Checks the connectivity of the whole component in one pass over the netlist.
+
+        Returns:
+            LintReport: Undriven and multiply driven nets, floating inputs, unused outputs, width
+                mismatches and unconnected ports, as a list of issues with a kind and a severity.
+        """
+        # Import here to avoid circular import
+        from py_objects.analysis.lint import lint
+
+        return lint(self)
+
+    def find_loops(self):
+        """
+        Returns every feedback loop of the component, found as strongly connected components of
+        the gate graph. Cross-coupled NAND or NOR pairs are classified as latches, and any other
+        loop as combinational (accidental). A component with sub-components is flattened first,
+        so loops through the instances are found, made of the gates of the flattened copy.
+        """
+        # Import here to avoid circular import
+        from py_objects.analysis.scc import find_loops
+
+        return find_loops(self.flatten() if len(self.sub_components) else self)
+
+    def loop_detector(self):
+        """
+        Returns the detector that reports a feedback loop as soon as a connection closes it. The
+        detector is kept, and checks every connection made after this call in the region of the
+        gate graph between the ends of the connection.
+
+        Only flat components can be followed, as a loop through a sub-component instance cannot be
+        seen in this component's gate graph. Use `find_loops` for components with sub-components.
+
+        Returns:
+            CycleDetector: The detector, with the loops found in `loops` and callbacks in `on_loop`.
+        """
+        # Import here to avoid circular import
+        from py_objects.analysis.scc import CycleDetector
+
+        if len(self.sub_components):
+            raise IllegalOperationException(
+                f"Loops of '{self.name}' cannot be followed incrementally through its sub-components.")
+
+        if self.__loop_detector is None:
+            self.__loop_detector = CycleDetector(self)
+
+        return self.__loop_detector
+
+    def check_equivalence(self, other: Component, vectors: int = 4096, seed: int = None):
+        """
+        Checks whether another version of the component has the same outputs for every input,
+        first by random simulation and then by proof with a SAT solver.
+
+        Args:
+            other (Component): The other version, with the same I/O port names.
+            vectors (int): The number of random vectors simulated before the proof.
+            seed (int, optional): The seed of the random vectors.
+
+        Returns:
+            EquivalenceResult: Whether they are equivalent, and if not, a counterexample vector.
+        """
+        # Import here to avoid circular import
+        from py_objects.analysis.equivalence import EquivalenceChecker
+
+        return EquivalenceChecker(self, other, vectors).check(seed)
 
     def connect_wire(self, name: str, bit_size: int, 
                 src_key: int | str, src_port: str, 
@@ -68,11 +339,15 @@ class Component:
         if self.io_ports.search(name) is not None:
             raise ObjectExistsException(f"There's already an I/O signal with name '{name}'. Please try a different one.")
         
-        # Create a wire
-        self.connections.create(name, bit_size)
+        # Create the wire, unless it is fanning out to another destination
+        wire = self.connections.search(name)
+        if wire is None:
+            wire = self.connections.create(name, bit_size)
+        elif wire.bit_size != bit_size:
+            raise BitSizeMismatchException(f"Wire '{name}' is {wire.bit_size} bits wide, not {bit_size}.")
 
         # Connect the wire
-        self.connections.search(name).connect(
+        wire.connect(
             self.retrieve_object(src_key), src_port,
             self.retrieve_object(dest_key), dest_port
         )
@@ -89,20 +364,57 @@ class Component:
     def connect_port(self, io_port: str, dest_key: int | str, dest_port: str) -> None:
         self.io_ports.search(io_port).connect(self.retrieve_object(dest_key), dest_port)
 
-    def draw_all_internals(self, scene: QGraphicsScene) -> None:
-        for gate in self.gates.list_items():
-            
-            gate.draw(scene)
+    def auto_place(self, column_spacing: float = None, row_spacing: float = None):
+        """
+        Places the gates in columns by logic level, ordered to reduce crossing connections, with
+        the input ports on the left and the output ports on the right. The positions are snapped
+        to the grid and stored in the model, so they are saved with the component.
+
+        Returns:
+            LayeredPlacement: The placement, with the crossings before and after ordering the columns.
+        """
+        # Import here to avoid circular import
+        from py_objects.components.placement import LayeredPlacement
+
+        placement = LayeredPlacement(self, column_spacing or LayeredPlacement.COLUMN_SPACING,
+                                     row_spacing or LayeredPlacement.ROW_SPACING)
+        placement.place()
+        return placement
+
+    def draw_all_internals(self, scene: QGraphicsScene, route_wires: bool = True) -> None:
+        """
+        Draws every gate, I/O port and connector into the scene, in bulk: the scene's index is
+        suspended while the items are added and rebuilt once at the end. The seconds spent in
+        each phase are kept in `draw_timings`.
+
+        Args:
+            scene (QGraphicsScene): The scene to draw into.
+            route_wires (bool, optional): Route the connectors along the grid, around the gates and
+                ports, rather than drawing them as straight lines.
+        """
+        # Import here, so that the model can be used without Qt
+        from graphics.scene_builder import SceneBuilder
+
+        builder = SceneBuilder(route_wires)
+        builder.build(self, scene)
+        self.draw_timings = builder.timings
 
-        for port in self.io_ports.list_items():
-            port.draw_port(scene)
-            port.draw(scene)
+    def draw_visible(self, view: QGraphicsView, route_wires: bool = True):
+        """
+        Draws the internals into the scene of the view lazily: only the gates and ports around the
+        visible region are drawn, and more as the view is scrolled or zoomed out. For designs too
+        big to draw up front with `draw_all_internals`.
 
-        for wire in self.connections.list_items():
-            wire.draw(scene)
+        Returns:
+            ViewportPopulator: Follows the view, until it is closed.
+        """
+        # Import here, so that the model can be used without Qt
+        from graphics.viewport_populator import ViewportPopulator
+
+        return ViewportPopulator(self, view, route_wires=route_wires)
 
     def export_dict(self):
-        return {
+        data = {
             "__class__": "Component",
             "name": self.name,
             "architecture": self.architecture,
@@ -111,35 +423,72 @@ class Component:
             "io_ports": self.io_ports.list_items()
         }
 
+        # Flat components are written without the key, as they always have been.
+        # Definition files are written relative to the directory of this component
+        if len(self.sub_components):
+            data["sub_components"] = [instance.export_dict(self.directory) for instance in self.sub_components.list_items()]
+
+        return data
+
     def save(self, filename: str) -> None:
-        """Saves the component to a JSON file"""
+        """Saves the component to a JSON file, or to a binary netlist if the filename ends with .dcs.bin"""
         # Import here to avoid circular import
         from py_objects.components.component_json import ComponentEncoder, json
+        from py_objects.components.component_binary import write_binary
         
-        # Save the json file
-        with open(filename, 'w') as file:
-            json.dump(self.export_dict(), file, cls=ComponentEncoder, indent=4)
-
         self.json_filename = os.path.basename(filename)
         self.directory = os.path.dirname(filename)
 
+        # Issues are reported, but do not prevent saving work in progress
+        self.lint_report = self.lint()
+
+        # Save the json (or binary) file
+        if filename.endswith(".dcs.bin"):
+            write_binary(self, filename)
+        else:
+            with open(filename, 'w') as file:
+                json.dump(self.export_dict(), file, cls=ComponentEncoder, indent=4)
+
         vhdl_filename = os.path.join(self.directory, f"{self.name}.vhd")
 
-        # Save the VHDL file in the same directory as the JSON file
-        with open(vhdl_filename, 'w') as vhdl_file:
-            vhdl_file.write(self.generate_vhdl_code())
+        # Save the VHDL file in the same directory as the JSON file, if it has changed
+        self.vhdl_writer.save(vhdl_filename)
             
 
     @staticmethod
     def load(filename: str) -> Component:
-        """Loads a component from a JSON file"""
+        """
+        Loads a component from a JSON file, from a binary netlist if the filename ends with .dcs.bin,
+        or from a dataflow VHDL file if it ends with .vhd or .vhdl
+        """
         # Import here to avoid circular import
         from py_objects.components.component_json import ComponentDecoder, json
+        from py_objects.components.component_binary import BinaryNetlist
+        from py_objects.vhdl.importer import import_vhdl
         
-        with open(filename, 'r') as file:
-            component = json.load(file, cls=ComponentDecoder)
-            component.json_filename = os.path.basename(filename)
-            component.directory = os.path.dirname(filename)
+        start = time.perf_counter()
+
+        if filename.endswith(".dcs.bin"):
+            with BinaryNetlist(filename) as netlist:
+                component = netlist.to_component()
+        elif filename.lower().endswith((".vhd", ".vhdl")):
+            component = import_vhdl(filename)
+        else:
+            with open(filename, 'r') as file:
+                component = json.load(file, cls=ComponentDecoder)
+
+        component.json_filename = os.path.basename(filename)
+        component.directory = os.path.dirname(filename)
+
+        # Definition files of the sub-components are relative to this component's file
+        for instance in component.sub_components.list_items():
+            if not os.path.isabs(instance.json_filename):
+                instance.directory = component.directory
+
+        # Whatever was not spent building the component was spent parsing the file
+        total = time.perf_counter() - start
+        component.load_timings["parsing"] = total - sum(component.load_timings.values())
+        component.load_timings["total"] = total
 
-            return component
+        return component
     
\ No newline at end of file
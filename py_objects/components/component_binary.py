@@ -0,0 +1,220 @@
+"""
+Binary netlist format (.dcs.bin), little-endian:
+
+    Header      magic 'DCSB', version, flags, string count, string bytes, gate count,
+                net count, port count, fanout count, component name, architecture name
+    Strings     (string count + 1) offsets into the string blob, then the UTF-8 blob itself
+    Gates       type, ID, scene x, scene y
+    Nets        name, bit size, driving gate ID (-1 if none), source port, fanout range
+    Ports       name, bit size, direction, scene x, scene y, fanout range
+    Fanout      gate ID, port name
+
+Names are stored once in the string table and referenced by index. Every section after the
+string blob is an array of fixed-width records, so any record can be read straight out of a
+memory-mapped file.
+"""
+
+from __future__ import annotations
+import mmap
+import struct
+
+from py_objects.components.component import Component
+from py_objects.components.bulk_loader import BulkLoader
+from exceptions.illegal_operation_exception import IllegalOperationException
+
+
+MAGIC = b"DCSB"
+VERSION = 1
+GATE_TYPES = ("AND", "OR", "XOR", "NAND", "NOR", "XNOR", "NOT")
+
+HEADER = struct.Struct("<4sHHIIIIIIII")
+OFFSET = struct.Struct("<I")
+GATE = struct.Struct("<B3xIdd")
+NET = struct.Struct("<IIiIII")
+PORT = struct.Struct("<IIB3xddII")
+FANOUT = struct.Struct("<iI")
+
+
+def write_binary(component: Component, filename: str) -> None:
+    """
+    Writes a component to a binary netlist file.
+
+    Args:
+        component (Component): The component to write.
+        filename (str): The path to the .dcs.bin file.
+    """
+    if len(component.sub_components):
+        raise IllegalOperationException(
+            f"'{component.name}' has sub-components, which the binary format cannot hold. Save its flattened form instead."
+        )
+
+    strings: dict[str, int] = dict()
+
+    def string(value: str) -> int:
+        """Returns the index of a string in the string table, adding it if necessary"""
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    name, architecture = string(component.name), string(component.architecture or "")
+    gates, nets, ports, fanout = bytearray(), bytearray(), bytearray(), bytearray()
+
+    def pack_fanout(dests: list[tuple[int, str]]) -> tuple[int, int]:
+        """Appends the destinations to the fanout array and returns their range"""
+        start = len(fanout) // FANOUT.size
+        for dest_key, dest_port in dests:
+            fanout.extend(FANOUT.pack(dest_key, string(dest_port)))
+        return start, len(dests)
+
+    for gate in component.gates.list_items():
+        x, y = gate.pos()
+        gates.extend(GATE.pack(GATE_TYPES.index(gate.vhdl_op.upper()), gate.id, x, y))
+
+    for wire in component.connections.list_items():
+        data = wire.export_dict()
+        driver = data['src_key'] if data['src_key'] is not None else -1
+        nets.extend(NET.pack(string(wire.name), wire.bit_size, driver, string(data['src_port'] or ""),
+                             *pack_fanout(data['dests'])))
+
+    for port in component.io_ports.list_items():
+        data = port.export_dict()
+        ports.extend(PORT.pack(string(port.name), port.bit_size, port.is_input, data['scene_x'], data['scene_y'],
+                               *pack_fanout(data['dests'])))
+
+    # String table: offsets followed by the blob
+    blobs = [value.encode("utf-8") for value in strings]
+    offsets, position = bytearray(), 0
+    for blob in blobs:
+        offsets.extend(OFFSET.pack(position))
+        position += len(blob)
+    offsets.extend(OFFSET.pack(position))
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(blobs), position,
+                               len(gates) // GATE.size, len(nets) // NET.size,
+                               len(ports) // PORT.size, len(fanout) // FANOUT.size,
+                               name, architecture))
+        file.write(offsets)
+        file.write(b"".join(blobs))
+        for section in (gates, nets, ports, fanout):
+            file.write(section)
+
+
+class BinaryNetlist:
+    """
+    A memory-mapped view of a .dcs.bin file.
+
+    Records are only unpacked when they are accessed, and strings are decoded on first use,
+    so opening a file costs no more than reading its header. Call `to_component` to build
+    the full component.
+    """
+
+    # ========== Private Functions ==========
+    def __record(self, layout: struct.Struct, base: int, index: int, count: int) -> tuple:
+        """Unpacks one fixed-width record from a section"""
+        if not 0 <= index < count:
+            raise IndexError(f"Record {index} is out of range")
+        return layout.unpack_from(self.__buffer, base + index * layout.size)
+
+    def __fanout(self, start: int, count: int) -> list[list[int | str]]:
+        """Returns the destinations in a fanout range"""
+        return [
+            [dest_key, self.string(dest_port)]
+            for dest_key, dest_port in FANOUT.iter_unpack(
+                self.__buffer[self.__fanout_base + start * FANOUT.size:self.__fanout_base + (start + count) * FANOUT.size]
+            )
+        ]
+
+    # ========== Public Functions ==========
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+
+        with open(filename, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__buffer = memoryview(self.__map)
+
+        (magic, version, _, self.string_count, string_bytes, self.gate_count, self.net_count,
+         self.port_count, self.fanout_count, name, architecture) = HEADER.unpack_from(self.__buffer, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{filename}' is not a binary netlist file")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"'{filename}' uses format version {version}, but only up to {VERSION} is supported")
+
+        # Section offsets
+        self.__offset_base = HEADER.size
+        self.__string_base = self.__offset_base + (self.string_count + 1) * OFFSET.size
+        self.__gate_base = self.__string_base + string_bytes
+        self.__net_base = self.__gate_base + self.gate_count * GATE.size
+        self.__port_base = self.__net_base + self.net_count * NET.size
+        self.__fanout_base = self.__port_base + self.port_count * PORT.size
+
+        self.__strings: dict[int, str] = dict()
+        self.name = self.string(name)
+        self.architecture = self.string(architecture)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self.__strings.clear()
+        self.__buffer.release()
+        self.__map.close()
+
+    def string(self, index: int) -> str:
+        """Returns an entry of the string table"""
+        if index not in self.__strings:
+            start, end = struct.unpack_from("<II", self.__buffer, self.__offset_base + index * OFFSET.size)
+            self.__strings[index] = bytes(self.__buffer[self.__string_base + start:self.__string_base + end]).decode("utf-8")
+
+        return self.__strings[index]
+
+    def gate(self, index: int) -> dict:
+        """Returns a gate in the same form as `Gate.export_dict`"""
+        type_, id_, x, y = self.__record(GATE, self.__gate_base, index, self.gate_count)
+        return {"__class__": "Gate", "id": id_, "type": GATE_TYPES[type_], "scene_x": x, "scene_y": y}
+
+    def net(self, index: int) -> dict:
+        """Returns a wire in the same form as `Wire.export_dict`"""
+        name, bit_size, driver, src_port, start, count = self.__record(NET, self.__net_base, index, self.net_count)
+        return {
+            "__class__": "Wire",
+            "name": self.string(name),
+            "bit_size": bit_size,
+            "src_key": driver if driver >= 0 else None,
+            "src_port": self.string(src_port) or None,
+            "dests": self.__fanout(start, count)
+        }
+
+    def port(self, index: int) -> dict:
+        """Returns an I/O port in the same form as `IOPort.export_dict`"""
+        name, bit_size, is_input, x, y, start, count = self.__record(PORT, self.__port_base, index, self.port_count)
+        return {
+            "__class__": "IOPort",
+            "name": self.string(name),
+            "bit_size": bit_size,
+            "dests": self.__fanout(start, count),
+            "is_input": bool(is_input),
+            "scene_x": x,
+            "scene_y": y
+        }
+
+    def export_dict(self) -> dict:
+        """Materialises the whole netlist in the same form as `Component.export_dict`"""
+        return {
+            "__class__": "Component",
+            "name": self.name,
+            "architecture": self.architecture,
+            "gates": [self.gate(i) for i in range(self.gate_count)],
+            "connections": [self.net(i) for i in range(self.net_count)],
+            "io_ports": [self.port(i) for i in range(self.port_count)]
+        }
+
+    def to_component(self) -> Component:
+        """Builds the component described by the netlist"""
+        return BulkLoader().load(self.export_dict())
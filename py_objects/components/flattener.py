@@ -0,0 +1,230 @@
+from __future__ import annotations
+from collections import OrderedDict
+import os
+
+from py_objects.gates.gate import Gate
+from py_objects.components.component import Component
+from py_objects.components.sub_component import SubComponent
+from py_objects.components.bulk_loader import BulkLoader
+from exceptions.illegal_operation_exception import IllegalOperationException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.signals.signal import Signal
+
+# Flattened definitions, keyed by their file (or by the component, if it has none), along with the
+# component and the revisions they were expanded from. The least recently used are dropped first.
+_flattened: OrderedDict[str, tuple[Component, tuple, dict]] = OrderedDict()
+MAX_FLATTENED = 64
+
+# Joins instance labels and signal names, keeping the flattened names valid VHDL identifiers
+SEPARATOR = "_"
+
+
+class Flattener:
+    """
+    Expands the sub-component instances of a component into a single netlist of gates.
+
+    Every definition is flattened once, into the form written by `Component.export_dict` with
+    its gates numbered from 1, and cached per definition file along with the DAO revisions of
+    the component and of the definitions it instantiates, so that it is expanded again only
+    once one of them is edited. Moving gates around does not count as an edit. An instance is
+    then stamped out of the cached form by offsetting the gate IDs and prefixing the signal
+    names with the instance label, so a design with a thousand instances of the same child
+    flattens that child only once.
+
+    `expanded` and `stamped` count the definitions flattened and the instances stamped by
+    this flattener.
+    """
+
+    # ========== Private Functions ==========
+    def __revisions(self, component: Component) -> tuple:
+        """Returns the revisions of a component and of every definition it instantiates"""
+        key = id(component)
+        if key not in self.__revisions_of:
+            self.__revisions_of[key] = (
+                component.name, component.architecture, component.gates.revision, component.connections.revision,
+                component.io_ports.revision, component.netlist.revision, component.sub_components.revision,
+                tuple(self.__revisions(instance.definition) for instance in component.sub_components.list_items())
+            )
+
+        return self.__revisions_of[key]
+
+    def __definition(self, component: Component) -> dict:
+        """Returns the flattened form of a component, expanding it only if it is not cached yet"""
+        json_filename = getattr(component, "json_filename", "")
+        if json_filename:
+            key = os.path.abspath(os.path.join(component.directory, json_filename))
+        else:
+            key = f"#{id(component)}"
+
+        revisions = self.__revisions(component)
+        cached = _flattened.get(key)
+        if cached is not None and cached[0] is component and cached[1] == revisions:
+            _flattened.move_to_end(key)
+            return cached[2]
+
+        flat = self.__expand(component)
+        _flattened[key] = (component, revisions, flat)
+        _flattened.move_to_end(key)
+        if len(_flattened) > MAX_FLATTENED:
+            _flattened.popitem(last=False)
+        self.expanded += 1
+
+        return flat
+
+    def __stamp(self, instance: SubComponent, gates: list[dict], connections: list[dict]) -> dict[str, list]:
+        """
+        Copies the flattened definition of an instance into the gate and connection lists.
+
+        Returns:
+            dict[str, list]: For every port of the instance, the ID of the gate driving it (None for
+                inputs) and the gate inputs reading it.
+        """
+        child = self.__definition(instance.definition)
+        offset = len(gates)
+        prefix = instance.label + SEPARATOR
+        x, y = instance.pos()
+
+        for gate in child["gates"]:
+            gates.append({
+                "__class__": "Gate",
+                "id": gate["id"] + offset,
+                "type": gate["type"],
+                "scene_x": gate["scene_x"] + x,
+                "scene_y": gate["scene_y"] + y
+            })
+
+        for wire in child["connections"]:
+            connections.append({
+                "__class__": "Wire",
+                "name": prefix + wire["name"],
+                "bit_size": wire["bit_size"],
+                "src_key": wire["src_key"] + offset if wire["src_key"] is not None else None,
+                "src_port": wire["src_port"],
+                "dests": [[dest_key + offset, dest_port] for dest_key, dest_port in wire["dests"]]
+            })
+
+        pins = dict()
+        for port in child["io_ports"]:
+            driver, readers = None, []
+            for dest_key, dest_port in port["dests"]:
+                if dest_port == "out":
+                    driver = dest_key + offset
+                else:
+                    readers.append([dest_key + offset, dest_port])
+            pins[port["name"]] = [driver, readers]
+
+        self.stamped += 1
+        return pins
+
+    def __expand(self, component: Component) -> dict:
+        """Flattens one component, whose instances are stamped from their own flattened definitions"""
+        gates, connections, io_ports = [], [], []
+        ids: dict[int, int] = dict()     # Gate ID in the component -> gate ID in the flattened form
+
+        for gate in component.gates.list_items():
+            ids[gate.id] = len(gates) + 1
+            x, y = gate.pos()
+            gates.append({"__class__": "Gate", "id": ids[gate.id], "type": gate.vhdl_op.upper(), "scene_x": x, "scene_y": y})
+
+        # Pins of every instance, and the ones that are mapped to a signal of the component
+        pins = {instance.label: self.__stamp(instance, gates, connections)
+                for instance in component.sub_components.list_items()}
+        mapped: set[tuple[str, str]] = set()
+
+        def resolve(signal: Signal, endpoints: list[tuple[Gate | SubComponent, str]]) -> tuple[int | None, list]:
+            """Returns the driving gate and the reading gate inputs of a signal, through any instance pins"""
+            driver, readers = None, []
+            for obj, port in endpoints:
+                if isinstance(obj, Gate):
+                    if port == "out":
+                        pin_driver, pin_readers = ids[obj.id], []
+                    else:
+                        pin_driver, pin_readers = None, [[ids[obj.id], port]]
+                elif isinstance(obj, SubComponent):
+                    pin_driver, pin_readers = pins[obj.label][port]
+                    mapped.add((obj.label, port))
+                else:
+                    continue
+
+                if pin_driver is not None:
+                    if driver is not None and driver != pin_driver:
+                        raise IllegalOperationException(f"Signal '{signal.name}' has more than one driver.")
+                    driver = pin_driver
+                readers.extend(pin_readers)
+
+            return driver, readers
+
+        for wire in component.connections.list_items():
+            driver, readers = resolve(wire, [(wire.src, wire.src_port)] + wire.dests)
+            if not readers:
+                continue
+            if driver is None:
+                raise IllegalOperationException(f"Signal '{wire.name}' is not driven by any gate or sub-component.")
+
+            connections.append({
+                "__class__": "Wire",
+                "name": wire.name,
+                "bit_size": wire.bit_size,
+                "src_key": driver,
+                "src_port": "out",
+                "dests": readers
+            })
+
+        for port in component.io_ports.list_items():
+            driver, readers = resolve(port, port.dests)
+            io_ports.append({
+                "__class__": "IOPort",
+                "name": port.name,
+                "bit_size": port.bit_size,
+                "dests": ([[driver, "out"]] if driver is not None else []) + readers,
+                "is_input": port.is_input,
+                "scene_x": port.pos()[0],
+                "scene_y": port.pos()[1]
+            })
+
+        # Pins left unmapped: outputs read inside the instance keep a wire of their own
+        for label, instance_pins in pins.items():
+            for port, (driver, readers) in instance_pins.items():
+                if (label, port) in mapped or not readers:
+                    continue
+                if driver is None:
+                    raise IllegalOperationException(f"Input '{port}' of sub-component '{label}' is not connected.")
+
+                connections.append({
+                    "__class__": "Wire",
+                    "name": label + SEPARATOR + port,
+                    "bit_size": 1,
+                    "src_key": driver,
+                    "src_port": "out",
+                    "dests": readers
+                })
+
+        return {
+            "__class__": "Component",
+            "name": component.name,
+            "architecture": component.architecture,
+            "gates": gates,
+            "connections": connections,
+            "io_ports": io_ports
+        }
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        self.__revisions_of: dict[int, tuple] = dict()
+        self.expanded: int = 0
+        self.stamped: int = 0
+
+    def flatten(self, component: Component) -> Component:
+        """
+        Builds a component with every sub-component instance expanded into gates.
+
+        Args:
+            component (Component): The hierarchical component, which is left unchanged.
+
+        Returns:
+            Component: The flat component.
+        """
+        return BulkLoader().load(self.__definition(component))
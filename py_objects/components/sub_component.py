@@ -1,8 +1,37 @@
-import re
+from __future__ import annotations
 import os
 
 from py_objects.dao.connection_dao import IOPortDAO
 from py_objects.components.component import Component
+from py_objects.vhdl.entity_scanner import scan_entity
+from py_objects.vhdl.interface_cache import InterfaceCache
+from exceptions.illegal_operation_exception import IllegalOperationException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.signals.wire import Wire
+    from py_objects.signals.io_port import IOPort
+
+# Loaded definitions, keyed by path, along with the modification time and size they were loaded at
+_definitions: dict[str, tuple[float, int, Component]] = dict()
+
+
+def load_definition(filename: str) -> Component:
+    """
+    Returns the component defined in a .dcs.json, .dcs.bin or .vhd file.
+    Every instance of the same file shares one loaded component, until the file changes.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+
+    cached = _definitions.get(path)
+    if cached is None or cached[:2] != (stat.st_mtime, stat.st_size):
+        cached = (stat.st_mtime, stat.st_size, Component.load(path))
+        _definitions[path] = cached
+
+    return cached[2]
+
 
 class SubComponent(Component):
     """
@@ -13,64 +42,116 @@ class SubComponent(Component):
     and an filename in JSON and/or VHDL. The ports are used for VHDL port mapping,
     enabling integration of the sub-component into the parent component's architecture.
     """
-    # TODO: Finish this code
-
-    # ========== Private Functions ==========
-    # Some helpful regex functions to extract sections and ports from the VHDL code
-    @staticmethod
-    def __get_entity_section(vhdl_code: str) -> str:
-        """
-        Extracts the entity section from the VHDL code.
-
-        Args:
-            vhdl_code (str): The VHDL code as a string.
-
-        Returns:
-            str: The entity section of the VHDL code.
-        """
-        entity_regex = r"(?i)entity\s+(\w+)\s+is(.*?)end\s+\1;"
-        match = re.search(entity_regex, vhdl_code, re.DOTALL)
-        if match:
-            return match.group(0)
-        return ""
-    
-    @staticmethod
-    def _get_bit_size_from_type(port_type: str) -> int:
-        """
-        Extracts the bit size from a port type string.
-
-        Args:
-            port_type (str): The port type string (e.g., 'std_logic_vector(7 downto 0)').
-
-        Returns:
-            int: The bit size of the port.
-        """
-        std_logic_vector_regex = r"std_logic_vector\((\d+)\s+downto\s+\d+\)"
-        match = re.search(std_logic_vector_regex, port_type)
-        if match:
-            return int(match.group(1)) + 1
-        else:
-            return 1
-
-
     # ========== Public Functions ==========
     def __init__(self, label: str, name: str, io_ports: list[dict[str, str | int]] = []):
         super().__init__(name, None)
         self.label: str = label
         self.io_ports: IOPortDAO = IOPortDAO(abstraction=True)
         self.add_ports(io_ports)
+        self.generics: dict[str, str] = dict()     # Generic names and their default values
+        self.json_filename = ""
         self.vhdl_filename = ""
+        self.scene_x: float = 20
+        self.scene_y: float = 20
         self.vector_item = None     # TODO: Create a graphics item for the sub-component
+        self.revision: int = 0      # Incremented whenever a port is mapped
+
+        # The component this is an instance of, when it was not loaded from a file
+        self.__definition: Component = None
 
         # The following attributes are deleted and ignored
         del self.architecture
         del self.gates
         del self.connections
+        del self.netlist
         del self.sub_components
 
 
-    def add_port(self, name: str, bit_size: int, is_input: bool) -> None:
-        self.io_ports.create(name, bit_size, is_input)
+    def __str__(self):
+        return f"{self.label}: {self.name}"
+
+    @property
+    def definition(self) -> Component:
+        """The full component this is an instance of, loaded from its file on first use"""
+        if self.__definition is not None:
+            return self.__definition
+
+        filename = self.definition_filename()
+        if not filename:
+            raise IllegalOperationException(f"Sub-component '{self.label}' has no definition to expand.")
+
+        return load_definition(filename)
+
+    def definition_filename(self) -> str:
+        """Returns the path of the file defining the sub-component, preferring the JSON file"""
+        filename = self.json_filename or self.vhdl_filename
+        return os.path.join(self.directory, filename) if filename else ""
+
+    @staticmethod
+    def instantiate(definition: Component, label: str, scene_x: float = 20, scene_y: float = 20) -> SubComponent:
+        """
+        Creates an instance of a component that is already loaded.
+
+        Args:
+            definition (Component): The component to instantiate.
+            label (str): The label of the instance.
+        """
+        sub_component = SubComponent(label, definition.name)
+        sub_component.__definition = definition
+        sub_component.directory = definition.directory
+        sub_component.json_filename = getattr(definition, "json_filename", "")
+        sub_component.setPos(scene_x, scene_y)
+
+        for port in definition.io_ports.list_items():
+            sub_component.add_port(port.name, port.bit_size, port.is_input)
+
+        return sub_component
+
+    def connect(self, signal: Wire | IOPort, port_name: str) -> None:
+        """Maps one of the ports to a wire or an I/O port of the enclosing component"""
+        port = self.io_ports.search(port_name)
+        if port is None:
+            raise IllegalOperationException(f"Sub-component '{self.label}' has no port '{port_name}'.")
+
+        port.connect(signal)
+        self.revision += 1
+
+    def setPos(self, x: float, y: float) -> None:
+        self.scene_x, self.scene_y = float(x), float(y)
+
+    def pos(self) -> tuple[float, float]:
+        return self.scene_x, self.scene_y
+
+    def decode_to_vhdl(self) -> str:
+        """Generates the VHDL instantiation of the sub-component, with unmapped ports left open"""
+        port_map = []
+        for port in self.io_ports.list_items():
+            signal = port.mapped_wire if port.mapped_wire is not None else port.mapped_port
+            port_map.append(f"{port.name} => {signal.name if signal is not None else 'open'}")
+
+        return f"{self.label} : entity work.{self.name} port map ({', '.join(port_map)})"
+
+    def export_dict(self, relative_to: str = ""):
+        """
+        Args:
+            relative_to (str): The directory that the path of the definition file is written relative to.
+        """
+        filename = self.definition_filename()
+        return {
+            "__class__": "SubComponent",
+            "label": self.label,
+            "name": self.name,
+            "filename": os.path.relpath(filename, relative_to or os.curdir) if filename else "",
+            "scene_x": self.scene_x,
+            "scene_y": self.scene_y,
+            "io_ports": [
+                {"name": port.name, "bit_size": port.bit_size, "is_input": port.is_input, "direction": port.direction}
+                for port in self.io_ports.list_items()
+            ]
+        }
+
+    def add_port(self, name: str, bit_size: int, is_input: bool, direction: str = None) -> None:
+        self.io_ports.create(name, bit_size, is_input, direction=direction)
 
     def add_ports(self, ports: list[dict[str, str | int]]) -> None:
         """
@@ -84,62 +165,34 @@ class SubComponent(Component):
             self.add_port(**port)
 
     @staticmethod
-    def load_from_vhdl(filename: str, label: str):
+    def load_from_vhdl(filename: str, label: str, use_cache: bool = True):
         """
         Sometimes, a sub-component can be loaded from a VHDL file. Not necessarily from a JSON file.
-        This regex is used to find the ports in a VHDL file. It can be used to load the component
-        from a VHDL file. The regex is case-insensitive and matches the port name, direction (in, out, inout), 
-        and type (e.g., std_logic, std_logic_vector).
+        The entity declaration is read in a single pass by the entity scanner, which picks up the
+        entity name, the generics and the ports with their direction (in, out, inout) and bit size.
+        Parsed interfaces are kept in an on-disk cache, so an unchanged file is not parsed again.
         
         This function loads the sub-component from a VHDL file.
 
         Args:
             filename (str): The path to the VHDL file.
+            label (str): The label for the sub-component.
+            use_cache (bool): Whether to use the interface cache of the file's directory.
         """
-        
-        # Some regex patterns
-        port_regex = r"^\s*([\w\s,]+):\s*(in|out|inout)\s+([\w_]+(?:\s*\([\w\s<>:=]+\))?)"
-        entity_name_regex = r"(?i)entity\s+(\w+)\s+is"
-
-        # Make a new instance of the SubComponent class
-
-        # Read the VHDL file
-        with open(filename, 'r') as file:
-            vhdl_code = file.read()
-
-            # Extract the entity section from the VHDL code
-            entity_section = SubComponent.__get_entity_section(vhdl_code)
+        if use_cache:
+            interface = InterfaceCache.for_file(filename).get(filename)
+        else:
+            with open(filename, 'r') as file:
+                interface = scan_entity(file.read())
 
-            if not entity_section:
-                raise ValueError("No entity section found in the VHDL file.")
-            
         # Initialize the SubComponent with the label
-        sub_component = SubComponent(label, None)
+        sub_component = SubComponent(label, interface.name)
         sub_component.vhdl_filename = os.path.basename(filename)
         sub_component.directory = os.path.dirname(filename)
+        sub_component.generics = {generic["name"]: generic["default"] for generic in interface.generics}
 
-        for line in entity_section.splitlines():
-            port_match = re.match(port_regex, line)
-            entity_name_match = re.search(entity_name_regex, vhdl_code)
-
-            # Find matches for the port regex in the entity section
-            # If a match is found, extract the port name, direction, and type
-            if port_match:
-                port_names = [name.strip() for name in port_match.group(1).strip().split(',')]
-                direction = port_match.group(2).strip() == 'in'
-                port_type = port_match.group(3).strip()
-                bit_size = SubComponent._get_bit_size_from_type(port_type)
-
-                for port_name in port_names:
-                    # Print or process the port information
-                    # Here we just print it, but you can modify this to store it in a data structure
-
-                    # print(f"Port Name: {port_name}, Direction: {'Input' if direction else 'Output'}, Bit size: {bit_size}")
-                    sub_component.add_port(port_name, bit_size, direction)
-
-            elif entity_name_match:
-                # If an entity name match is found, print the entity name
-                sub_component.name = entity_name_match.group(1)
+        for port in interface.ports:
+            sub_component.add_port(port["name"], port["bit_size"], port["is_input"], port["direction"])
                 
         return sub_component
 
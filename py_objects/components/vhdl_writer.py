@@ -0,0 +1,132 @@
+from __future__ import annotations
+import os
+import io
+from string import Formatter
+
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+# The template is looked up next to the sources, not in the working directory
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "vhdl", "template.vhd")
+
+# Parsed templates, keyed by path, along with the modification time they were parsed at
+_templates: dict[str, tuple[float, list[tuple[str, str | None]]]] = dict()
+
+
+def load_template(path: str = TEMPLATE_PATH) -> list[tuple[str, str | None]]:
+    """
+    Returns a VHDL template split into (literal text, placeholder name) pieces.
+    The template is parsed once and cached until the file changes.
+
+    Args:
+        path (str): The path to the template.
+
+    Returns:
+        list[tuple[str, str | None]]: The pieces of the template, in order. The last piece has no placeholder.
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+
+    cached = _templates.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r') as file:
+            pieces = [(literal, field) for literal, field, _, _ in Formatter().parse(file.read())]
+        _templates[path] = cached = (mtime, pieces)
+
+    return cached[1]
+
+
+class VHDLWriter:
+    """
+    Renders the VHDL code of a component section by section.
+
+    Each section (ports, signals, gate operations) is rendered again only when the revision of
+    the DAO it comes from has changed, and the code is streamed piece by piece to the output
+    instead of being assembled into one string first.
+    """
+
+    # ========== Private Functions ==========
+    def __section(self, name: str, revision: tuple, render) -> str:
+        """Returns a cached section, rendering it again if its revision has changed"""
+        cached = self.__sections.get(name)
+        if cached is None or cached[0] != revision:
+            cached = (revision, render())
+            self.__sections[name] = cached
+
+        return cached[1]
+
+    def __operations(self) -> str:
+        """Renders the gate operations, followed by the sub-component instantiations"""
+        component = self.__component
+        if not len(component.sub_components):
+            return component.gates.decode_to_vhdl()
+        if not len(component.gates):
+            return component.sub_components.decode_to_vhdl()
+
+        return component.gates.decode_to_vhdl() + "\n    " + component.sub_components.decode_to_vhdl()
+
+    def __revisions(self) -> tuple:
+        """Returns the revisions that the generated code depends on"""
+        component = self.__component
+        return (component.name, component.architecture, component.io_ports.revision,
+                component.connections.revision, component.gates.revision, component.netlist.revision,
+                component.sub_components.revision)
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component, template_path: str = TEMPLATE_PATH) -> None:
+        self.__component = component
+        self.template_path = template_path
+        self.__sections: dict[str, tuple[tuple, str]] = dict()
+        self.__written: tuple[str, tuple] = None     # Path and revisions of the last written file
+
+    def sections(self) -> dict[str, str]:
+        """Returns the text of every placeholder in the template"""
+        component = self.__component
+        return {
+            "entity_name": component.name,
+            "architecture_name": component.architecture,
+            "port_declarations": self.__section(
+                "ports", (component.io_ports.revision,), component.io_ports.decode_to_vhdl
+            ),
+            "signal_declarations": self.__section(
+                "signals", (component.connections.revision,), component.connections.decode_to_vhdl
+            ),
+            "gate_operations": self.__section(
+                "operations", (component.gates.revision, component.netlist.revision, component.sub_components.revision),
+                self.__operations
+            )
+        }
+
+    def write(self, file: TextIO) -> None:
+        """Streams the VHDL code to an open file"""
+        sections = self.sections()
+
+        for literal, field in load_template(self.template_path):
+            file.write(literal)
+            if field is not None:
+                file.write(sections[field])
+
+    def generate(self) -> str:
+        """Returns the VHDL code as a string"""
+        buffer = io.StringIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    def save(self, filename: str) -> bool:
+        """
+        Writes the VHDL code to a file, unless the same code was already written there.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        written = (os.path.abspath(filename), self.__revisions())
+        if written == self.__written and os.path.exists(filename):
+            return False
+
+        with open(filename, 'w') as file:
+            self.write(file)
+
+        self.__written = written
+        return True
@@ -2,97 +2,88 @@ from py_objects.dao.dao import DataAccessObject
 from exceptions.object_existence_exception import ObjectExistsException
 from py_objects.signals.wire import Wire
 from py_objects.signals.io_port import IOPort, IOPortAbstract
+from py_objects.dao.name_index import NameIndex
+from py_objects.netlist.netlist import Netlist
 
 class ConnectionDAO(DataAccessObject):
 
-    def __init__(self) -> None:
+    def __init__(self, netlist: Netlist = None) -> None:
         """DAO Constructor"""
-        self.wires: list[Wire] = []
+        self.__index: NameIndex = NameIndex()
+        self.wires: dict[str, Wire] = self.__index.items
+        self.netlist: Netlist = netlist if netlist is not None else Netlist()
+        self.revision: int = 0      # Incremented whenever an item is created
 
     def __len__(self):
         return len(self.wires)
 
     def search(self, key: str) -> Wire:
-        for wire in self.wires:
-            if key == wire.name:
-                return wire
-            
-        return None
+        return self.wires.get(key)
     
-    def create(self, name: str, bit_size: int) -> None:
-        if self.search(name) is not None:
+    def create(self, name: str, bit_size: int) -> Wire:
+        if name in self.wires:
             raise ObjectExistsException(f"A signal with name '{name}' already exists")
         
-        self.wires.append(Wire(name, bit_size))
+        wire = Wire(name, bit_size)
+        self.__index.add(wire)
+        self.netlist.add_net(wire, Netlist.WIRE)
+        self.revision += 1
+
+        return wire
 
     def retrieve(self, search_str: str=None, size: int=None) -> list[Wire]:
-        if search_str is not None and size is not None:
-            return list(filter(lambda wire: search_str in wire.name and size == wire.bit_size, self.wires))
-        
-        elif search_str is not None and size is None:
-            return list(filter(lambda wire: search_str in wire.name, self.wires))
-        
-        elif search_str is None and size is not None:
-            return list(filter(lambda wire: size == wire.bit_size, self.wires))
-        
-        else:
-            raise AttributeError("None of the parameters are given")
+        return self.__index.find(search_str, size)
         
     def list_items(self):
-        return self.wires
+        return list(self.wires.values())
     
     def decode_to_vhdl(self) -> str:
         """Generates lines of VHDL code for the wires with indentation"""
-        indentation = max(map(len, [wire.name for wire in self.wires]))
-        return ";\n    ".join([wire.decode_to_vhdl(indentation) for wire in self.wires]) + ';'
+        indentation = max(map(len, self.wires), default=0)
+        return ";\n    ".join([wire.decode_to_vhdl(indentation) for wire in self.wires.values()]) + ';'
     
 
 class IOPortDAO(DataAccessObject):
 
-    def __init__(self, abstraction: bool=False) -> None:
+    def __init__(self, abstraction: bool=False, netlist: Netlist = None) -> None:
         """DAO Constructor"""
-        self.ports: list[IOPort] = []
+        self.__index: NameIndex = NameIndex()
+        self.ports: dict[str, IOPort | IOPortAbstract] = self.__index.items
         self.abstraction = abstraction
+        self.netlist: Netlist = netlist if netlist is not None else Netlist()
+        self.revision: int = 0      # Incremented whenever an item is created
 
     def __len__(self):
         return len(self.ports)
 
     def search(self, key: str) -> IOPort:
-        for port in self.ports:
-            if key == port.name:
-                return port
-            
-        return None
+        return self.ports.get(key)
     
-    def create(self, name: str, bit_size: int, is_input: bool, scene_x: float=20, scene_y: float=20) -> None:
-        if self.search(name) is not None:
+    def create(self, name: str, bit_size: int, is_input: bool, scene_x: float=20, scene_y: float=20,
+               direction: str = None) -> IOPort | IOPortAbstract:
+        if name in self.ports:
             raise ObjectExistsException(f"An I/O Port with name '{name}' already exists")
         
         # If a vector object is not allowed
         if not self.abstraction:
-            self.ports.append(IOPort(name, bit_size, is_input, scene_x, scene_y))
+            port = IOPort(name, bit_size, is_input, scene_x, scene_y)
+            self.netlist.add_net(port, Netlist.INPUT if is_input else Netlist.OUTPUT)
         else:
-            self.ports.append(IOPortAbstract(name, bit_size, is_input))
-            
+            port = IOPortAbstract(name, bit_size, is_input, direction)
 
-    def retrieve(self, search_str: str=None, size: int=None) -> list[Wire]:
-        if search_str is not None and size is not None:
-            return list(filter(lambda wire: search_str in wire.name and size == wire.bit_size, self.ports))
-        
-        elif search_str is not None and size is None:
-            return list(filter(lambda wire: search_str in wire.name, self.ports))
-        
-        elif search_str is None and size is not None:
-            return list(filter(lambda wire: size == wire.bit_size, self.ports))
-        
-        else:
-            raise AttributeError("None of the parameters are given")
+        self.__index.add(port)
+        self.revision += 1
+
+        return port
+
+    def retrieve(self, search_str: str=None, size: int=None) -> list[IOPort | IOPortAbstract]:
+        return self.__index.find(search_str, size)
         
     def list_items(self):
-        return self.ports
+        return list(self.ports.values())
     
     # TODO: Rename this function from decode_to_vhdl to to_vhdl
     def decode_to_vhdl(self) -> str:
         """Generates lines of VHDL code for the I/O Ports with indentation"""
-        indentation = max(map(len, [port.name for port in self.ports]))
-        return ";\n        ".join([port.decode_to_vhdl(indentation) for port in self.ports])
\ No newline at end of file
+        indentation = max(map(len, self.ports), default=0)
+        return ";\n        ".join([port.decode_to_vhdl(indentation) for port in self.ports.values()])
\ No newline at end of file
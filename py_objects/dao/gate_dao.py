@@ -2,64 +2,126 @@ import json
 
 from py_objects.dao.dao import DataAccessObject
 from py_objects.gates.gate import Gate, ANDGate, ORGate, XORGate, NANDGate, NORGate, XNORGate, NOTGate
-from py_objects.dao.helper import next_number
+from py_objects.dao.helper import IdAllocator
+from py_objects.netlist.netlist import Netlist
+from exceptions.object_existence_exception import ObjectExistsException
 
 class GateDAO(DataAccessObject):
 
-    def __init__(self) -> None:
+    # Gate classes, keyed by type
+    GATE_CLASSES = {
+        "AND": ANDGate,
+        "OR": ORGate,
+        "XOR": XORGate,
+        "NAND": NANDGate,
+        "NOR": NORGate,
+        "XNOR": XNORGate,
+        "NOT": NOTGate
+    }
+
+    def __init__(self, netlist: Netlist = None) -> None:
         """DAO Constructor"""
-        self.gates: list[Gate] = [] # type: ignore
+        self.gates: dict[int, Gate] = dict() # type: ignore
+        self.netlist: Netlist = netlist if netlist is not None else Netlist()
+        self.revision: int = 0      # Incremented whenever a gate is created or deleted
+
+        # Per-type buckets, and the allocator for the gate IDs
+        self.__buckets: dict[str, dict[int, Gate]] = {type_: dict() for type_ in GateDAO.GATE_CLASSES}
+        self.__ids: IdAllocator = IdAllocator()
 
     def __len__(self):
         return len(self.gates)
 
+    @staticmethod
+    def __detach(gate: Gate) -> None:
+        """Disconnects a gate from the signals it drives and reads, and takes its drawing off the scene"""
+        # The destinations of the signals are read from the netlist, which drops the gate from them
+        signals = []
+        for signal in gate.out + [gate.in1, gate.in2]:
+            if signal is None or any(signal is other for other in signals):
+                continue
+
+            if signal.src is gate:
+                signal.src, signal.src_port = None, None
+            signals.append(signal)
+
+        item = gate.vector_item
+        if item is None:
+            return
+
+        # Connectors to the gate, which are also attached to the pins at their other end
+        for signal in signals:
+            for connector in [connector for connector in signal.connectors if item in (connector.src, connector.dest)]:
+                signal.connectors.remove(connector)
+                (connector.dest if connector.src is item else connector.src).remove_connector(connector)
+                if connector.router is not None:
+                    connector.router.forget(connector)
+                if connector.scene() is not None:
+                    connector.scene().removeItem(connector)
+
+        if item.router is not None:
+            item.router.remove_obstacle(item)
+        if item.scene() is not None:
+            item.scene().removeItem(item)
+
     def search(self, key: int) -> Gate:
-        for gate in self.gates:
-            if key == gate.id:
-                return gate
-            
-        return None
+        return self.gates.get(key)
     
     def get_all_ids(self) -> list[int]:
-        return [gate.id for gate in self.gates]
+        return list(self.gates)
     
-    def create(self, type_: str, scene_x: float=20, scene_y: float=20, id_: int = None) -> None:
-        new_id = next_number(self.get_all_ids()) if id_ is None else id_
-
-        if type_.upper() == "AND": self.gates.append(ANDGate(new_id, scene_x, scene_y))
-        elif type_.upper() == "OR": self.gates.append(ORGate(new_id, scene_x, scene_y))
-        elif type_.upper() == "XOR": self.gates.append(XORGate(new_id, scene_x, scene_y))
-        elif type_.upper() == "NAND": self.gates.append(NANDGate(new_id, scene_x, scene_y))
-        elif type_.upper() == "NOR": self.gates.append(NORGate(new_id, scene_x, scene_y))
-        elif type_.upper() == "XNOR": self.gates.append(XNORGate(new_id, scene_x, scene_y))
-        elif type_.upper() == "NOT": self.gates.append(NOTGate(new_id, scene_x, scene_y))
-        else:
+    def create(self, type_: str, scene_x: float=20, scene_y: float=20, id_: int = None) -> Gate:
+        gate_class = GateDAO.GATE_CLASSES.get(type_.upper())
+        if gate_class is None:
             raise ValueError(f"Invalid type '{type_}'")
+
+        if id_ is None:
+            new_id = self.__ids.allocate()
+        elif id_ in self.gates:
+            raise ObjectExistsException(f"A gate with ID {id_} already exists")
+        else:
+            new_id = id_
+            self.__ids.reserve(new_id)
+
+        gate = gate_class(new_id, scene_x, scene_y)
+        self.gates[new_id] = gate
+        self.__buckets[type_.upper()][new_id] = gate
+        self.netlist.add_gate(gate)
+        self.revision += 1
+
+        return gate
+
+    def delete(self, key: int) -> None:
+        gate = self.gates.pop(key, None)
+        if gate is None:
+            raise ValueError(f"No gate with ID {key}")
+
+        GateDAO.__detach(gate)
+        del self.__buckets[gate.vhdl_op.upper()][key]
+        self.netlist.remove_gate(gate.index)
+        self.revision += 1
+        self.__ids.release(key)
         
     def retrieve(self, type_: str):
-        if type_.upper() == "AND": return [gate for gate in self.gates if isinstance(gate, ANDGate)]
-        elif type_.upper() == "OR": return [gate for gate in self.gates if isinstance(gate, ORGate)]
-        elif type_.upper() == "XOR": return [gate for gate in self.gates if isinstance(gate, XORGate)]
-        elif type_.upper() == "NAND": return [gate for gate in self.gates if isinstance(gate, NANDGate)]
-        elif type_.upper() == "NOR": return [gate for gate in self.gates if isinstance(gate, NORGate)]
-        elif type_.upper() == "XNOR": return [gate for gate in self.gates if isinstance(gate, XNORGate)]
-        elif type_.upper() == "NOT": return [gate for gate in self.gates if isinstance(gate, NOTGate)]
-        else:
+        if type_.upper() not in self.__buckets:
             raise ValueError(f"Invalid type '{type_}'")
+
+        return list(self.__buckets[type_.upper()].values())
         
     def list_items(self):
-        return self.gates
+        return list(self.gates.values())
     
     def decode_to_vhdl(self) -> str:
         """Generates lines of VHDL code for the I/O Port with indentation"""
 
         def max_length_output_name(gate: Gate) -> int:
             """Returns the maximum length of the signal name from the output. USED FOR INDENTATION PURPOSES!"""
-            return max(map(lambda sig: len(sig.name), gate.out))
-    
-        indentation = max(map(lambda gate: max_length_output_name(gate), self.gates))
-        return ";\n    ".join([gate.get_vhdl_operation(indentation) for gate in self.gates]) + ";"
+            return max(map(lambda sig: len(sig.name), gate.out), default=0)
 
-# class GateEncoder(json.JSONEncoder):
+        # Gates without outputs have nothing to assign
+        gates = [gate for gate in self.gates.values() if gate.out]
+        indentation = max(map(lambda gate: max_length_output_name(gate), gates), default=0)
+        return ";\n    ".join([gate.get_vhdl_operation(indentation) for gate in gates]) + ";"
 
+# class GateEncoder(json.JSONEncoder):
 
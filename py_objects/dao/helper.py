@@ -1,3 +1,6 @@
+import heapq
+
+
 def next_number(numbers: list[int]) -> int:
     """
     Returns the next number to be added to the numerical list, otherwise it fills the gap
@@ -8,11 +11,70 @@ def next_number(numbers: list[int]) -> int:
         return 1
     
     else:
+        taken = set(numbers)
         for i in range(1, max(numbers)+2):
-            if i not in numbers:
+            if i not in taken:
                 return i
             
         return i
+
+
+class IdAllocator:
+    """
+    Allocates positive IDs, filling the gaps before growing past the largest ID.
+
+    The free IDs below the high-water mark are kept as a min-heap of [low, high] intervals,
+    so allocating, reserving and releasing an ID are all O(log n) (amortized).
+    """
+
+    def __init__(self) -> None:
+        self.__gaps: list[tuple[int, int]] = []     # Min-heap of free intervals below the high-water mark
+        self.__next: int = 1                        # Every ID from here onwards is free
+        self.__used: set[int] = set()
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self.__used
+
+    def __len__(self):
+        return len(self.__used)
+
+    def allocate(self) -> int:
+        """Returns the smallest free ID and marks it as used"""
+        while self.__gaps:
+            low, high = heapq.heappop(self.__gaps)
+
+            # IDs that were reserved explicitly may still lie inside an interval, skip them
+            while low <= high and low in self.__used:
+                low += 1
+
+            if low <= high:
+                if low < high:
+                    heapq.heappush(self.__gaps, (low + 1, high))
+
+                self.__used.add(low)
+                return low
+
+        id_ = self.__next
+        self.__next += 1
+        self.__used.add(id_)
+        return id_
+
+    def reserve(self, id_: int) -> None:
+        """Marks a specific ID as used"""
+        if id_ >= self.__next:
+            # Everything jumped over becomes a gap
+            if id_ > self.__next:
+                heapq.heappush(self.__gaps, (self.__next, id_ - 1))
+            self.__next = id_ + 1
+
+        self.__used.add(id_)
+
+    def release(self, id_: int) -> None:
+        """Returns an ID to the pool of free IDs"""
+        if id_ in self.__used:
+            self.__used.remove(id_)
+            heapq.heappush(self.__gaps, (id_, id_))
+
     
 if __name__ == "__main__":
 
@@ -20,4 +82,9 @@ if __name__ == "__main__":
     for i in range(10):
         print(nums)
         nums.append(next_number(nums))
-        nums.sort()
\ No newline at end of file
+        nums.sort()
+
+    allocator = IdAllocator()
+    for num in [2, 3, 5, 7, 8, 9, 14, 15]:
+        allocator.reserve(num)
+    print([allocator.allocate() for _ in range(10)])
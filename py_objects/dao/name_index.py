@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.signals.signal import Signal
+    from py_objects.signals.io_port import IOPortAbstract
+
+
+class NameIndex:
+    """
+    Indexes named signals by name, by bit size and by the substrings of their names.
+
+    Every substring of up to `GRAM_LENGTH` characters is indexed, so a short search string is
+    answered straight from its posting set, and a longer one by intersecting the posting sets
+    of its n-grams and verifying the few remaining candidates.
+    """
+
+    # Longest substring that is indexed
+    GRAM_LENGTH = 3
+
+    # ========== Private Functions ==========
+    @staticmethod
+    def __grams(name: str) -> set[str]:
+        """Returns every substring of the name that is up to GRAM_LENGTH characters long"""
+        return {
+            name[i:i + length]
+            for length in range(1, NameIndex.GRAM_LENGTH + 1)
+            for i in range(len(name) - length + 1)
+        }
+
+    def __candidates(self, search_str: str) -> set[str]:
+        """Returns the names that contain the search string"""
+        if len(search_str) <= NameIndex.GRAM_LENGTH:
+            return self.__postings.get(search_str, set())
+
+        # Intersect the posting sets of the n-grams, starting with the rarest
+        postings = sorted(
+            (self.__postings.get(search_str[i:i + NameIndex.GRAM_LENGTH], set())
+             for i in range(len(search_str) - NameIndex.GRAM_LENGTH + 1)),
+            key=len
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+
+        return {name for name in candidates if search_str in name}
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        self.items: dict[str, Signal | IOPortAbstract] = dict()
+        self.__order: dict[str, int] = dict()
+        self.__counter: int = 0
+        self.__sizes: dict[int, dict[str, Signal | IOPortAbstract]] = dict()
+        self.__postings: dict[str, set[str]] = dict()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.items
+
+    def get(self, name: str) -> Signal | IOPortAbstract:
+        return self.items.get(name)
+
+    def add(self, item: Signal | IOPortAbstract) -> None:
+        self.items[item.name] = item
+        self.__order[item.name] = self.__counter
+        self.__counter += 1
+        self.__sizes.setdefault(item.bit_size, dict())[item.name] = item
+
+        for gram in NameIndex.__grams(item.name):
+            self.__postings.setdefault(gram, set()).add(item.name)
+
+    def find(self, search_str: str = None, size: int = None) -> list[Signal | IOPortAbstract]:
+        """
+        Returns the items whose name contains the search string and/or whose bit size matches,
+        in the order they were added.
+        """
+        if search_str is None and size is None:
+            raise AttributeError("None of the parameters are given")
+
+        if search_str is None:
+            return list(self.__sizes.get(size, dict()).values())
+
+        if search_str == "":
+            names = set(self.items) if size is None else set(self.__sizes.get(size, dict()))
+        else:
+            names = self.__candidates(search_str)
+            if size is not None:
+                bucket = self.__sizes.get(size, dict())
+                names = {name for name in names if name in bucket}
+
+        return [self.items[name] for name in sorted(names, key=self.__order.__getitem__)]
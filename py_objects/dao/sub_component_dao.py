@@ -0,0 +1,56 @@
+from __future__ import annotations
+from py_objects.dao.dao import DataAccessObject
+from exceptions.object_existence_exception import ObjectExistsException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.sub_component import SubComponent
+
+
+class SubComponentDAO(DataAccessObject):
+
+    def __init__(self) -> None:
+        """DAO Constructor"""
+        self.sub_components: dict[str, SubComponent] = dict()     # Keyed by label
+        self.__revision: int = 0    # Incremented whenever an instance is created or deleted
+
+    def __len__(self):
+        return len(self.sub_components)
+
+    @property
+    def revision(self) -> int:
+        """Changes whenever an instance is created, deleted or has one of its ports mapped"""
+        return self.__revision + sum(instance.revision for instance in self.sub_components.values())
+
+    def search(self, key: str) -> SubComponent:
+        return self.sub_components.get(key)
+
+    def create(self, sub_component: SubComponent) -> SubComponent:
+        """Registers a sub-component instance under its label"""
+        if sub_component.label in self.sub_components:
+            raise ObjectExistsException(f"A sub-component with label '{sub_component.label}' already exists")
+
+        self.sub_components[sub_component.label] = sub_component
+        self.__revision += 1
+
+        return sub_component
+
+    def delete(self, key: str) -> None:
+        sub_component = self.sub_components.pop(key, None)
+        if sub_component is None:
+            raise ValueError(f"No sub-component with label '{key}'")
+
+        # Keep the revision increasing, even though the instance no longer counts towards it
+        self.__revision += 1 + sub_component.revision
+
+    def retrieve(self, name: str = None) -> list[SubComponent]:
+        """Returns the instances of the entity with the given name, or every instance"""
+        return [instance for instance in self.sub_components.values() if name is None or instance.name == name]
+
+    def list_items(self):
+        return list(self.sub_components.values())
+
+    def decode_to_vhdl(self) -> str:
+        """Generates the VHDL instantiation of every sub-component"""
+        return ";\n    ".join([instance.decode_to_vhdl() for instance in self.sub_components.values()]) + ";"
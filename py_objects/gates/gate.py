@@ -1,14 +1,14 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from PyQt6.QtWidgets import QGraphicsScene
-from graphics.gate_graphics import GateGraphics
-from PyQt6.QtCore import QPointF
 
 from exceptions.illegal_operation_exception import IllegalOperationException
 
 if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QGraphicsScene
+    from graphics.gate_graphics import GateGraphics
     from py_objects.signals.wire import Wire
     from py_objects.signals.io_port import IOPort
+    from py_objects.netlist.netlist import Netlist
 
 # ================================================================================= #
 
@@ -16,15 +16,21 @@ class Gate:
     # Constants
     SIZE = 50
 
+    __slots__ = ("id", "scene_x", "scene_y", "vector_item", "vhdl_op", "netlist", "index")
+
     # Constructor
     def __init__(self, id_: int) -> None:
         self.id: int = id_
-        self.in1: Wire = None
-        self.in2: Wire = None
-        self.out: Wire | IOPort = []
-        self.vector_item: GateGraphics = None
+        self.scene_x: float = 20
+        self.scene_y: float = 20
+        self.vector_item: GateGraphics = None     # Created when the gate is drawn
         self.vhdl_op: str = "NULL"
 
+        # Position in the netlist store, set when the gate is registered by the DAO. The
+        # connections of the gate are kept there, and read back by `in1`, `in2` and `out`
+        self.netlist: Netlist = None
+        self.index: int = -1
+
     def __str__(self) -> str:
         gate_name = self.vhdl_op.upper() if self.vhdl_op is not None else "GATE"
         return f"{gate_name}{self.id:04d}"
@@ -35,31 +41,54 @@ class Gate:
     def __eq__(self, other) -> bool:
         return self.id == other.id and self.vhdl_op == other.vhdl_op
 
-    def check_connections(self) -> None:
+    @property
+    def in1(self) -> Wire | IOPort | None:
+        if self.netlist is None or self.netlist.gate_in1[self.index] < 0:
+            return None
+        return self.netlist.nets[self.netlist.gate_in1[self.index]]
+
+    @property
+    def in2(self) -> Wire | IOPort | None:
+        if self.netlist is None or self.netlist.gate_in2[self.index] < 0:
+            return None
+        return self.netlist.nets[self.netlist.gate_in2[self.index]]
+
+    @property
+    def out(self) -> list[Wire | IOPort]:
+        """The signals driven by the gate, in the order they were connected"""
+        if self.netlist is None:
+            return []
+        return [self.netlist.nets[net] for net in self.netlist.outputs(self.index)]
+
+    def check_connections(self) -> bool:
         """
-        Checks for any disconnected wires in the gate
+        Checks for any disconnected wires in the gate. `Component.lint` checks the whole design at once.
         """
-        if any(wire is None for wire in [self.in1, self.in2, self.out]):
-            print(f"WARNING! One or more wires are disconnected in gate {self}")
-            return False
-        
-        return True
+        return self.in1 is not None and self.in2 is not None and len(self.out) > 0
     
+    def __check_netlist(self, wire: Wire | IOPort) -> None:
+        """Connections are stored in the netlist, so both ends must belong to the same one"""
+        if self.netlist is None or wire.netlist is not self.netlist:
+            raise IllegalOperationException(f"Gate {self} and '{wire.name}' do not belong to the same component.")
+
     def __connect_input1(self, wire: Wire) -> None:
-        if self.in1 is not None:
+        self.__check_netlist(wire)
+        if self.netlist.gate_in1[self.index] >= 0:
             raise IllegalOperationException(f"Input 1 is already connected in gate {self}.")
         
-        self.in1 = wire
+        self.netlist.connect_input(self.index, 1, wire.index)
     
     def __connect_input2(self, wire: Wire) -> None:
-        if self.in2 is not None:
+        self.__check_netlist(wire)
+        if self.netlist.gate_in2[self.index] >= 0:
             raise IllegalOperationException(f"Input 2 is already connected in gate {self}.")
         
-        self.in2 = wire
+        self.netlist.connect_input(self.index, 2, wire.index)
 
     def __connect_output(self, wire: Wire | IOPort) -> None:
-        if wire not in self.out:
-            self.out.append(wire)
+        self.__check_netlist(wire)
+        if wire.index not in self.netlist.outputs(self.index):
+            self.netlist.connect_output(self.index, wire.index)
             
     def connect(self, wire: Wire, port: str) -> None:
         """
@@ -75,13 +104,23 @@ class Gate:
         elif port == "out":
             self.__connect_output(wire)
         else:
-            raise IllegalOperationException(f"Invalid port '{port}' for gate {self.name}. Valid ports are 'in1', 'in2', and 'out'.")
+            raise IllegalOperationException(f"Invalid port '{port}' for gate {self}. Valid ports are 'in1', 'in2', and 'out'.")
 
     def draw(self, scene: QGraphicsScene) -> None:
-            scene.addItem(self.vector_item)
+        # Import here, so that the model can be used without Qt
+        from graphics.gate_graphics import GateGraphics
+
+        if self.vector_item is None:
+            self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
+            self.vector_item.setPos(self.scene_x, self.scene_y)
+
+        scene.addItem(self.vector_item)
 
     def setPos(self, x: float, y: float) -> None:
-        self.vector_item.setPos(x, y)
+        self.scene_x, self.scene_y = float(x), float(y)
+
+        if self.vector_item is not None:
+            self.vector_item.setPos(x, y)
 
     def get_vhdl_operation(self, indentation: int) -> str:
         """Converts to a stringified line of VHDL code"""
@@ -90,14 +129,15 @@ class Gate:
 
         # If more than one outputs are being distributed
         if len(self.out) > 1:
-            # Retrieve the wire
-            wire = [output for output in self.out if "signal" in str(output)][0]
+            # Retrieve the wire. Without one, every output port gets the operation itself
+            wires = [output for output in self.out if "signal" in str(output)]
+            wire = wires[0] if wires else None
 
             # Iterate through each signal
             for output in self.out:
                 # If one of them is carried by a wire
                 spacing = ' ' * (indentation - len(output.name))
-                if output == wire:
+                if wire is None or output == wire:
                     code_lines.append(f"{output.name}{spacing} <= {operation}")
                 # The others are outputted directly from that wire above
                 else:
@@ -108,90 +148,97 @@ class Gate:
         spacing = ' ' * (indentation - len(self.out[0].name))
         return f"{self.out[0].name}{spacing} <= {operation}"
 
-    def pos(self) -> QPointF:
-        return self.vector_item.scenePos()
+    def pos(self) -> tuple[float, float]:
+        # The graphics item is the source of truth once the gate has been drawn and moved around
+        if self.vector_item is not None:
+            self.scene_x, self.scene_y = self.vector_item.scenePos().x(), self.vector_item.scenePos().y()
+
+        return self.scene_x, self.scene_y
 
     def export_dict(self):
         return {
             "__class__": "Gate",
             "id": self.id,
             "type": self.vhdl_op.upper(),
-            "scene_x": self.pos().x(),
-            "scene_y": self.pos().y()
+            "scene_x": self.pos()[0],
+            "scene_y": self.pos()[1]
         }        
 # ================================================================================= #
 
 class ANDGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """AND Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "and"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
     
 
 class ORGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """OR Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "or"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
 
 
 class XORGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """XOR Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "xor"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
 
 
 class NANDGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """NAND Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "nand"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
 
 
 class NORGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """NOR Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "nor"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
 
 
 class XNORGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """XNOR Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "xnor"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
 
 
 class NOTGate(Gate):
+    __slots__ = ()
+
     def __init__(self, id_: int, scene_x: float=20, scene_y: float=20) -> None:
         """NOT Gate Constructor"""
         super().__init__(id_)
         self.vhdl_op = "not"
-        self.vector_item = GateGraphics(self.vhdl_op.upper(), Gate.SIZE)
         self.setPos(scene_x, scene_y)
 
-    def check_connections(self) -> None:
+    def check_connections(self) -> bool:
         """
         Checks for any disconnected wires in the gate
         """
-        if any(wire is None for wire in [self.in1, self.out]):  # Since there's one input, input2 is ignored
-            print(f"WARNING! One or more wires are disconnected in gate {self.name}")
-            return False
-        
-        return True
+        return self.in1 is not None and len(self.out) > 0    # Since there's one input, input2 is ignored
         
     def connect_input2(self, wire: Wire) -> None:
         raise IllegalOperationException("Input 2 is ignored for NOT Gate, so it's not permitted. Please use Input 1.")
@@ -0,0 +1,257 @@
+from __future__ import annotations
+from array import array
+
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from py_objects.gates.gate import Gate
+    from py_objects.signals.signal import Signal
+    from py_objects.components.sub_component import SubComponent
+
+
+class Netlist:
+    """
+    Struct-of-arrays store for the connectivity of a component.
+
+    Gates and nets are numbered in the order they are added, and their types, pins and drivers
+    live in typed arrays indexed by those numbers. The `Gate` and `Signal` objects handed out by
+    the DAOs only keep their index into this store, and read their connections back from it,
+    so the connectivity is stored once, and analysis and simulation engines can work on flat
+    arrays instead of walking an object graph. The fanout of each net is available in CSR form,
+    and the nets driven by each gate (and the gates driving each net) as chains of output
+    connections. Pins of sub-component instances are kept beside the arrays, per net.
+
+    Incremental analyses can register a listener, which is called as `listener(event, gate, net)`
+    after every change, with -1 for the index that does not apply to the event.
+    """
+
+    # Gate type codes
+    GATE_TYPES = ("and", "or", "xor", "nand", "nor", "xnor", "not")
+    REMOVED = 255
+
+    # Net kinds
+    WIRE, INPUT, OUTPUT = range(3)
+
+    # Change events passed to the listeners
+    GATE_ADDED, GATE_REMOVED, NET_ADDED, INPUT_CONNECTED, OUTPUT_CONNECTED = range(5)
+
+    # ========== Private Functions ==========
+    def __notify(self, event: int, gate: int, net: int) -> None:
+        for listener in self.listeners:
+            listener(event, gate, net)
+
+    def __build_fanout(self) -> None:
+        """Builds the CSR fanout of every net: net n is read by pins offsets[n] to offsets[n + 1]"""
+        counts = array('q', bytes(8 * (len(self.nets) + 1)))
+        for pins in (self.gate_in1, self.gate_in2):
+            for gate, net in enumerate(pins):
+                if net >= 0 and self.gate_types[gate] != Netlist.REMOVED:
+                    counts[net + 1] += 1
+
+        for net in range(len(self.nets)):
+            counts[net + 1] += counts[net]
+
+        fill = array('q', counts)
+        gates = array('q', bytes(8 * counts[-1]))
+        pins = array('B', bytes(counts[-1]))
+
+        # Visit the gates in order, so each net lists its readers by gate index
+        for gate in range(len(self.gates)):
+            if self.gate_types[gate] == Netlist.REMOVED:
+                continue
+            for pin, net in ((1, self.gate_in1[gate]), (2, self.gate_in2[gate])):
+                if net >= 0:
+                    gates[fill[net]] = gate
+                    pins[fill[net]] = pin
+                    fill[net] += 1
+
+        self.__fanout = (counts, gates, pins)
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        # Gate arrays
+        self.gate_ids: array = array('q')
+        self.gate_types: array = array('B')
+        self.gate_in1: array = array('q')      # Net index of input 1, -1 if disconnected
+        self.gate_in2: array = array('q')      # Net index of input 2, -1 if disconnected
+        self.gate_out: array = array('q')      # First net driven by the gate, -1 if none
+        self.gate_last_output: array = array('q')     # Newest output connection of the gate, -1 if none
+        self.gates: list[Gate] = []
+
+        # Net arrays
+        self.net_widths: array = array('I')
+        self.net_kinds: array = array('B')
+        self.net_drivers: array = array('q')   # Index of the driving gate, -1 for none or an input port
+        self.net_last_output: array = array('q')      # Newest output connection to the net, -1 if none
+        self.net_instances: dict[int, list[tuple[SubComponent, str]]] = dict()   # Instance pins on each net
+        self.nets: list[Signal] = []
+
+        # Output connections, in the order they were made: the gate and the net of each, and the
+        # previous connection of the same gate and of the same net
+        self.output_gates: array = array('q')
+        self.output_nets: array = array('q')
+        self.output_previous_of_gate: array = array('q')
+        self.output_previous_of_net: array = array('q')
+
+        self.__fanout: tuple[array, array, array] = None
+        self.revision: int = 0      # Incremented on every change to the connectivity
+        self.listeners: list[Callable[[int, int, int], None]] = []
+
+    def gate_count(self) -> int:
+        """Returns the number of gates that have not been removed"""
+        return len(self.gates) - self.gate_types.count(Netlist.REMOVED)
+
+    def add_gate(self, gate: Gate) -> int:
+        """Registers a gate and returns its index"""
+        index = len(self.gates)
+        self.gate_ids.append(gate.id)
+        self.gate_types.append(Netlist.GATE_TYPES.index(gate.vhdl_op))
+        self.gate_in1.append(-1)
+        self.gate_in2.append(-1)
+        self.gate_out.append(-1)
+        self.gate_last_output.append(-1)
+        self.gates.append(gate)
+
+        gate.netlist, gate.index = self, index
+        self.__fanout = None
+        self.revision += 1
+        self.__notify(Netlist.GATE_ADDED, index, -1)
+        return index
+
+    def remove_gate(self, index: int) -> None:
+        """Marks a gate as removed. Its index is not reused."""
+        self.gate_types[index] = Netlist.REMOVED
+        for net in self.outputs(index):
+            if self.net_drivers[net] == index:
+                drivers = self.drivers(net)
+                self.net_drivers[net] = drivers[-1] if drivers else -1
+
+        self.gates[index].netlist = None
+        self.gates[index] = None
+        self.__fanout = None
+        self.revision += 1
+        self.__notify(Netlist.GATE_REMOVED, index, -1)
+
+    def add_net(self, signal: Signal, kind: int) -> int:
+        """Registers a wire or an I/O port and returns its index"""
+        index = len(self.nets)
+        self.net_widths.append(signal.bit_size)
+        self.net_kinds.append(kind)
+        self.net_drivers.append(-1)
+        self.net_last_output.append(-1)
+        self.nets.append(signal)
+
+        signal.netlist, signal.index = self, index
+        self.__fanout = None
+        self.revision += 1
+        self.__notify(Netlist.NET_ADDED, -1, index)
+        return index
+
+    def connect_input(self, gate: int, pin: int, net: int) -> None:
+        """Connects input pin 1 or 2 of a gate to a net"""
+        (self.gate_in1 if pin == 1 else self.gate_in2)[gate] = net
+        self.__fanout = None
+        self.revision += 1
+        self.__notify(Netlist.INPUT_CONNECTED, gate, net)
+
+    def connect_output(self, gate: int, net: int) -> None:
+        """Makes a gate the driver of a net"""
+        connection = len(self.output_gates)
+        self.output_gates.append(gate)
+        self.output_nets.append(net)
+        self.output_previous_of_gate.append(self.gate_last_output[gate])
+        self.output_previous_of_net.append(self.net_last_output[net])
+        self.gate_last_output[gate] = connection
+        self.net_last_output[net] = connection
+
+        self.net_drivers[net] = gate
+        if self.gate_out[gate] < 0:
+            self.gate_out[gate] = net
+        self.revision += 1
+        self.__notify(Netlist.OUTPUT_CONNECTED, gate, net)
+
+    def connect_instance(self, net: int, instance: SubComponent, port: str) -> None:
+        """Records that a pin of a sub-component instance is connected to a net"""
+        self.net_instances.setdefault(net, []).append((instance, port))
+
+    def outputs(self, gate: int) -> list[int]:
+        """Returns the nets driven by a gate, in the order they were connected"""
+        nets = []
+        connection = self.gate_last_output[gate]
+        while connection >= 0:
+            nets.append(self.output_nets[connection])
+            connection = self.output_previous_of_gate[connection]
+
+        nets.reverse()
+        return nets
+
+    def drivers(self, net: int) -> list[int]:
+        """Returns the gates driving a net that have not been removed, in the order they were connected"""
+        gates = []
+        connection = self.net_last_output[net]
+        while connection >= 0:
+            if self.gate_types[self.output_gates[connection]] != Netlist.REMOVED:
+                gates.append(self.output_gates[connection])
+            connection = self.output_previous_of_net[connection]
+
+        gates.reverse()
+        return gates
+
+    def readers(self, net: int) -> list[tuple[int, int]]:
+        """Returns the gate index and pin number (1 or 2) of every gate input reading a net"""
+        offsets, gates, pins = self.fanout()
+        return [(gates[reader], pins[reader]) for reader in range(offsets[net], offsets[net + 1])]
+
+    def fanout(self) -> tuple[array, array, array]:
+        """
+        Returns the fanout of every net in CSR form.
+
+        Returns:
+            tuple[array, array, array]: The offsets (one per net, plus one), and for each reading
+                pin the index of its gate and the pin number (1 or 2).
+        """
+        if self.__fanout is None:
+            self.__build_fanout()
+
+        return self.__fanout
+
+    def live_gates(self) -> list[int]:
+        """Returns the indices of the gates that have not been removed"""
+        return [gate for gate, type_ in enumerate(self.gate_types) if type_ != Netlist.REMOVED]
+
+    def gate_fanout(self) -> list[list[int]]:
+        """Returns, for every gate, the indices of the gates reading any of the nets it drives"""
+        offsets, readers, _ = self.fanout()
+        successors = [[] for _ in self.gates]
+
+        for net, driver in enumerate(self.net_drivers):
+            if driver >= 0:
+                successors[driver].extend(readers[offsets[net]:offsets[net + 1]])
+
+        return successors
+
+    def levelize(self) -> tuple[list[int], list[int]]:
+        """
+        Orders the gates so that every gate comes after the gates driving its inputs (Kahn's algorithm).
+
+        Returns:
+            tuple[list[int], list[int]]: The ordered gate indices, and the indices of the gates that
+                could not be ordered because they are on, or fed by, a feedback loop.
+        """
+        live = self.live_gates()
+        pending = [0] * len(self.gates)
+
+        for gate in live:
+            for net in (self.gate_in1[gate], self.gate_in2[gate]):
+                if net >= 0 and self.net_drivers[net] >= 0:
+                    pending[gate] += 1
+
+        successors = self.gate_fanout()
+        ordered = [gate for gate in live if pending[gate] == 0]
+        for gate in ordered:
+            for successor in successors[gate]:
+                pending[successor] -= 1
+                if pending[successor] == 0:
+                    ordered.append(successor)
+
+        return ordered, [gate for gate in live if pending[gate] > 0]
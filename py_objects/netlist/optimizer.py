@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+from py_objects.netlist.netlist import Netlist
+from py_objects.components.bulk_loader import BulkLoader
+from exceptions.illegal_operation_exception import IllegalOperationException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+
+class OptimizationReport:
+    """What an optimization pass did to a component"""
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.gates_before: int = 0
+        self.gates_after: int = 0
+        self.merged: int = 0            # Gates identical to an earlier gate
+        self.folded: int = 0            # Gates reduced to a constant or to one of their inputs
+        self.inverter_pairs: int = 0    # NOT gates cancelling a NOT gate
+        self.dead: int = 0              # Gates whose output never reaches an output port, and were swept
+
+    def __str__(self):
+        return (f"{self.name}: {self.gates_before} -> {self.gates_after} gates "
+                f"({self.merged} merged, {self.folded} folded, {self.inverter_pairs} inverter pairs, {self.dead} dead)")
+
+    def __repr__(self):
+        return str(self)
+
+
+class Optimizer:
+    """
+    Logic optimizer working on the netlist arrays of a component.
+
+    The combinational gates are visited in level order and rebuilt as nodes of a structurally
+    hashed graph: a gate with the same type and inputs as an earlier one is merged into it,
+    constants are folded through the gates (e.g. `x xor x`, `x and not x`, `0 or x`), and a NOT
+    of a NOT is replaced by the original signal. Gates on or fed by feedback loops, such as the
+    ones of a latch, are kept as they are. Finally, only the gates that reach an output port
+    are written to a new component, so the original is never modified.
+
+    The gate library has no constant sources, so a constant that reaches an output port or a
+    kept gate is built as `a xor a` or `a xnor a` from the first input port, and an output port
+    that ends up equal to an input port is driven through `a and a`.
+    """
+
+    # Node operations: the netlist gate types, followed by the primary inputs
+    AND, OR, XOR, NAND, NOR, XNOR, NOT = range(7)
+    INPUT = 7
+
+    # Constant values, which are never nodes (-1 is a missing operand)
+    ZERO, ONE = -2, -3
+
+    # Truth functions of the binary operations
+    EVALUATE = {
+        AND: lambda a, b: a and b,
+        OR: lambda a, b: a or b,
+        XOR: lambda a, b: a != b,
+        NAND: lambda a, b: not (a and b),
+        NOR: lambda a, b: not (a or b),
+        XNOR: lambda a, b: a == b,
+    }
+
+    # ========== Private Functions ==========
+    def __node(self, op: int, a: int = -1, b: int = -1, origin: int = -1) -> int:
+        """Adds a node without hashing it"""
+        self.__op.append(op)
+        self.__a.append(a)
+        self.__b.append(b)
+        self.__origin.append(origin)
+        return len(self.__op) - 1
+
+    def __not(self, a: int, origin: int) -> int:
+        """Returns NOT a, cancelling double inversions"""
+        if a == Optimizer.ZERO or a == Optimizer.ONE:
+            return Optimizer.ONE if a == Optimizer.ZERO else Optimizer.ZERO
+
+        if self.__op[a] == Optimizer.NOT:
+            self.report.inverter_pairs += 1
+            return self.__a[a]
+
+        return self.__hashed(Optimizer.NOT, a, -1, origin)
+
+    def __complements(self, a: int, b: int) -> bool:
+        """Whether one node is the NOT of the other"""
+        return ((self.__op[a] == Optimizer.NOT and self.__a[a] == b) or
+                (self.__op[b] == Optimizer.NOT and self.__a[b] == a))
+
+    def __hashed(self, op: int, a: int, b: int, origin: int) -> int:
+        """Returns the node computing op(a, b), reusing an identical node if there is one"""
+        key = (op, b, a) if b != -1 and b < a else (op, a, b)
+        node = self.__table.get(key)
+        if node is not None:
+            self.report.merged += 1
+            return node
+
+        node = self.__node(op, *key[1:], origin)
+        self.__table[key] = node
+        return node
+
+    def __binary(self, op: int, a: int, b: int, origin: int) -> int:
+        """Returns the node or constant computing op(a, b), after folding constants and identities"""
+        ZERO, ONE = Optimizer.ZERO, Optimizer.ONE
+        inverted = op in (Optimizer.NAND, Optimizer.NOR, Optimizer.XNOR)
+
+        # Constant inputs
+        if a < 0 and b < 0:
+            value = Optimizer.EVALUATE[op](a == ONE, b == ONE)
+            return ONE if value else ZERO
+
+        if a < 0 or b < 0:
+            constant, x = (a, b) if a < 0 else (b, a)
+            bit = constant == ONE
+            if op in (Optimizer.AND, Optimizer.NAND):
+                result = x if bit else ZERO
+            elif op in (Optimizer.OR, Optimizer.NOR):
+                result = ONE if bit else x
+            else:
+                result = self.__not(x, origin) if bit else x
+
+            self.report.folded += 1
+            return self.__not(result, origin) if inverted else result
+
+        # Equal or complementary inputs
+        if a == b:
+            self.report.folded += 1
+            result = ZERO if op in (Optimizer.XOR, Optimizer.XNOR) else a
+            return self.__not(result, origin) if inverted else result
+
+        if self.__complements(a, b):
+            self.report.folded += 1
+            result = ZERO if op in (Optimizer.AND, Optimizer.NAND) else ONE
+            return self.__not(result, origin) if inverted else result
+
+        return self.__hashed(op, a, b, origin)
+
+    def __value(self, net: int) -> int:
+        """Returns the node or constant carried by a net"""
+        value = self.__values[net]
+        if value is None:
+            raise IllegalOperationException(
+                f"Signal '{self.__netlist.nets[net].name}' is not driven by any gate or input port."
+            )
+        return value
+
+    def __constant(self, value: int) -> int:
+        """Builds a constant out of the first input port, as the gate library has no constant sources"""
+        if value not in self.__constant_nodes:
+            if not self.__inputs:
+                raise IllegalOperationException(
+                    f"'{self.__component.name}' needs a constant {int(value == Optimizer.ONE)}, "
+                    "but it has no input port to build it from."
+                )
+            op = Optimizer.XNOR if value == Optimizer.ONE else Optimizer.XOR
+            self.__constant_nodes[value] = self.__node(op, self.__inputs[0], self.__inputs[0])
+
+        return self.__constant_nodes[value]
+
+    def __rebuild(self) -> None:
+        """Builds the node graph from the netlist"""
+        netlist = self.__netlist
+        ordered, looped = netlist.levelize()
+
+        # Primary inputs
+        for net, kind in enumerate(netlist.net_kinds):
+            if kind == Netlist.INPUT:
+                self.__values[net] = self.__node(Optimizer.INPUT, origin=net)
+                self.__inputs.append(self.__values[net])
+
+        # Gates on or after a loop keep a node of their own, whose inputs are filled in at the end
+        for gate in looped:
+            self.__gate_nodes[gate] = self.__node(netlist.gate_types[gate], origin=gate)
+
+        def drive(gate: int, value: int) -> None:
+            """Sets the value of every net driven by a gate"""
+            for net in netlist.outputs(gate):
+                self.__values[net] = value
+
+        for gate in looped:
+            drive(gate, self.__gate_nodes[gate])
+
+        for gate in ordered:
+            op, in1, in2 = netlist.gate_types[gate], netlist.gate_in1[gate], netlist.gate_in2[gate]
+            if in1 < 0 or (in2 < 0 and op != Optimizer.NOT):
+                raise IllegalOperationException(f"One or more inputs are disconnected in gate {netlist.gates[gate]}.")
+
+            if op == Optimizer.NOT:
+                value = self.__not(self.__value(in1), gate)
+            else:
+                value = self.__binary(op, self.__value(in1), self.__value(in2), gate)
+
+            self.__gate_nodes[gate] = value
+            drive(gate, value)
+
+        for gate in looped:
+            node = self.__gate_nodes[gate]
+            in1, in2 = netlist.gate_in1[gate], netlist.gate_in2[gate]
+            if in1 < 0 or (in2 < 0 and self.__op[node] != Optimizer.NOT):
+                raise IllegalOperationException(f"One or more inputs are disconnected in gate {netlist.gates[gate]}.")
+
+            self.__a[node] = self.__value(in1)
+            self.__b[node] = self.__value(in2) if in2 >= 0 else -1
+
+    def __emit(self) -> dict:
+        """Writes the nodes reaching an output port in the form written by `Component.export_dict`"""
+        netlist = self.__netlist
+        ports = self.__component.io_ports.list_items()
+
+        # Output port drivers: constants and input ports need a gate in front of them
+        drivers = dict()
+        for port in ports:
+            if not port.is_input and netlist.net_drivers[port.index] >= 0:
+                value = self.__value(port.index)
+                if value < 0:
+                    value = self.__constant(value)
+                elif self.__op[value] == Optimizer.INPUT:
+                    value = self.__node(Optimizer.AND, value, value)
+                drivers[port.name] = value
+
+        # Dead-cone sweep, replacing constant operands of kept gates on the way
+        live: set[int] = set()
+        stack = list(drivers.values())
+        while stack:
+            node = stack.pop()
+            if node in live:
+                continue
+            live.add(node)
+
+            for operands in (self.__a, self.__b):
+                operand = operands[node]
+                if operand == -1:
+                    continue
+                if operand < 0:
+                    operand = operands[node] = self.__constant(operand)
+                stack.append(operand)
+
+        # Gates, numbered in node order
+        gate_ids = dict()
+        positions = {gate.index: gate.pos() for gate in self.__component.gates.list_items()}
+        for node, op in enumerate(self.__op):
+            if op == Optimizer.INPUT:
+                continue
+            if node in live:
+                gate_ids[node] = len(gate_ids) + 1
+            else:
+                self.report.dead += 1
+        self.report.gates_after = len(gate_ids)
+
+        # Readers of every node
+        readers: dict[int, list[list[int | str]]] = dict()
+        for node, id_ in gate_ids.items():
+            readers.setdefault(self.__a[node], []).append([id_, "in1"])
+            if self.__op[node] != Optimizer.NOT:
+                readers.setdefault(self.__b[node], []).append([id_, "in2"])
+
+        # Wires keep the name of the first wire that carried their node
+        names = dict()
+        for net, signal in enumerate(netlist.nets):
+            value = self.__values[net]
+            if netlist.net_kinds[net] == Netlist.WIRE and value is not None and value >= 0 and value not in names:
+                names[value] = signal.name
+
+        taken = set(self.__component.connections.wires) | set(self.__component.io_ports.ports)
+        connections = []
+        for node, id_ in gate_ids.items():
+            if node not in readers:
+                continue
+
+            name = names.get(node)
+            if name is None:
+                name = f"n{node}"
+                while name in taken:
+                    name += "_"
+                taken.add(name)
+
+            connections.append({
+                "__class__": "Wire", "name": name, "bit_size": 1,
+                "src_key": id_, "src_port": "out", "dests": readers[node]
+            })
+
+        io_ports = []
+        for port in ports:
+            x, y = port.pos()
+            if port.is_input:
+                dests = readers.get(self.__values[port.index], [])
+            else:
+                dests = [[gate_ids[drivers[port.name]], "out"]] if port.name in drivers else []
+
+            io_ports.append({
+                "__class__": "IOPort", "name": port.name, "bit_size": port.bit_size,
+                "dests": dests, "is_input": port.is_input, "scene_x": x, "scene_y": y
+            })
+
+        gates = []
+        for node, id_ in gate_ids.items():
+            x, y = positions.get(self.__origin[node], (20, 20))
+            gates.append({
+                "__class__": "Gate", "id": id_, "type": Netlist.GATE_TYPES[self.__op[node]].upper(),
+                "scene_x": x, "scene_y": y
+            })
+
+        return {
+            "__class__": "Component",
+            "name": self.__component.name,
+            "architecture": self.__component.architecture,
+            "gates": gates,
+            "connections": connections,
+            "io_ports": io_ports
+        }
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component) -> None:
+        """
+        Args:
+            component (Component): A flat component, which is left unchanged.
+        """
+        if len(component.sub_components):
+            raise IllegalOperationException(f"'{component.name}' has sub-components. Flatten it before optimizing.")
+
+        self.__component = component
+        self.__netlist = component.netlist
+        self.report: OptimizationReport = OptimizationReport(component.name)
+
+        # Nodes, as parallel arrays
+        self.__op: list[int] = []
+        self.__a: list[int] = []
+        self.__b: list[int] = []
+        self.__origin: list[int] = []     # Gate (or input net) the node was created for
+
+        self.__table: dict[tuple[int, int, int], int] = dict()
+        self.__values: list[int | None] = [None] * len(self.__netlist.nets)     # Node or constant of every net
+        self.__gate_nodes: dict[int, int] = dict()
+        self.__inputs: list[int] = []
+        self.__constant_nodes: dict[int, int] = dict()
+
+    def optimize(self) -> Component:
+        """
+        Builds the optimized component. The counts of what was done are kept in `report`.
+
+        Returns:
+            Component: A new component with the same ports and the same behaviour.
+        """
+        self.report.gates_before = self.__netlist.gate_count()
+        self.__rebuild()
+        return BulkLoader().load(self.__emit())
@@ -1,8 +1,6 @@
 from __future__ import annotations
 from exceptions.illegal_operation_exception import IllegalOperationException
 from py_objects.signals.signal import Signal
-from graphics.io_port_graphics import IOPortGraphics
-from PyQt6.QtWidgets import QGraphicsScene
 
 from exceptions.bitsizemismatch_exception import BitSizeMismatchException
 from exceptions.object_existence_exception import ObjectExistsException
@@ -12,6 +10,8 @@ from typing import TYPE_CHECKING
 from py_objects.signals.wire import Wire
 
 if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QGraphicsScene
+    from graphics.io_port_graphics import IOPortGraphics
     from py_objects.gates.gate import Gate
     from py_objects.components.component import Component
 
@@ -25,10 +25,13 @@ class IOPortAbstract:
     sub-components into higher-level designs. It provides methods to generate VHDL code,
     connect to other components, and manage graphical representation.
     """
-    def __init__(self, name: str, size: int, is_input: bool) -> None:
+    __slots__ = ("name", "bit_size", "is_input", "direction", "mapped_wire", "mapped_port")
+
+    def __init__(self, name: str, size: int, is_input: bool, direction: str = None) -> None:
         self.name: str = name
         self.bit_size: int = size
         self.is_input: bool = is_input
+        self.direction: str = direction or ("in" if is_input else "out")     # VHDL mode, e.g. 'inout'
         self.mapped_wire: Wire = None
         self.mapped_port: IOPort = None
 
@@ -43,41 +46,33 @@ class IOPortAbstract:
         return str(self)
     
     def __eq__(self, other):
-        self.name == other.name and self.bit_size == other.bit_size
+        return self.name == other.name and self.bit_size == other.bit_size
     
-    def connect(self, signal: Wire | IOPort | IOPortAbstract) -> None:
+    def connect(self, signal: Wire | IOPort) -> None:
         """
-        Connects the I/O port to a signal or another I/O port.
+        Maps the I/O port to a wire or to an I/O port of the enclosing component.
 
         Args:
             signal (Wire | IOPort): The signal or I/O port to connect to.
         """
         # 1. Make sure that the bit size of the signal matches the port
         if signal.bit_size != self.bit_size:
-                raise BitSizeMismatchException("Bit size mismatch")
-        
-        # 2. Only one signal can be connected to an input port
-        if self.is_input:       
-            if signal.mapped_port is not None or signal.mapped_wire is not None:
-                raise IllegalOperationException("Input port already connected")
+            raise BitSizeMismatchException("Bit size mismatch")
         
-        # For wires, check if the signal is already connected to another port
+        # 2. Only one signal can be mapped to a port
+        mapped = self.mapped_wire if self.mapped_wire is not None else self.mapped_port
+        if mapped is not None:
+            if mapped is signal:
+                return
+            raise IllegalOperationException(f"Port '{self.name}' is already mapped to '{mapped.name}'.")
+
         if isinstance(signal, Wire):
-            # 3. Same wire should be connected to the same port
-            if self.mapped_wire != signal:
-                raise IllegalOperationException("Another wire is already connected. Please use the same wire.")
-            
-            if self.mapped_wire is None:
-                self.mapped_wire = signal
+            self.mapped_wire = signal
 
-        elif isinstance(signal, (IOPort, IOPortAbstract)):
-            # 4. Check if the signal is connecting to the same type of port
-            if not (self.mapped_port.is_input ^ signal.is_input):
-                raise IllegalOperationException("Cannot connect input to input or output to output")
-            
-            # 5. Check if the signal is already connected to another port
-            if signal.mapped_port is not None:
-                raise IllegalOperationException("Another port is already connected")
+        elif isinstance(signal, IOPort):
+            # 3. An output of the sub-component cannot drive an input of the enclosing component
+            if signal.is_input and not self.is_input:
+                raise IllegalOperationException(f"Output port '{self.name}' cannot drive input port '{signal.name}'.")
             
             self.mapped_port = signal
 
@@ -89,15 +84,17 @@ class IOPort(Signal):
         last_bit = self.bit_size - 1
         return f"{self.name.upper()}[{last_bit}:0]"
     
-    def __init__(self, name: str, size: int, is_input: bool, x: float=20, y: float=20) -> None:
+    # Constants
+    SIZE = 40      # Vector object size
 
-        # Constants
-        SIZE = 40      # Vector object size
+    __slots__ = ("is_input", "scene_x", "scene_y", "vector_item")
 
+    def __init__(self, name: str, size: int, is_input: bool, x: float=20, y: float=20) -> None:
         super().__init__(name, size)
         self.is_input: bool = is_input
-        self.vector_item = IOPortGraphics(self.__generate_label(), is_input, SIZE)
-        self.vector_item.setPos(x, y)
+        self.scene_x: float = float(x)
+        self.scene_y: float = float(y)
+        self.vector_item: IOPortGraphics = None     # Created when the port is drawn
 
     def __str__(self):
         """Generates a line of VHDL code for the I/O Port"""
@@ -106,8 +103,28 @@ class IOPort(Signal):
     
     def draw_port(self, scene: QGraphicsScene) -> None:
         """Draws a diagram of the I/O"""
+        # Import here, so that the model can be used without Qt
+        from graphics.io_port_graphics import IOPortGraphics
+
+        if self.vector_item is None:
+            self.vector_item = IOPortGraphics(self.__generate_label(), self.is_input, IOPort.SIZE)
+            self.vector_item.setPos(self.scene_x, self.scene_y)
+
         scene.addItem(self.vector_item)
 
+    def setPos(self, x: float, y: float) -> None:
+        self.scene_x, self.scene_y = float(x), float(y)
+
+        if self.vector_item is not None:
+            self.vector_item.setPos(x, y)
+
+    def pos(self) -> tuple[float, float]:
+        # The graphics item is the source of truth once the port has been drawn and moved around
+        if self.vector_item is not None:
+            self.scene_x, self.scene_y = self.vector_item.pos().x(), self.vector_item.pos().y()
+
+        return self.scene_x, self.scene_y
+
     def connect(self, dest: Gate | Component, dest_port: str):
         """Connects the input to a port"""
         return super().connect(self, "out", dest, dest_port)
@@ -124,8 +141,8 @@ class IOPort(Signal):
         main_dict.update({
             "__class__": "IOPort",
             "is_input": self.is_input,
-            "scene_x": self.vector_item.pos().x(),
-            "scene_y": self.vector_item.pos().y()
+            "scene_x": self.pos()[0],
+            "scene_y": self.pos()[1]
         })
         main_dict.pop("src_key")
         main_dict.pop("src_port")
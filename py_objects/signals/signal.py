@@ -1,15 +1,18 @@
 from __future__ import annotations
-from PyQt6.QtWidgets import QGraphicsScene
-from graphics.connector import Connector
 from py_objects.gates.gate import Gate
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QGraphicsScene
+    from graphics.connector import Connector
+    from py_objects.netlist.netlist import Netlist
     from py_objects.components.component import Component
 
 class Signal:
 
+    __slots__ = ("name", "bit_size", "src", "src_port", "connectors", "netlist", "index")
+
     def _size_to_vhdl(self):
         if self.bit_size > 1:
             return f"std_logic_vector({self.bit_size - 1} downto 0)" 
@@ -22,9 +25,13 @@ class Signal:
         self.bit_size = size
         self.src: Gate | Component | None = None
         self.src_port: str = None
-        self.dests: list[tuple[str, Gate | Component]] = []
         self.connectors: list[Connector] = []
 
+        # Position in the netlist store, set when the signal is registered by the DAO. The
+        # destinations of the signal are kept there, and read back by `dests`
+        self.netlist: Netlist = None
+        self.index: int = -1
+
     def __str__(self):
         """Generates a line of VHDL code for the wire"""
         return f"undefined signal of length {self.bit_size}"
@@ -34,13 +41,29 @@ class Signal:
 
     def __repr__(self):
         return str(self)
+
+    @property
+    def dests(self) -> list[tuple[Gate | Component, str]]:
+        """
+        The destinations of the signal: the gates driving it other than its source (as with an
+        output port, which is its own source), then the gate inputs reading it, then the ports
+        of sub-component instances mapped to it.
+        """
+        netlist = self.netlist
+        if netlist is None:
+            return []
+
+        dests = [(netlist.gates[gate], "out") for gate in netlist.drivers(self.index) if netlist.gates[gate] is not self.src]
+        dests.extend((netlist.gates[gate], f"in{pin}") for gate, pin in netlist.readers(self.index))
+        dests.extend(netlist.net_instances.get(self.index, []))
+        return dests
     
     def __connect_src(self, src: Component | Gate, port_name: str) -> None:
         """
         Connects the wire to the source component
         """
         if self.src is not None and self.src != src:
-            raise ValueError(f"Source already connected to {self.src.name} on port {self.src_port}")
+            raise ValueError(f"Source already connected to {self.src} on port {self.src_port}")
         
         if isinstance(src, Gate):
             if self.bit_size != 1:
@@ -48,8 +71,9 @@ class Signal:
         
         if isinstance(src, Gate):
             src.connect(self, port_name)
-
-        
+        elif src is not self:
+            # Output of a sub-component (I/O ports are their own source)
+            src.connect(self, port_name)
         
         self.src = src
         self.src_port = port_name
@@ -63,8 +87,10 @@ class Signal:
                 raise ValueError("Gates are compatible with single-bit wires/signals")
             
         
-        dest.connect(self, port_name)        
-        self.dests.append((dest, port_name))
+        # Gates record the connection in the netlist themselves
+        dest.connect(self, port_name)
+        if not isinstance(dest, Gate):
+            self.netlist.connect_instance(self.index, dest, port_name)
 
     def connect(self, src: Gate | Component, src_port: str, dest: Gate | Component, dest_port: str) -> None:
         
@@ -74,24 +100,32 @@ class Signal:
     def draw(self, scene: QGraphicsScene) -> None:
         # Draws a line connector to the scene
         for dest, dest_port in self.dests:
-            connector = Connector(self.src.vector_item, self.src_port, dest.vector_item, dest_port)
+            self.draw_connection(scene, dest, dest_port)
+
+    def draw_connection(self, scene: QGraphicsScene, dest: Gate | Component, dest_port: str) -> None:
+        """Draws the connector to one of the destinations. Both ends must have been drawn."""
+        # Import here, so that the model can be used without Qt
+        from graphics.connector import Connector
 
-            # Attach connector to gates so they notify it when moved
-            self.src.vector_item.add_connector(connector, self.src_port)
-            dest.vector_item.add_connector(connector, dest_port)
-            self.connectors.append(connector)
+        connector = Connector(self.src.vector_item, self.src_port, dest.vector_item, dest_port)
 
-            # Show it to scene
-            scene.addItem(connector)
+        # Attach connector to gates so they notify it when moved
+        self.src.vector_item.add_connector(connector, self.src_port)
+        dest.vector_item.add_connector(connector, dest_port)
+        self.connectors.append(connector)
+
+        # Show it to scene
+        scene.addItem(connector)
 
     def export_dict(self) -> dict:
-        # Retrieve the key of the source
+        # Import here to avoid circular import
+        from py_objects.components.sub_component import SubComponent
+
+        # Retrieve the key of the source: gates by ID, sub-components by label
         if isinstance(self.src, Gate):
             src_key = self.src.id
-        
-        # elif isinstance(self.src, Component):
-        # TODO: Make another 'if' condition for the subcomponent
-
+        elif isinstance(self.src, SubComponent):
+            src_key = self.src.label
         else:
             src_key = None
 
@@ -100,9 +134,8 @@ class Signal:
         for comp, dest_port in self.dests:
             if isinstance(comp, Gate):
                 dest_keys.append((comp.id, dest_port))
-
-            # elif isinstance(self.src, Component):
-            # TODO: Make another 'if' condition for the subcomponent
+            elif isinstance(comp, SubComponent):
+                dest_keys.append((comp.label, dest_port))
         
         return {
             "__class__": "Signal",
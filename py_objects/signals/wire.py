@@ -1,6 +1,8 @@
 from py_objects.signals.signal import Signal
 
 class Wire(Signal):
+
+    __slots__ = ()
     
     def __init__(self, name: str, size: int):
         """Wire Constructor"""
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from exceptions.illegal_operation_exception import IllegalOperationException
+from exceptions.bitsizemismatch_exception import BitSizeMismatchException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+
+
+class CompiledSimulator:
+    """
+    Bit-parallel, levelized simulator for combinational components.
+
+    The netlist of a component is compiled once into flat index arrays, ordered by logic
+    level, so that every gate is evaluated exactly once per pass. Each net holds a packed word
+    (a Python integer) where bit i is the value of that net for stimulus vector i. One pass
+    therefore evaluates as many input vectors as there are bits in the words.
+    """
+
+    # Operation codes, in the same order as the netlist gate types
+    AND, OR, XOR, NAND, NOR, XNOR, NOT = range(7)
+    OPCODES = {"and": AND, "or": OR, "xor": XOR, "nand": NAND, "nor": NOR, "xnor": XNOR, "not": NOT}
+
+    # ========== Private Functions ==========
+    def __compile(self, component: Component) -> None:
+        """Flattens the netlist of the component into levelized index arrays"""
+        netlist = component.netlist
+        values = [-1] * len(netlist.nets)     # Value slot of every net
+
+        for port in component.io_ports.list_items():
+            if port.bit_size != 1:
+                raise BitSizeMismatchException(
+                    f"Port '{port.name}' is {port.bit_size} bits wide. Only single-bit ports can be simulated."
+                )
+
+            if port.is_input:
+                values[port.index] = len(self.input_names)
+                self.input_names.append(port.name)
+            else:
+                self.output_names.append(port.name)
+
+        ordered, looped = netlist.levelize()
+        if looped:
+            raise IllegalOperationException(
+                f"The component contains a feedback loop through {', '.join(str(netlist.gates[gate]) for gate in looped)}, "
+                "so it cannot be levelized."
+            )
+
+        # Each gate drives its own value slot, numbered after the primary inputs in level order
+        gate_slots = [-1] * len(netlist.gates)
+        for i, gate in enumerate(ordered):
+            gate_slots[gate] = len(self.input_names) + i
+        for net, driver in enumerate(netlist.net_drivers):
+            if driver >= 0:
+                values[net] = gate_slots[driver]
+        self.net_count = len(self.input_names) + len(ordered)
+
+        def value(net: int) -> int:
+            """Returns the value slot of a net, which must be driven"""
+            if values[net] < 0:
+                raise IllegalOperationException(f"Signal '{netlist.nets[net].name}' is not driven by any gate or input port.")
+            return values[net]
+
+        for gate in ordered:
+            op, in1, in2 = netlist.gate_types[gate], netlist.gate_in1[gate], netlist.gate_in2[gate]
+            if in1 < 0 or (in2 < 0 and op != CompiledSimulator.NOT):
+                raise IllegalOperationException(f"One or more inputs are disconnected in gate {netlist.gates[gate]}.")
+
+            self.op.append(op)
+            self.in1.append(value(in1))
+            self.in2.append(value(in2) if in2 >= 0 else 0)
+            self.out.append(gate_slots[gate])
+
+        for name in self.output_names:
+            self.output_nets.append(value(component.io_ports.search(name).index))
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component) -> None:
+        self.input_names: list[str] = []
+        self.output_names: list[str] = []
+
+        # Flat, levelized gate arrays
+        self.op: list[int] = []
+        self.in1: list[int] = []
+        self.in2: list[int] = []
+        self.out: list[int] = []
+        self.output_nets: list[int] = []
+        self.net_count: int = 0
+
+        self.__compile(component)
+
+    def __len__(self):
+        return len(self.op)
+
+    def run_packed(self, words: list[int], width: int) -> list[int]:
+        """
+        Evaluates one pass over packed input words.
+
+        Args:
+            words (list[int]): One packed word per input port, in the order of `input_names`.
+            width (int): The number of vectors packed into each word.
+
+        Returns:
+            list[int]: One packed word per output port, in the order of `output_names`.
+        """
+        if len(words) != len(self.input_names):
+            raise ValueError(f"Expected {len(self.input_names)} input words, got {len(words)}")
+
+        mask = (1 << width) - 1
+        nets = [0] * self.net_count
+        nets[:len(words)] = [word & mask for word in words]
+
+        AND, OR, XOR, NAND, NOR, XNOR = (CompiledSimulator.AND, CompiledSimulator.OR, CompiledSimulator.XOR,
+                                         CompiledSimulator.NAND, CompiledSimulator.NOR, CompiledSimulator.XNOR)
+
+        for op, a, b, o in zip(self.op, self.in1, self.in2, self.out):
+            if op == NAND: nets[o] = (nets[a] & nets[b]) ^ mask
+            elif op == AND: nets[o] = nets[a] & nets[b]
+            elif op == OR: nets[o] = nets[a] | nets[b]
+            elif op == XOR: nets[o] = nets[a] ^ nets[b]
+            elif op == NOR: nets[o] = (nets[a] | nets[b]) ^ mask
+            elif op == XNOR: nets[o] = nets[a] ^ nets[b] ^ mask
+            else: nets[o] = nets[a] ^ mask
+
+        return [nets[net] for net in self.output_nets]
+
+    def pack(self, vectors: list[dict[str, int]]) -> list[int]:
+        """Packs a list of stimulus vectors into one word per input port"""
+        words = []
+        for name in self.input_names:
+            bits = "".join("1" if vector[name] else "0" for vector in reversed(vectors))
+            words.append(int(bits, 2) if bits else 0)
+
+        return words
+
+    def unpack(self, words: list[int], width: int) -> list[dict[str, int]]:
+        """Unpacks one word per output port into a list of output vectors"""
+        columns = [format(word, f"0{width}b")[::-1] if width else "" for word in words]
+        return [
+            {name: int(column[i]) for name, column in zip(self.output_names, columns)}
+            for i in range(width)
+        ]
+
+    def simulate(self, vectors: list[dict[str, int]]) -> list[dict[str, int]]:
+        """
+        Simulates the component for every stimulus vector in a single bit-parallel pass.
+
+        Args:
+            vectors (list[dict[str, int]]): Input port values (0 or 1) keyed by port name.
+
+        Returns:
+            list[dict[str, int]]: Output port values keyed by port name, one per input vector.
+        """
+        width = len(vectors)
+        return self.unpack(self.run_packed(self.pack(vectors), width), width)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+from py_objects.gates.gate import Gate
+from py_objects.simulation.helper import signal_driver
+
+from exceptions.illegal_operation_exception import IllegalOperationException
+from exceptions.bitsizemismatch_exception import BitSizeMismatchException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.components.component import Component
+    from py_objects.signals.signal import Signal
+
+
+class StimulusResult:
+    """The outcome of applying one stimulus vector to an event-driven simulation"""
+
+    def __init__(self, outputs: dict[str, int], settle_time: int | None, events: int, deltas: int) -> None:
+        self.outputs: dict[str, int] = outputs
+        self.settle_time: int | None = settle_time     # None if the circuit kept oscillating
+        self.events: int = events
+        self.deltas: int = deltas
+
+    def __str__(self):
+        settle = "oscillating" if self.oscillating else f"settled after {self.settle_time}"
+        return f"{self.outputs} ({settle}, {self.events} events)"
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def oscillating(self) -> bool:
+        return self.settle_time is None
+
+
+class EventDrivenSimulator:
+    """
+    Event-driven simulator with a timing wheel and delta cycles.
+
+    Unlike the compiled simulator, this one keeps its state between stimuli and tolerates
+    feedback loops, so sequential circuits such as latches can be simulated. Only the gates
+    whose inputs changed are re-evaluated, and each event visits the fanout of a single net,
+    which is precomputed from the `Signal.src`/`Signal.dests` graph.
+    """
+
+    # Gate evaluation functions, keyed by VHDL operator
+    OPERATIONS = {
+        "and": lambda a, b: a & b,
+        "or": lambda a, b: a | b,
+        "xor": lambda a, b: a ^ b,
+        "nand": lambda a, b: (a & b) ^ 1,
+        "nor": lambda a, b: (a | b) ^ 1,
+        "xnor": lambda a, b: a ^ b ^ 1,
+        "not": lambda a, b: a ^ 1,
+    }
+
+    # ========== Private Functions ==========
+    def __fanout(self, signals: list[Signal], gate_nets: dict[int, int]) -> list[int]:
+        """Returns the indices of the gates reading from any of the signals"""
+        readers = []
+        for signal in signals:
+            for dest, dest_port in signal.dests:
+                if isinstance(dest, Gate) and dest_port != "out":
+                    readers.append(gate_nets[dest.id] - len(self.input_names))
+
+        return readers
+
+    def __compile(self, component: Component, delays: dict[str, int]) -> None:
+        """Builds the net, fanout and delay tables of the component"""
+        input_index = dict()
+        ports = component.io_ports.list_items()
+        gates = component.gates.list_items()
+
+        for port in ports:
+            if port.bit_size != 1:
+                raise BitSizeMismatchException(
+                    f"Port '{port.name}' is {port.bit_size} bits wide. Only single-bit ports can be simulated."
+                )
+
+            if port.is_input:
+                input_index[port.name] = len(self.input_names)
+                self.input_names.append(port.name)
+            else:
+                self.output_names.append(port.name)
+
+        # Each gate drives its own net, numbered after the primary inputs
+        gate_nets = {gate.id: len(self.input_names) + i for i, gate in enumerate(gates)}
+        self.values = [0] * (len(self.input_names) + len(gates))
+
+        for gate in gates:
+            if gate.in1 is None or (gate.in2 is None and gate.vhdl_op != "not"):
+                raise IllegalOperationException(f"One or more inputs are disconnected in gate {gate}.")
+
+            self.gate_ops.append(EventDrivenSimulator.OPERATIONS[gate.vhdl_op])
+            self.gate_in1.append(signal_driver(gate.in1, input_index, gate_nets))
+            self.gate_in2.append(signal_driver(gate.in2, input_index, gate_nets) if gate.in2 is not None else 0)
+            self.gate_delays.append(delays.get(gate.vhdl_op, 1))
+            self.fanout.append(self.__fanout(gate.out, gate_nets))
+
+        self.input_fanout = [self.__fanout([component.io_ports.search(name)], gate_nets) for name in self.input_names]
+        self.output_nets = [signal_driver(component.io_ports.search(name), input_index, gate_nets)
+                            for name in self.output_names]
+
+    def __schedule(self, time: int, net: int, value: int) -> None:
+        """Schedules a value change on a net, unless the net is already heading to that value"""
+        if self.__projected[net] == value:
+            return
+
+        self.__projected[net] = value
+        self.__wheel[time % len(self.__wheel)].append((net, value))
+        self.__pending += 1
+
+    # ========== Public Functions ==========
+    def __init__(self, component: Component, delays: dict[str, int] = None, max_iterations: int = 1000) -> None:
+        """
+        Args:
+            component (Component): The component to simulate.
+            delays (dict[str, int], optional): Propagation delay per gate type (e.g. {"nand": 2}).
+                Gates not listed have a unit delay. A delay of 0 is resolved in delta cycles.
+            max_iterations (int): The number of time steps and delta cycles a stimulus may take
+                before the circuit is considered to be oscillating.
+        """
+        self.input_names: list[str] = []
+        self.output_names: list[str] = []
+        self.max_iterations: int = max_iterations
+
+        # Gate tables, indexed by gate number
+        self.gate_ops: list = []
+        self.gate_in1: list[int] = []
+        self.gate_in2: list[int] = []
+        self.gate_delays: list[int] = []
+        self.fanout: list[list[int]] = []
+        self.input_fanout: list[list[int]] = []
+        self.output_nets: list[int] = []
+        self.values: list[int] = []
+
+        self.__compile(component, delays or dict())
+
+        # Timing wheel: one bucket per time slot, wide enough for the largest delay
+        self.__wheel: list[list[tuple[int, int]]] = [[] for _ in range(max(self.gate_delays, default=0) + 1)]
+        self.__projected: list[int] = list(self.values)
+        self.__pending: int = 0
+        self.__initialized: bool = False
+        self.time: int = 0
+
+    def outputs(self) -> dict[str, int]:
+        """Returns the current values of the output ports"""
+        return {name: self.values[net] for name, net in zip(self.output_names, self.output_nets)}
+
+    def apply(self, vector: dict[str, int]) -> StimulusResult:
+        """
+        Applies a stimulus vector and runs the simulation until the circuit settles.
+
+        Args:
+            vector (dict[str, int]): Input port values (0 or 1) keyed by port name. Ports that are
+                left out keep their previous value.
+
+        Returns:
+            StimulusResult: The output values, settle time (relative to the stimulus) and event count.
+        """
+        gate_base = len(self.input_names)
+        values, wheel = self.values, self.__wheel
+        start = self.time
+
+        for i, name in enumerate(self.input_names):
+            if name in vector:
+                self.__schedule(start, i, 1 if vector[name] else 0)
+
+        # On the first stimulus, every gate has to compute its initial value
+        triggered = set()
+        if not self.__initialized:
+            triggered.update(range(len(self.gate_ops)))
+            self.__initialized = True
+
+        events = deltas = iterations = 0
+        last_change = start
+
+        while self.__pending or triggered:
+            iterations += 1
+            if iterations > self.max_iterations:
+                break
+
+            # Apply every transaction due in the current slot; this is one delta cycle
+            slot = self.time % len(wheel)
+            transactions, wheel[slot] = wheel[slot], []
+            self.__pending -= len(transactions)
+
+            for net, value in transactions:
+                if values[net] != value:
+                    values[net] = value
+                    events += 1
+                    last_change = self.time
+                    triggered.update(self.fanout[net - gate_base] if net >= gate_base else self.input_fanout[net])
+
+            # Re-evaluate only the gates whose inputs changed
+            for gate in triggered:
+                value = self.gate_ops[gate](values[self.gate_in1[gate]], values[self.gate_in2[gate]])
+                self.__schedule(self.time + self.gate_delays[gate], gate_base + gate, value)
+            triggered = set()
+
+            # Zero-delay transactions stay in the same time step as a new delta cycle
+            if wheel[slot]:
+                deltas += 1
+            elif self.__pending:
+                self.time += 1
+
+        settle_time = last_change - start if iterations <= self.max_iterations else None
+        return StimulusResult(self.outputs(), settle_time, events, deltas)
+
+    def run(self, vectors: list[dict[str, int]]) -> list[StimulusResult]:
+        """Applies every stimulus vector in order and returns one result per vector"""
+        return [self.apply(vector) for vector in vectors]
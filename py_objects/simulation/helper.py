@@ -0,0 +1,37 @@
+from __future__ import annotations
+from py_objects.gates.gate import Gate
+
+from exceptions.illegal_operation_exception import IllegalOperationException
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from py_objects.signals.signal import Signal
+
+
+def signal_driver(signal: Signal, input_index: dict[str, int], gate_nets: dict[int, int]) -> int:
+    """
+    Returns the net index that drives a signal.
+
+    Args:
+        signal (Signal): The wire or I/O port being read.
+        input_index (dict[str, int]): Net index of every input port, keyed by port name.
+        gate_nets (dict[int, int]): Net index of every gate output, keyed by gate ID.
+
+    Returns:
+        int: The index of the driving net.
+    """
+    # Primary inputs are driven by the stimulus
+    if getattr(signal, "is_input", False):
+        return input_index[signal.name]
+
+    # Wires are driven by their source gate
+    if isinstance(signal.src, Gate):
+        return gate_nets[signal.src.id]
+
+    # Output ports are driven by the gate connected to their 'out' side
+    for dest, dest_port in signal.dests:
+        if isinstance(dest, Gate) and dest_port == "out":
+            return gate_nets[dest.id]
+
+    raise IllegalOperationException(f"Signal '{signal.name}' is not driven by any gate or input port.")
@@ -0,0 +1,266 @@
+from __future__ import annotations
+from typing import Iterator
+
+from py_objects.vhdl.tokenizer import tokenize, IDENTIFIER, NUMBER, SYMBOL
+
+# Port modes
+DIRECTIONS = ("in", "out", "inout", "buffer", "linkage")
+
+
+class EntityInterface:
+    """The name, generics and ports declared by a VHDL entity"""
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.generics: list[dict[str, str]] = []                # name, type, default
+        self.ports: list[dict[str, str | int | bool]] = []      # name, direction, bit_size, is_input
+
+    def __str__(self):
+        return f"entity {self.name}: {len(self.generics)} generics, {len(self.ports)} ports"
+
+    def __repr__(self):
+        return str(self)
+
+    def export_dict(self) -> dict:
+        return {"name": self.name, "generics": self.generics, "ports": self.ports}
+
+    @staticmethod
+    def from_dict(data: dict) -> EntityInterface:
+        interface = EntityInterface(data["name"])
+        interface.generics = data["generics"]
+        interface.ports = data["ports"]
+        return interface
+
+
+class EntityScanner:
+    """
+    Single-pass scanner for the entity declaration of a VHDL file.
+
+    The code is tokenized once, and the tokens are consumed until the end of the first entity
+    declaration, so the rest of the file (usually the architecture) is never looked at.
+    Generic and port clauses are both read, including 'inout' ports and vector widths that
+    depend on the default values of the generics.
+    """
+
+    # ========== Private Functions ==========
+    def __next(self) -> tuple[str, str, int]:
+        """Consumes and returns the next token"""
+        token = next(self.__tokens, None)
+        if token is None:
+            raise ValueError("Unexpected end of file in the entity declaration.")
+        return token
+
+    def __expect(self, text: str) -> None:
+        """Consumes the next token, which has to be the given keyword or symbol"""
+        kind, value, line = self.__next()
+        if value.lower() != text:
+            raise ValueError(f"Expected '{text}' but found '{value}' on line {line}.")
+
+    def __interface_list(self) -> list[tuple[list[str], str | None, list[tuple[str, str, int]], str]]:
+        """
+        Reads a parenthesized interface list, up to and including the closing ';'.
+
+        Returns:
+            list: For every declaration, its names, mode (None if absent), type tokens and default value.
+        """
+        self.__expect("(")
+        declarations = []
+
+        while True:
+            # Names
+            names = []
+            while True:
+                kind, value, line = self.__next()
+                if kind != IDENTIFIER:
+                    raise ValueError(f"Expected a name but found '{value}' on line {line}.")
+                names.append(value)
+
+                kind, value, line = self.__next()
+                if value == ":":
+                    break
+                if value != ",":
+                    raise ValueError(f"Expected ',' or ':' but found '{value}' on line {line}.")
+
+            # Mode, type and default, up to the ';' or ')' that ends the declaration
+            mode, type_tokens, default_tokens, depth = None, [], None, 0
+            while True:
+                token = self.__next()
+                value = token[1]
+
+                if depth == 0 and value in (";", ")"):
+                    break
+                if value == "(":
+                    depth += 1
+                elif value == ")":
+                    depth -= 1
+
+                if depth == 0 and value == ":=":
+                    default_tokens = []
+                elif default_tokens is not None:
+                    default_tokens.append(token)
+                elif mode is None and not type_tokens and value.lower() in DIRECTIONS:
+                    mode = value.lower()
+                else:
+                    type_tokens.append(token)
+
+            default = " ".join(token[1] for token in default_tokens) if default_tokens is not None else None
+            declarations.append((names, mode, type_tokens, default))
+
+            if value == ")":
+                self.__expect(";")
+                return declarations
+
+    @staticmethod
+    def __arithmetic(items: list[int | str]) -> int:
+        """
+        Evaluates integers combined with + - * / ( ) by recursive descent, dividing as VHDL does,
+        towards zero. Raises ValueError if the expression is malformed.
+        """
+        position = 0
+
+        def peek() -> int | str | None:
+            return items[position] if position < len(items) else None
+
+        def take() -> int | str:
+            nonlocal position
+            if position == len(items):
+                raise ValueError("Unexpected end of the expression.")
+            position += 1
+            return items[position - 1]
+
+        def factor() -> int:
+            item = take()
+            if item == "-":
+                return -factor()
+            if item == "+":
+                return factor()
+            if item == "(":
+                value = expression()
+                if take() != ")":
+                    raise ValueError("Expected ')'.")
+                return value
+            if isinstance(item, int):
+                return item
+            raise ValueError(f"Unexpected '{item}'.")
+
+        def term() -> int:
+            value = factor()
+            while peek() in ("*", "/"):
+                if take() == "*":
+                    value *= factor()
+                else:
+                    divisor = factor()
+                    if divisor == 0:
+                        raise ValueError("Division by zero.")
+                    quotient = abs(value) // abs(divisor)
+                    value = -quotient if (value < 0) != (divisor < 0) else quotient
+            return value
+
+        def expression() -> int:
+            value = term()
+            while peek() in ("+", "-"):
+                value = value + term() if take() == "+" else value - term()
+            return value
+
+        value = expression()
+        if position != len(items):
+            raise ValueError(f"Unexpected '{items[position]}'.")
+        return value
+
+    def __evaluate(self, tokens: list[tuple[str, str, int]]) -> int | None:
+        """Evaluates an integer expression made of literals, generics and + - * / ( )"""
+        items = []
+        for kind, value, _ in tokens:
+            if kind == NUMBER and value.replace("_", "").isdigit():
+                items.append(int(value.replace("_", "")))
+            elif kind == IDENTIFIER and value.lower() in self.__constants:
+                items.append(self.__constants[value.lower()])
+            elif kind == SYMBOL and value in ("+", "-", "*", "/", "(", ")"):
+                items.append(value)
+            else:
+                return None
+
+        try:
+            return EntityScanner.__arithmetic(items)
+        except ValueError:
+            return None
+
+    def __bit_size(self, type_tokens: list[tuple[str, str, int]]) -> int:
+        """Returns the width of a port type, e.g. 8 for std_logic_vector(7 downto 0)"""
+        values = [token[1].lower() for token in type_tokens]
+        for direction in ("downto", "to"):
+            if direction in values:
+                split = values.index(direction)
+                left = self.__evaluate(type_tokens[2:split])
+                right = self.__evaluate(type_tokens[split + 1:-1])
+                if left is not None and right is not None:
+                    return abs(left - right) + 1
+
+        return 1
+
+    # ========== Public Functions ==========
+    def __init__(self, vhdl_code: str = None, tokens: Iterator[tuple[str, str, int]] = None) -> None:
+        """
+        Args:
+            vhdl_code (str, optional): The VHDL code to scan.
+            tokens (Iterator, optional): A token stream to scan instead, which is left positioned
+                right after the entity declaration.
+        """
+        self.__tokens = tokens if tokens is not None else tokenize(vhdl_code)
+        self.__constants: dict[str, int] = dict()   # Integer generics with a default value
+
+    def scan(self) -> EntityInterface:
+        """
+        Reads the first entity declaration of the code.
+
+        Returns:
+            EntityInterface: The entity name, generics and ports.
+        """
+        # Skip everything before the entity declaration
+        for kind, value, _ in self.__tokens:
+            if kind == IDENTIFIER and value.lower() == "entity":
+                break
+        else:
+            raise ValueError("No entity section found in the VHDL file.")
+
+        kind, name, line = self.__next()
+        interface = EntityInterface(name)
+        self.__expect("is")
+
+        while True:
+            kind, value, line = self.__next()
+            keyword = value.lower()
+
+            if keyword == "generic":
+                for names, _, type_tokens, default in self.__interface_list():
+                    type_ = " ".join(token[1] for token in type_tokens)
+                    for generic in names:
+                        interface.generics.append({"name": generic, "type": type_, "default": default})
+                        if default is not None and default.isdigit():
+                            self.__constants[generic.lower()] = int(default)
+
+            elif keyword == "port":
+                for names, mode, type_tokens, _ in self.__interface_list():
+                    bit_size = self.__bit_size(type_tokens)
+                    direction = mode or "in"
+                    for port in names:
+                        interface.ports.append({
+                            "name": port,
+                            "direction": direction,
+                            "bit_size": bit_size,
+                            "is_input": direction in ("in", "inout")
+                        })
+
+            elif keyword == "end":
+                # Consume the optional 'entity' keyword and name
+                while value != ";":
+                    kind, value, line = self.__next()
+                return interface
+
+            elif keyword != "begin":
+                raise ValueError(f"Unexpected '{value}' on line {line} in entity '{name}'.")
+
+
+def scan_entity(vhdl_code: str) -> EntityInterface:
+    """Reads the first entity declaration of the VHDL code"""
+    return EntityScanner(vhdl_code).scan()
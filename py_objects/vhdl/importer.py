@@ -0,0 +1,336 @@
+from __future__ import annotations
+from typing import Iterator, TextIO
+
+from py_objects.components.component import Component
+from py_objects.components.bulk_loader import BulkLoader
+from py_objects.vhdl.entity_scanner import EntityScanner, EntityInterface
+from py_objects.vhdl.tokenizer import tokenize_lines, IDENTIFIER
+from exceptions.illegal_operation_exception import IllegalOperationException
+
+# Logical operators, as written in VHDL and as gate types
+OPERATORS = {"and": "AND", "or": "OR", "xor": "XOR", "nand": "NAND", "nor": "NOR", "xnor": "XNOR"}
+
+
+class DataflowImporter:
+    """
+    Rebuilds a component from a dataflow VHDL file, such as the ones written by `VHDLWriter`.
+
+    The file is tokenized line by line and read in one pass: the entity gives the I/O ports, the
+    signal declarations give the wires, and every concurrent assignment `target <= expression;`
+    becomes one gate per operator. Operators nested in parentheses get intermediate wires named
+    after the target. An assignment of a bare name, such as `Q <= Q_int;`, connects the target
+    straight to the gate driving that name. The collected netlist is then built with `BulkLoader`
+    and every gate is placed in the column of its logic level, by `Component.auto_place`.
+
+    Only single-bit signals can be connected to gates, and there is no buffer gate, so an output
+    port cannot be assigned an input port directly.
+    """
+
+    # ========== Private Functions ==========
+    def __next(self) -> tuple[str, str, int]:
+        """Consumes and returns the next token"""
+        token = next(self.__tokens, None)
+        if token is None:
+            raise ValueError("Unexpected end of file in the architecture body.")
+        return token
+
+    def __peek(self) -> tuple[str, str, int]:
+        """Returns the next token without consuming it"""
+        if self.__lookahead is None:
+            self.__lookahead = self.__next()
+        return self.__lookahead
+
+    def __take(self) -> tuple[str, str, int]:
+        """Consumes the next token, including one that has been peeked at"""
+        token, self.__lookahead = self.__lookahead, None
+        return token if token is not None else self.__next()
+
+    def __expect(self, text: str) -> None:
+        kind, value, line = self.__take()
+        if value.lower() != text:
+            raise ValueError(f"Expected '{text}' but found '{value}' on line {line}.")
+
+    def __declare(self, name: str, line: int) -> str:
+        """Registers a port or signal name, which VHDL compares case-insensitively"""
+        key = name.lower()
+        if key in self.__names:
+            raise ValueError(f"'{name}' is declared more than once (line {line}).")
+        self.__names[key] = name
+        return key
+
+    def __resolve(self, name: str, line: int) -> str:
+        key = name.lower()
+        if key not in self.__names:
+            raise ValueError(f"'{name}' on line {line} is not declared.")
+        return key
+
+    def __signal_declaration(self) -> None:
+        """Reads `signal a, b : std_logic [:= '0'];`"""
+        names = []
+        while True:
+            kind, value, line = self.__take()
+            if kind != IDENTIFIER:
+                raise ValueError(f"Expected a signal name but found '{value}' on line {line}.")
+            names.append((value, line))
+
+            kind, value, line = self.__take()
+            if value == ":":
+                break
+            if value != ",":
+                raise ValueError(f"Expected ',' or ':' but found '{value}' on line {line}.")
+
+        # The type, and the default value, which has no meaning for gates
+        type_tokens = []
+        while True:
+            kind, value, line = self.__take()
+            if value == ";":
+                break
+            type_tokens.append((kind, value, line))
+
+        bit_size = self.__bit_size(type_tokens)
+        for name, line in names:
+            self.__signals[self.__declare(name, line)] = bit_size
+
+    def __bit_size(self, type_tokens: list[tuple[str, str, int]]) -> int:
+        """Returns the width of a signal type, e.g. 8 for std_logic_vector(7 downto 0)"""
+        values = [token[1].lower() for token in type_tokens]
+        for direction in ("downto", "to"):
+            if direction in values:
+                split = values.index(direction)
+                left, right = values[split - 1], values[split + 1]
+                if left.isdigit() and right.isdigit():
+                    return abs(int(left) - int(right)) + 1
+
+        return 1
+
+    def __gate(self, type_: str) -> int:
+        """Adds a gate and returns its ID"""
+        id_ = len(self.__gates) + 1
+        self.__gates.append({"__class__": "Gate", "id": id_, "type": type_, "scene_x": 0.0, "scene_y": 0.0})
+        return id_
+
+    def __intermediate(self, target: str) -> str:
+        """Declares a new wire for a sub-expression of an assignment to the target"""
+        while True:
+            self.__generated += 1
+            name = f"{self.__names[target]}_t{self.__generated}"
+            if name.lower() not in self.__names:
+                key = self.__declare(name, 0)
+                self.__signals[key] = 1
+                return key
+
+    def __operand(self, target: str) -> tuple[str, str | int]:
+        """
+        Reads a factor: a name, a parenthesized expression or `not` followed by a factor.
+
+        Returns:
+            tuple: ("name", name) for a declared name, or ("gate", ID) for the gate computing the value.
+        """
+        kind, value, line = self.__take()
+        keyword = value.lower()
+
+        if keyword == "not":
+            gate = self.__gate("NOT")
+            self.__connect_input(self.__operand(target), gate, "in1", target)
+            return "gate", gate
+
+        if value == "(":
+            operand = self.__expression(target)
+            self.__expect(")")
+            return operand
+
+        if kind != IDENTIFIER or keyword in OPERATORS:
+            raise ValueError(f"Expected a signal name but found '{value}' on line {line}.")
+
+        return "name", self.__resolve(value, line)
+
+    def __expression(self, target: str) -> tuple[str, str | int]:
+        """Reads operands joined by binary logical operators, from left to right"""
+        operand = self.__operand(target)
+
+        while self.__peek()[1].lower() in OPERATORS:
+            operator = self.__take()[1].lower()
+            gate = self.__gate(OPERATORS[operator])
+            self.__connect_input(operand, gate, "in1", target)
+            self.__connect_input(self.__operand(target), gate, "in2", target)
+            operand = ("gate", gate)
+
+        return operand
+
+    def __connect_input(self, operand: tuple[str, str | int], gate: int, pin: str, target: str) -> None:
+        """Connects a name or the output of a sub-expression to a gate input"""
+        kind, value = operand
+        if kind == "gate":
+            # The sub-expression needs a wire of its own
+            wire = self.__intermediate(target)
+            self.__drivers[wire] = value
+            value = wire
+
+        self.__consumers.setdefault(value, []).append([gate, pin])
+
+    def __assignment(self, target_token: tuple[str, str, int]) -> None:
+        """Reads the rest of `target <= expression;`"""
+        _, name, line = target_token
+        target = self.__resolve(name, line)
+
+        if target in self.__drivers or target in self.__aliases:
+            raise ValueError(f"'{name}' is driven more than once (line {line}).")
+        if target in self.__ports and self.__ports[target]["is_input"]:
+            raise IllegalOperationException(f"Input port '{name}' cannot be assigned (line {line}).")
+
+        kind, value = self.__expression(target)
+        self.__expect(";")
+
+        if kind == "gate":
+            self.__drivers[target] = value
+        else:
+            self.__aliases[target] = (value, line)
+
+    def __driver(self, name: str) -> int | None:
+        """Returns the ID of the gate driving a name, following aliases"""
+        seen = set()
+        while name not in self.__drivers:
+            if name not in self.__aliases:
+                return None
+            if name in seen:
+                raise IllegalOperationException(f"'{self.__names[name]}' is assigned to itself through aliases.")
+            seen.add(name)
+
+            source, line = self.__aliases[name]
+            if source in self.__ports and self.__ports[source]["is_input"]:
+                raise IllegalOperationException(
+                    f"'{self.__names[name]}' is assigned input port '{self.__names[source]}' on line {line}, "
+                    "but a port cannot be connected without a gate in between."
+                )
+            name = source
+
+        return self.__drivers[name]
+
+    def __architecture(self, interface: EntityInterface) -> None:
+        """Reads the architecture body of the entity"""
+        # Skip everything up to the architecture of this entity
+        while True:
+            kind, value, line = self.__take()
+            if kind == IDENTIFIER and value.lower() == "architecture":
+                break
+
+        self.architecture = self.__take()[1]
+        self.__expect("of")
+        self.__expect(interface.name.lower())
+        self.__expect("is")
+
+        # Declarations
+        while True:
+            kind, value, line = self.__take()
+            keyword = value.lower()
+            if keyword == "begin":
+                break
+            if keyword != "signal":
+                raise ValueError(f"Unsupported declaration '{value}' on line {line}; only signals can be imported.")
+            self.__signal_declaration()
+
+        # Concurrent assignments
+        while True:
+            token = self.__take()
+            kind, value, line = token
+
+            if value.lower() == "end":
+                break
+
+            if self.__peek()[1] == ":":
+                # Statement label
+                self.__take()
+                token = self.__take()
+
+            self.__expect("<=")
+            self.__assignment(token)
+
+    def __build(self, interface: EntityInterface) -> dict:
+        """Collects the parsed netlist into the form written by `Component.export_dict`"""
+        connections = []
+        for name, bit_size in self.__signals.items():
+            driver = self.__driver(name)
+            if driver is None and name in self.__consumers:
+                raise IllegalOperationException(f"Signal '{self.__names[name]}' is read but never driven.")
+
+            connections.append({
+                "__class__": "Wire",
+                "name": self.__names[name],
+                "bit_size": bit_size,
+                "src_key": driver,
+                "src_port": "out" if driver is not None else None,
+                "dests": self.__consumers.get(name, [])
+            })
+
+        io_ports = []
+        for key, port in self.__ports.items():
+            dests = list(self.__consumers.get(key, []))
+            if not port["is_input"]:
+                driver = self.__driver(key)
+                if driver is not None:
+                    dests.insert(0, [driver, "out"])
+
+            io_ports.append({
+                "__class__": "IOPort",
+                "name": port["name"],
+                "bit_size": port["bit_size"],
+                "dests": dests,
+                "is_input": port["is_input"],
+                "scene_x": 0.0,
+                "scene_y": 0.0
+            })
+
+        return {
+            "__class__": "Component",
+            "name": interface.name,
+            "architecture": self.architecture,
+            "gates": self.__gates,
+            "connections": connections,
+            "io_ports": io_ports
+        }
+
+    # ========== Public Functions ==========
+    def __init__(self) -> None:
+        self.architecture: str = None
+        self.__tokens: Iterator[tuple[str, str, int]] = None
+        self.__lookahead: tuple[str, str, int] = None
+
+        self.__names: dict[str, str] = dict()                       # Lowercase name -> declared spelling
+        self.__ports: dict[str, dict] = dict()
+        self.__signals: dict[str, int] = dict()                     # Name -> bit size
+        self.__gates: list[dict] = []
+        self.__drivers: dict[str, int] = dict()                     # Name -> driving gate ID
+        self.__aliases: dict[str, tuple[str, int]] = dict()         # Name -> assigned name, line
+        self.__consumers: dict[str, list[list[int | str]]] = dict() # Name -> gate inputs
+        self.__generated = 0
+
+    def parse(self, file: TextIO) -> dict:
+        """
+        Reads a dataflow VHDL file.
+
+        Args:
+            file (TextIO): The open VHDL file, or any iterable of lines.
+
+        Returns:
+            dict: The component in the form written by `Component.export_dict`, with every gate at the origin.
+        """
+        self.__tokens = tokenize_lines(file)
+        interface = EntityScanner(tokens=self.__tokens).scan()
+
+        for port in interface.ports:
+            self.__ports[self.__declare(port["name"], 0)] = port
+
+        self.__architecture(interface)
+        return self.__build(interface)
+
+    def load(self, file: TextIO) -> Component:
+        """Reads a dataflow VHDL file and builds its component, with every gate placed"""
+        component = BulkLoader().load(self.parse(file))
+        component.auto_place()
+        return component
+
+
+def import_vhdl(filename: str) -> Component:
+    """Rebuilds a component from a dataflow VHDL file"""
+    with open(filename, 'r') as file:
+        return DataflowImporter().load(file)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import os
+
+from py_objects.vhdl.entity_scanner import EntityInterface, scan_entity
+
+# Name of the cache file, kept in the same directory as the VHDL files it describes
+CACHE_FILENAME = ".dcs_interface_cache.json"
+
+
+class InterfaceCache:
+    """
+    Persistent cache of the entity interfaces parsed from VHDL files.
+
+    Entries are keyed by the absolute path of the file and remember its modification time,
+    size and SHA-256 hash. A file whose modification time and size are unchanged is not read
+    at all; a file that was touched but whose contents hash the same is not parsed again.
+
+    New entries are only kept in memory until `save` is called, so scanning a directory writes
+    the cache once rather than once per file. The caches opened through `for_file` are saved
+    when the process exits.
+    """
+
+    # Caches that are already open in this process, keyed by cache file
+    __open_caches: dict[str, InterfaceCache] = dict()
+
+    # ========== Private Functions ==========
+    @staticmethod
+    def __hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    # ========== Public Functions ==========
+    def __init__(self, cache_filename: str) -> None:
+        self.cache_filename: str = cache_filename
+        self.entries: dict[str, dict] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.dirty: bool = False    # Whether there are entries not written to disk yet
+
+        if os.path.exists(cache_filename):
+            try:
+                with open(cache_filename, 'r') as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError):
+                # A damaged cache is simply rebuilt
+                self.entries = dict()
+
+    @staticmethod
+    def for_file(vhdl_filename: str) -> InterfaceCache:
+        """Returns the cache for the directory of a VHDL file, opening it only once per process"""
+        cache_filename = os.path.join(os.path.dirname(os.path.abspath(vhdl_filename)), CACHE_FILENAME)
+        if cache_filename not in InterfaceCache.__open_caches:
+            if not InterfaceCache.__open_caches:
+                atexit.register(InterfaceCache.save_all)
+            InterfaceCache.__open_caches[cache_filename] = InterfaceCache(cache_filename)
+
+        return InterfaceCache.__open_caches[cache_filename]
+
+    def get(self, vhdl_filename: str) -> EntityInterface:
+        """
+        Returns the entity interface of a VHDL file, parsing the file only if it has changed.
+
+        Args:
+            vhdl_filename (str): The path to the VHDL file.
+
+        Returns:
+            EntityInterface: The entity name, generics and ports.
+        """
+        path = os.path.abspath(vhdl_filename)
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+
+        # Same modification time and size: trust the entry without reading the file
+        if entry is not None and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            self.hits += 1
+            return EntityInterface.from_dict(entry["interface"])
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        digest = InterfaceCache.__hash(data)
+
+        # Touched but unchanged contents: refresh the modification time only
+        if entry is not None and entry["hash"] == digest:
+            self.hits += 1
+            interface = EntityInterface.from_dict(entry["interface"])
+        else:
+            self.misses += 1
+            interface = scan_entity(data.decode("utf-8", errors="replace"))
+
+        self.entries[path] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "hash": digest,
+            "interface": interface.export_dict()
+        }
+        self.dirty = True
+
+        return interface
+
+    def save(self) -> None:
+        """Writes the cache to disk if it has new entries, ignoring read-only directories"""
+        if not self.dirty:
+            return
+
+        try:
+            with open(self.cache_filename, 'w') as file:
+                json.dump(self.entries, file, indent=4)
+        except OSError:
+            pass
+        self.dirty = False
+
+    @staticmethod
+    def save_all() -> None:
+        """Writes every cache opened through `for_file` that has new entries"""
+        for cache in InterfaceCache.__open_caches.values():
+            cache.save()
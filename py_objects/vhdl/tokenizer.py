@@ -0,0 +1,78 @@
+import re
+from typing import Iterable, Iterator
+
+# Kinds of tokens
+IDENTIFIER = "identifier"
+NUMBER = "number"
+STRING = "string"
+CHARACTER = "character"
+SYMBOL = "symbol"
+
+# One alternation over every token, so the whole file is scanned in a single pass
+_TOKEN_REGEX = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<comment>--[^\n]*)
+    | (?P<string>[bBoOxX]?"(?:[^"\n]|"")*")
+    | (?P<identifier>[A-Za-z][A-Za-z0-9_]*|\\[^\\\n]*\\)
+    | (?P<number>\d[\d_]*(?:\#[0-9A-Fa-f_.]+\#)?(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)
+    | (?P<character>'[^\n]'(?!'))
+    | (?P<symbol><=|>=|=>|:=|/=|\*\*|<>|[()\[\];:,.&'*+\-/<>=|])
+""", re.VERBOSE)
+
+
+def tokenize(vhdl_code: str) -> Iterator[tuple[str, str, int]]:
+    """
+    Splits VHDL code into tokens, skipping whitespace and comments.
+
+    Args:
+        vhdl_code (str): The VHDL code as a string.
+
+    Yields:
+        tuple[str, str, int]: The kind of the token, its text and the line it starts on.
+    """
+    line = 1
+    position = 0
+    match_at = _TOKEN_REGEX.match
+
+    while position < len(vhdl_code):
+        match = match_at(vhdl_code, position)
+        if match is None:
+            raise ValueError(f"Unexpected character {vhdl_code[position]!r} on line {line}")
+
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind != "space" and kind != "comment":
+            yield kind, text, line
+
+        line += text.count("\n")
+        position = match.end()
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[tuple[str, str, int]]:
+    """
+    Tokenizes VHDL code line by line, e.g. straight from an open file, so that large files are
+    streamed instead of being read into memory. No VHDL token spans more than one line.
+
+    Args:
+        lines (Iterable[str]): The lines of VHDL code.
+
+    Yields:
+        tuple[str, str, int]: The kind of the token, its text and its line number.
+    """
+    find_all = _TOKEN_REGEX.finditer
+
+    for line, text in enumerate(lines, start=1):
+        position = 0
+        for match in find_all(text):
+            if match.start() != position:
+                break
+
+            kind = match.lastgroup
+            if kind != "space" and kind != "comment":
+                yield kind, match.group(), line
+
+            position = match.end()
+
+        # finditer skips over characters that no token matches
+        if position != len(text):
+            raise ValueError(f"Unexpected character {text[position]!r} on line {line}")
@@ -0,0 +1,18 @@
+"""
+Simulates the sample D-Latch: stores a 1, holds it, then stores a 0.
+
+    python samples/simulate_dlatch.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from py_objects.components.component import Component
+
+
+if __name__ == "__main__":
+    dLatch = Component.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "DLatch.dcs.json"))
+
+    for result in dLatch.simulate_events([{"D": 1, "EN": 1}, {"D": 0, "EN": 0}, {"D": 0, "EN": 1}]):
+        print(result)